@@ -0,0 +1,114 @@
+"""
+Asynchronous building of surfaces from data that is still being fetched.
+
+    await surface.add_async([
+        HeaderBlock(Text(type=PLAIN_TEXT, text="Your tasks")),
+        Slot(db.fetch_tasks(user), build=task_blocks, timeout=0.5, fallback=SectionBlock(text=unavailable)),
+        Slot(cache.teams(), build=lambda teams: ActionBlock([StaticOptions("static_select", "team", options=teams)])),
+        http_digest(user),  # async generator yielding blocks
+    ])
+
+All slots are resolved concurrently, the blocks are added in order of the items.
+"""
+import asyncio
+from typing import Any, Callable, Iterable, List, Union
+
+from BlockAPI.BlockInterface import BlockInterface
+from BlockAPI.Blocks import RawBlock
+
+_Blocks = Union[BlockInterface, List[BlockInterface], None]
+
+
+class Slot:
+    """
+    Place in a surface filled by the result of an awaitable or by the items of an async iterable.
+    """
+    __slots__ = ("source", "build", "timeout", "fallback")
+
+    def __init__(self,
+                 source,
+                 build: Callable[[Any], _Blocks] = None,
+                 timeout: float = None,
+                 fallback: _Blocks = None):
+        """
+        :param source: Awaitable resolving to block(s) or an async iterable (e.g. async generator) yielding them.
+        If build is given, the source can resolve to any data, e.g. option lists of elements.
+        :param build: Callable creating the block(s) from the resolved data (a list of the items for async
+        iterables), e.g. lambda teams: ActionBlock([StaticOptions(..., options=teams)]).
+        :param timeout: Seconds the slot may take, the default timeout of the slots given to the build is used if
+        None.
+        :param fallback: Block(s) used in place of the slot when it times out, the slot is left out if None. Sources
+        with an aclose() method (async generators) are closed when they time out.
+        """
+        if not hasattr(source, "__await__") and not hasattr(source, "__aiter__"):
+            raise ValueError("Source of a slot must be an awaitable or an async iterable.")
+        if timeout is not None and timeout <= 0:
+            raise ValueError("Timeout must be positive.")
+        self.source = source
+        self.build = build
+        self.timeout = timeout
+        self.fallback = fallback
+
+
+def _as_blocks(_value: _Blocks) -> List[BlockInterface]:
+    if _value is None:
+        return []
+    if isinstance(_value, BlockInterface):
+        return [_value]
+    return [_b for _item in _value for _b in _as_blocks(_item)]
+
+
+async def _collect(_source):
+    if hasattr(_source, "__aiter__"):
+        return [_item async for _item in _source]
+    return await _source
+
+
+async def _resolve(_slot: Slot, _timeout: float, _serialize: bool) -> List[BlockInterface]:
+    _timeout = _slot.timeout if _slot.timeout is not None else _timeout
+    try:
+        _value = await asyncio.wait_for(_collect(_slot.source), _timeout)
+    except asyncio.TimeoutError:
+        # Closed now rather than when collected, e.g. to release the connection of a stream
+        if hasattr(_slot.source, "aclose"):
+            await _slot.source.aclose()
+        _blocks = _as_blocks(_slot.fallback)
+    else:
+        _blocks = _as_blocks(_slot.build(_value) if _slot.build is not None else _value)
+
+    if _serialize:
+        # Serialized as soon as the slot is resolved, while the other slots are still waiting for their data
+        return [_b if isinstance(_b, RawBlock) else RawBlock(_b.build()) for _b in _blocks]
+    return _blocks
+
+
+async def resolve_blocks(items: Iterable[Union[BlockInterface, Slot, Any]],
+                         timeout: float = None,
+                         serialize: bool = False) -> List[BlockInterface]:
+    """
+    Resolve all slots of the items concurrently.
+    :param items: Blocks (passed through), slots, or awaitables and async iterables (slots with default settings).
+    :param timeout: Default timeout of the slots in seconds, unlimited if None.
+    :param serialize: If True, blocks of every slot are serialized into RawBlock objects as soon as the slot is
+    resolved.
+    :return: Blocks in order of the items.
+    :raises: Exceptions of the sources and of the build callables, except of timeouts.
+    """
+    _items = [_i if isinstance(_i, (BlockInterface, Slot)) else Slot(_i) for _i in items]
+    _slots = [_i for _i in _items if isinstance(_i, Slot)]
+    _tasks = [asyncio.ensure_future(_resolve(_s, timeout, serialize)) for _s in _slots]
+    try:
+        _results = iter(await asyncio.gather(*_tasks))
+    except BaseException:
+        # The slots still running are not needed anymore
+        for _task in _tasks:
+            _task.cancel()
+        raise
+
+    _blocks = []
+    for _item in _items:
+        if isinstance(_item, Slot):
+            _blocks.extend(next(_results))
+        else:
+            _blocks.append(_item)
+    return _blocks
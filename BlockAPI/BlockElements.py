@@ -5,7 +5,22 @@ from typing import Tuple
 from BlockAPI.CompositionObjects import *
 
 
+def _check_catalog_kind(_options, _kind: str):
+    if isinstance(_options, OptionCatalog) and _options.kind != _kind:
+        raise ValueError(f"Option catalog holds {_options.kind}, expected {_kind}.")
+
+
+def _check_option_groups_no_url(_option_groups):
+    if isinstance(_option_groups, OptionCatalog):
+        check_options_no_url(_option_groups)
+    else:
+        for _og in _option_groups:
+            check_options_no_url(_og.options)
+
+
 class Button(BlockInterface):
+    _child_keys = ("text", "confirm")
+
     def __init__(self, text: Text,
                  action_id: str,
                  url: str = None,
@@ -38,12 +53,12 @@ class Button(BlockInterface):
             check_length(access_label, _min=1, _max=75)
             self._body["accessibility_label"] = access_label
 
-        self._text = text,
-        self._action_id = action_id,
-        self._url = url,
-        self._value = value,
-        self._style = style,
-        self._confirm = confirm,
+        self._text = text
+        self._action_id = action_id
+        self._url = url
+        self._value = value
+        self._style = style
+        self._confirm = confirm
         self._access_label = access_label
 
     @property
@@ -133,13 +148,15 @@ class Button(BlockInterface):
 
 
 class CheckBoxGroup(BlockInterface):
+    _child_keys = ("options", "initial_options", "confirm")
 
     def __init__(self,
                  action_id: str,
-                 options: List[Option],
+                 options: Union[List[Option], OptionCatalog],
                  init_options: List[Option] = None,
                  confirm: ConfirmationDialog = None,
                  focus_on_load: bool = False):
+        _check_catalog_kind(options, "options")
         check_options_no_url(options)
         check_length(action_id, _min=1, _max=255)
         check_length(options, _min=1, _max=10)
@@ -222,6 +239,7 @@ class CheckBoxGroup(BlockInterface):
 
 
 class DatePicker(BlockInterface):
+    _child_keys = ("placeholder", "confirm")
 
     def __init__(self,
                  action_id: str,
@@ -294,6 +312,7 @@ class DatePicker(BlockInterface):
 
 
 class DateTimePicker(BlockInterface):
+    _child_keys = ("confirm",)
 
     def __init__(self,
                  action_id: str,
@@ -358,6 +377,7 @@ class DateTimePicker(BlockInterface):
 
 
 class EmailInput(BlockInterface):
+    _child_keys = ("placeholder", "dispatch_action_config")
 
     def __init__(self,
                  action_id: str,
@@ -479,13 +499,14 @@ class Image(BlockInterface):
 
 
 class StaticOptions(BlockInterface):
+    _child_keys = ("placeholder", "options", "option_groups", "initial_option", "initial_options", "confirm")
 
     def __init__(self,
                  type: str,
                  action_id: str,
                  placeholder: Text = None,
-                 options: List[Option] = None,
-                 option_groups: List[OptionGroups] = None,
+                 options: Union[List[Option], OptionCatalog] = None,
+                 option_groups: Union[List[OptionGroups], OptionCatalog] = None,
                  init_options: List[Option] = None,
                  confirm: ConfirmationDialog = None,
                  max_selected_items: int = 1,
@@ -493,7 +514,7 @@ class StaticOptions(BlockInterface):
 
         check_length(action_id, _min=1, _max=255)
 
-        if type != "multi_static_select" or type != "static_select":
+        if type != "multi_static_select" and type != "static_select":
             raise ValueError(f"This option type must be either static_select or multi_static_select.")
 
         if options is None and option_groups is None:
@@ -516,12 +537,13 @@ class StaticOptions(BlockInterface):
             self._body["placeholder"] = placeholder
 
         if options is not None:
+            _check_catalog_kind(options, "options")
             check_options_no_url(options)
             check_length(options, _min=1, _max=100)
             self._body["options"] = options
         elif option_groups is not None:
-            for _og in option_groups:
-                check_options_no_url(_og.options)
+            _check_catalog_kind(option_groups, "option_groups")
+            _check_option_groups_no_url(option_groups)
             check_length(option_groups, _min=1, _max=100)
             self._body["option_groups"] = option_groups
 
@@ -532,9 +554,7 @@ class StaticOptions(BlockInterface):
                 if not all(list(map(lambda x: x in options, init_options))):
                     raise ValueError("Initial options must match the options list.")
             if option_groups:
-                _l = [all(list(map(lambda x: x in _og.options, init_options))) for _og in option_groups]
-                if _l.count(True) != 1:
-                    raise ValueError("Initial options must match exactly on of the option groups ")
+                check_init_options_in_groups(init_options, option_groups)
 
             if type == "static_select":
                 self._body["initial_option"] = init_options[0]
@@ -586,7 +606,7 @@ class StaticOptions(BlockInterface):
         return self._options
 
     @options.setter
-    def options(self, _options: Optional[Union[List[Option], Tuple[List[Option], bool]]]):
+    def options(self, _options: Optional[Union[List[Option], OptionCatalog, Tuple[List[Option], bool]]]):
         if _options is None:
             if self._option_groups is None:
                 raise ValueError("Can not remove options when option_groups is not specified.")
@@ -594,7 +614,8 @@ class StaticOptions(BlockInterface):
                 self._body.pop("options", None)
                 self._body["option_groups"] = self._option_groups
 
-        elif isinstance(_options, List):
+        elif isinstance(_options, (List, OptionCatalog)):
+            _check_catalog_kind(_options, "options")
             if self._option_groups:
                 raise ValueError("Can not specify options when option_groups is also specified. "
                                  "To replace option_groups, with options supply a tuple with second argument "
@@ -617,14 +638,15 @@ class StaticOptions(BlockInterface):
             if not all(list(map(lambda x: x in _options, self._init_options))):
                 raise ValueError("Initial options must match the options list.")
 
-        self._option_groups = _options
+        self._options = _options
 
     @property
     def option_groups(self):
         return self._option_groups
 
     @option_groups.setter
-    def option_groups(self, _option_groups: Optional[Union[List[OptionGroups], Tuple[List[OptionGroups]], bool]]):
+    def option_groups(self, _option_groups: Optional[Union[List[OptionGroups], OptionCatalog,
+                                                           Tuple[List[OptionGroups], bool]]]):
         if _option_groups is None:
             if self._options is None:
                 raise ValueError("Can not remove option_groups when options is not specified.")
@@ -632,7 +654,8 @@ class StaticOptions(BlockInterface):
                 self._body.pop("option_groups", None)
                 self._body["options"] = self._options
 
-        elif isinstance(_option_groups, List):
+        elif isinstance(_option_groups, (List, OptionCatalog)):
+            _check_catalog_kind(_option_groups, "option_groups")
             if self._options:
                 raise ValueError("Can not specify option_groups when options is also specified. To replace options,"
                                  "with option_groups supply a tuple with second argument True. To simply update"
@@ -641,22 +664,18 @@ class StaticOptions(BlockInterface):
 
             else:
                 check_length(_option_groups, _min=1, _max=100)
-                for _og in _option_groups:
-                    check_options_no_url(_og.options)
+                _check_option_groups_no_url(_option_groups)
                 self._body["option_groups"] = _option_groups
         else:
             _option_groups, _replace = _option_groups   # Unpack values
             check_length(_option_groups, _min=1, _max=100)
-            for _og in _option_groups:
-                check_options_no_url(_og.options)
+            _check_option_groups_no_url(_option_groups)
             if _replace:
                 self._body.pop("options", None)
                 self._body["option_groups"] = _option_groups
 
         if self._init_options and _option_groups:
-            _l = [all(list(map(lambda x: x in _og.options, self._init_options))) for _og in _option_groups]
-            if _l.count(True) != 1:
-                raise ValueError("Initial options must match exactly on of the option groups ")
+            check_init_options_in_groups(self._init_options, _option_groups)
 
         self._option_groups = _option_groups
 
@@ -694,6 +713,7 @@ class StaticOptions(BlockInterface):
 
 
 class ExternalDataOptions(BlockInterface):
+    _child_keys = ("placeholder", "initial_option", "initial_options", "confirm")
 
     def __init__(self,
                  type: str,
@@ -714,7 +734,7 @@ class ExternalDataOptions(BlockInterface):
         if not 1 <= max_selected_items <= 100:
             raise ValueError("Maximum selected items value must be in range [1, 100].")
 
-        self.body = {
+        self._body = {
             "type": type,
             "action_id": action_id,
             "min_query_length": min_query_length,
@@ -729,17 +749,17 @@ class ExternalDataOptions(BlockInterface):
             if init_options is not None:
                 check_options_no_url(init_options)
                 check_length(init_options, _min=1, _max=2 ** 32)
-                self.body["initial_options"] = init_options
-            self.body["max_selected_items"] = max_selected_items
+                self._body["initial_options"] = init_options
+            self._body["max_selected_items"] = max_selected_items
         else:
             if init_options is not None:
                 check_options_no_url(init_options)
                 check_length(init_options, _min=1, _max=2 ** 32)
-                self.body["initial_option"] = init_options[0]
+                self._body["initial_option"] = init_options[0]
 
         if confirm:
-            self.body["confirm"] = confirm
-        self.body["focus_on_load"] = focus_on_load
+            self._body["confirm"] = confirm
+        self._body["focus_on_load"] = focus_on_load
 
         self._type = type
         self._placeholder = placeholder
@@ -808,6 +828,7 @@ class ExternalDataOptions(BlockInterface):
 
 
 class UserListOptions(BlockInterface):
+    _child_keys = ("placeholder", "confirm")
 
     def __init__(self,
                  type: str,
@@ -821,13 +842,13 @@ class UserListOptions(BlockInterface):
         check_none(placeholder)
         check_length(action_id, _min=1, _max=255)
 
-        if type != "multi_users_select" or type != "users_select":
+        if type != "multi_users_select" and type != "users_select":
             raise ValueError(f"This option type must be either users_select or multi_users_select.")
 
         if not 1 <= max_selected_items <= 100:
             raise ValueError("Maximum selected items value must be in range [1, 100].")
 
-        self.body = {
+        self._body = {
             "type": type,
             "action_id": action_id
         }
@@ -840,15 +861,15 @@ class UserListOptions(BlockInterface):
         if type == "multi_users_select":
             if init_users is not None:
                 check_length(init_users, _min=1, _max=2 ** 32)
-                self.body["initial_users"] = init_users
-            self.body["max_selected_items"] = max_selected_items
+                self._body["initial_users"] = init_users
+            self._body["max_selected_items"] = max_selected_items
         else:
             if init_users is not None:
                 check_length(init_users, _min=1, _max=2 ** 32)
-                self.body["initial_user"] = init_users[0]
+                self._body["initial_user"] = init_users[0]
         if confirm:
-            self.body["confirm"] = confirm
-        self.body["focus_on_load"] = focus_on_load
+            self._body["confirm"] = confirm
+        self._body["focus_on_load"] = focus_on_load
 
         self._type = type
         self._placeholder = placeholder
@@ -916,6 +937,7 @@ class UserListOptions(BlockInterface):
 
 
 class ConversationOptions(BlockInterface):
+    _child_keys = ("placeholder", "filter", "confirm")
 
     def __init__(self,
                  type: str,
@@ -931,7 +953,7 @@ class ConversationOptions(BlockInterface):
 
         check_length(action_id, _min=1, _max=255)
 
-        if type != "multi_conversations_select" or type != "conversations_select":
+        if type != "multi_conversations_select" and type != "conversations_select":
             raise ValueError(f"This option type must be either conversations_select or multi_conversations_select.")
 
         if not 1 <= max_selected_items <= 100:
@@ -959,9 +981,9 @@ class ConversationOptions(BlockInterface):
             self._body["response_url_enabled"] = response_url_enabled
         self._body["default_to_current_conversation"] = default_to_current_conversation
         if confirm:
-            self._body["confirm"]: confirm
+            self._body["confirm"] = confirm
         if filter:
-            self._body["filter"]: filter
+            self._body["filter"] = filter
         self._body["focus_on_load"] = focus_on_load
 
         self._type = type
@@ -1065,6 +1087,7 @@ class ConversationOptions(BlockInterface):
 
 
 class PublicChannelOptions(BlockInterface):
+    _child_keys = ("placeholder", "confirm")
 
     def __init__(self,
                  type: str,
@@ -1078,13 +1101,13 @@ class PublicChannelOptions(BlockInterface):
 
         check_length(action_id, _min=1, _max=255)
 
-        if type != "multi_channels_select" or type != "channels_select":
+        if type != "multi_channels_select" and type != "channels_select":
             raise ValueError(f"This option type must be either channels_select or multi_channels_select.")
 
         if not 1 <= max_selected_items <= 100:
             raise ValueError("Maximum selected items value must be in range [1, 100].")
 
-        self.body = {
+        self._body = {
             "type": type,
             "action_id": action_id,
             "focus_on_load": focus_on_load
@@ -1098,15 +1121,15 @@ class PublicChannelOptions(BlockInterface):
         if type == "multi_channels_select":
             if init_channels is not None:
                 check_length(init_channels, _min=1, _max=2 ** 32)
-                self.body["initial_channels"] = init_channels
-            self.body["max_selected_items"] = max_selected_items
+                self._body["initial_channels"] = init_channels
+            self._body["max_selected_items"] = max_selected_items
         else:
             if init_channels is not None:
                 check_length(init_channels, _min=1, _max=2 ** 32)
-                self.body["initial_channel"] = init_channels[0]
+                self._body["initial_channel"] = init_channels[0]
             self._body["response_url_enabled"] = response_url_enabled
         if confirm:
-            self.body["confirm"] = confirm
+            self._body["confirm"] = confirm
 
         self._type = type
         self._placeholder = placeholder
@@ -1185,6 +1208,7 @@ class PublicChannelOptions(BlockInterface):
 
 
 class OverFlowMenu(BlockInterface):
+    _child_keys = ("options", "confirm")
 
     def __init__(self,
                  action_id: str,
@@ -1233,6 +1257,7 @@ class OverFlowMenu(BlockInterface):
 
 
 class NumberInput(BlockInterface):
+    _child_keys = ("placeholder", "dispatch_action_config")
 
     def __init__(self,
                  is_decimal_allowed: bool,
@@ -1397,6 +1422,7 @@ class NumberInput(BlockInterface):
 
 
 class PlainTextInput(BlockInterface):
+    _child_keys = ("placeholder", "dispatch_action_config")
 
     def __init__(self,
                  action_id: str,
@@ -1540,6 +1566,7 @@ class PlainTextInput(BlockInterface):
 
 
 class RadioButtonGroup(BlockInterface):
+    _child_keys = ("options", "initial_option", "confirm")
 
     def __init__(self,
                  action_id: str,
@@ -1627,6 +1654,7 @@ class RadioButtonGroup(BlockInterface):
 
 
 class TimePicker(BlockInterface):
+    _child_keys = ("placeholder", "confirm")
 
     def __init__(self,
                  action_id: str,
@@ -1723,6 +1751,7 @@ class TimePicker(BlockInterface):
 
 
 class UrlInput(BlockInterface):
+    _child_keys = ("placeholder", "dispatch_action_config")
 
     def __init__(self,
                  action_id: str,
@@ -1,32 +1,316 @@
+import json
+import re
+from copy import deepcopy
+from itertools import compress
+from operator import is_
+from os import urandom
+from types import MappingProxyType
+from typing import Callable, Optional
+from weakref import WeakValueDictionary, ref
+
 from BlockAPI.utils import *
 
+_SCALARS = frozenset((str, bool, int, float, type(None)))
+
+
+def _build_list(_l: list) -> list:
+    return [_v if type(_v) in _SCALARS else _build_value(_v) for _v in _l]
+
 
-def _build_list(_l: list):
-    for ix, value in enumerate(_l):
-        if isinstance(value, list):
-            _l[ix] = _build_list(value)
-        elif isinstance(value, dict):
-            _l[ix] = _build_dict(value)
-        elif isinstance(value, BlockInterface):
-            _l[ix] = value.build()
+def _build_dict(_d: dict) -> dict:
+    return {_k: _v if type(_v) in _SCALARS else _build_value(_v) for _k, _v in _d.items()}
 
-    return _l
 
+def _build_value(value):
+    if isinstance(value, BlockInterface):
+        return value.build()
+    elif isinstance(value, list):
+        return _build_list(value)
+    elif isinstance(value, dict):
+        return _build_dict(value)
+    return value
 
-def _build_dict(_d: dict):
-    for key, value in _d.items():
-        if isinstance(value, list):
-            _d[key] = _build_list(value)
-        elif isinstance(value, dict):
-            _d[key] = _build_dict(value)
-        elif isinstance(value, BlockInterface):
-            _d[key] = value.build()
 
-    return _d
+def build_many(objects) -> list:
+    """
+    Build several objects at once, e.g. the message, modal and Home tab answering one request. Every distinct object
+    (by identity) is built once per call and its dictionary is reused at every place the object appears at, in all
+    the outputs and within each of them, so shared headers, footers and option lists are built once.
+    :param objects: Objects to be built, e.g. surfaces.
+    :return: Dictionaries in order of the objects, equal to their build(). Shared objects share their dictionaries
+    in the outputs as well, so copy an output (copy.deepcopy keeps the sharing) before changing it.
+    """
+    _memo = {}
+    return [_build_shared(_o, _memo) for _o in objects]
 
 
-class BlockInterface:
-    _body = {}
+def _build_shared(node, _memo: dict):
+    # _memo: id of object -> its built value, the objects are kept alive by the trees being built
+    _built = _memo.get(id(node))
+    if _built is None:
+        if type(node).build is BlockInterface.build:
+            _built = {_k: _v if type(_v) in _SCALARS else _build_shared_value(_v, _memo)
+                      for _k, _v in node._body.items()}
+        else:
+            _built = node.build()
+        _memo[id(node)] = _built
+    return _built
+
+
+def _build_shared_value(value, _memo: dict):
+    if isinstance(value, BlockInterface):
+        return _build_shared(value, _memo)
+    elif isinstance(value, list):
+        return [_v if type(_v) in _SCALARS else _build_shared_value(_v, _memo) for _v in value]
+    elif isinstance(value, dict):
+        return {_k: _v if type(_v) in _SCALARS else _build_shared_value(_v, _memo) for _k, _v in value.items()}
+    return value
+
+
+def _encoded_size(value, _parent) -> int:
+    # Length of the value encoded by to_json(), nested objects are measured (and cached) by themselves
+    if isinstance(value, BlockInterface):
+        value._add_parent(_parent)
+        return value.encoded_size
+    elif isinstance(value, (list, tuple)):
+        return 1 + sum(_encoded_size(_v, _parent) + 1 for _v in value) if value else 2
+    elif isinstance(value, dict):
+        return 1 + sum(_encoded_size(_k, _parent) + _encoded_size(_v, _parent) + 2
+                       for _k, _v in value.items()) if value else 2
+    elif isinstance(value, str) and value.isascii() and value.isprintable() and '"' not in value \
+            and "\\" not in value:
+        return len(value) + 2
+    return len(json.dumps(value, ensure_ascii=False).encode())
+
+
+class _Body(dict):
+    """
+    Body of a tracked object, i.e. of an object whose encoded size has been measured or whose tree is observed. Every
+    change of the body is reported to the owner by _changed(), which invalidates the cached sizes and notifies the
+    observers.
+    """
+    __slots__ = ("_owner",)
+
+    def __init__(self, owner, items):
+        super().__init__(items)
+        self._owner = owner
+
+    def __setitem__(self, key, value):
+        _old = dict.get(self, key)
+        dict.__setitem__(self, key, value)
+        self._owner._changed(key, _old, value)
+
+    def __delitem__(self, key):
+        _old = dict.pop(self, key)
+        self._owner._changed(key, _old, None)
+
+    def pop(self, key, *args):
+        if not dict.__contains__(self, key):
+            return dict.pop(self, key, *args)
+        _value = dict.pop(self, key)
+        self._owner._changed(key, _value, None)
+        return _value
+
+    def popitem(self):
+        _key, _value = dict.popitem(self)
+        self._owner._changed(_key, _value, None)
+        return _key, _value
+
+    def setdefault(self, key, default=None):
+        if dict.__contains__(self, key):
+            return dict.__getitem__(self, key)
+        self[key] = default
+        return default
+
+    def update(self, *args, **kwargs):
+        for _key, _value in dict(*args, **kwargs).items():
+            self[_key] = _value
+
+    def clear(self):
+        while self:
+            self.popitem()
+
+    def copy(self) -> dict:
+        return dict(self)
+
+    def __reduce__(self):
+        # Copies and pickles are plain dictionaries, the owner converts them again once measured
+        return dict, (dict(self),)
+
+
+class Change:
+    """
+    Change of the body of an object, passed to the observers of the object and of all objects containing it.
+        path: Body keys and list indexes leading from the observing object to the changed one, e.g. ("blocks", 2),
+              () if the observing object changed itself.
+        node: Changed object.
+        key: Changed body key.
+        old: Previous value, None if the key was not set. For in-place changes of lists (the add methods of the
+             surfaces) old is new.
+        new: New value, None if the key was removed.
+    """
+    __slots__ = ("path", "node", "key", "old", "new")
+
+    def __init__(self, path: tuple, node, key: str, old, new):
+        self.path = path
+        self.node = node
+        self.key = key
+        self.old = old
+        self.new = new
+
+    def __repr__(self):
+        return f"Change(path={self.path!r}, node={type(self.node).__name__}, key={self.key!r}, old={self.old!r}, " \
+               f"new={self.new!r})"
+
+
+# id -> object with observers. Changes are propagated up the parents only while there is any.
+_OBSERVED = WeakValueDictionary()
+
+
+def _adopt(value, _parent):
+    # Link the value newly placed into the body of a tracked object to the object, objects already tracked have
+    # their whole trees tracked
+    if isinstance(value, BlockInterface):
+        value._add_parent(_parent)
+        if type(value._body) is dict:
+            value._track()
+    elif type(value) is list or type(value) is tuple:
+        for _v in value:
+            _adopt(_v, _parent)
+
+
+def _path_down(_entry: tuple) -> Optional[tuple]:
+    # Entries are (object, entry of the child it was reached from). Parents are never unlinked by the changes, so
+    # links of objects removed from their parents since are found here, dropped and None is returned.
+    _path = ()
+    _node, _child = _entry
+    while _child is not None:
+        _where = _node._locate(_child[0])
+        if _where is None:
+            _child[0]._parents.pop(id(_node), None)
+            return None
+        _path += _where
+        _node, _child = _child
+    return _path
+
+
+def _notify(_node, _key: str, _old, _new):
+    _stack = [(_node, None)]
+    while _stack:
+        _entry = _stack.pop()
+        _n = _entry[0]
+        if _n._observers:
+            _path = _path_down(_entry)
+            if _path is None:
+                continue
+            _change = Change(_path, _node, _key, _old, _new)
+            for _observer in tuple(_n._observers):
+                _observer(_change)
+        if _n._parents:
+            for _ref in tuple(_n._parents.values()):
+                _parent = _ref()
+                if _parent is not None:
+                    _stack.append((_parent, _entry))
+
+
+def _to_encodable(value, _raws: list):
+    # Same as building the value, but leaves the objects untouched and lets raw JSON fragments through
+    if isinstance(value, BlockInterface):
+        return value._encodable(_raws)
+    elif isinstance(value, (list, tuple)):
+        return [_to_encodable(_v, _raws) for _v in value]
+    elif isinstance(value, dict):
+        return {_k: _to_encodable(_v, _raws) for _k, _v in value.items()}
+    return value
+
+
+def _splice_raws(_json: bytes, _raws: list) -> bytes:
+    if not _raws:
+        return _json
+    # Raw fragments were encoded as "<nonce><index>" placeholder strings, swap them for the actual bytes
+    _nonce = _raws[0]
+    return re.sub(b'"' + _nonce + rb'(\d+)"', lambda m: _raws[int(m[1])], _json)
+
+
+# (class, attribute names, body keys) -> (body keys matching the attributes, {attributes being the body values:
+# (layout, selectors of the attribute values to be sent)}). Objects of the same shape share the layout object.
+_LAYOUTS = {}
+# (class, *attribute names, None, *body keys) -> (layout, selectors of the attribute values to be sent) of pickles.
+# Pickle memoizes the layout, so it is sent only once per stream.
+_PICKLE_LAYOUTS = {}
+_BUILDERS = {}  # (class, layout) -> function creating the objects, see _compile
+
+
+def _layout(cls, _names: tuple, _keys: tuple, _same: tuple, _body_keys: tuple) -> tuple:
+    _sent = [_n not in cls._transient for _n in _names]
+    _attrs = tuple(_n for _n, _s, _t in zip(_names, _same, _sent) if _s and _t)
+    _layout_ = (_body_keys,
+                _attrs,
+                tuple(_n[1:] for _n in _attrs),
+                tuple(_n for _n, _s, _t in zip(_names, _same, _sent) if not _s and _t))
+    return _layout_, tuple(not _s and _t for _s, _t in zip(_same, _sent))
+
+
+def _compile(_cls, _layout: tuple):
+    """
+    :return: Function creating object of the class from the body values and attribute values of the layout, used by
+    snapshots and unpickling. The functions are generated so the attributes are set by plain assignments, which is
+    several times faster than setting them one by one through object.__setattr__ or __setstate__.
+    """
+    _builder = _BUILDERS.get((_cls, _layout))
+    if _builder is not None:
+        return _builder
+
+    _body_keys, _attrs, _keys, _names = _layout
+    if not all(type(_k) is str for _k in _body_keys + _keys) or \
+            not all(type(_a) is str and _a.isidentifier() for _a in _attrs + _names):
+        raise ValueError("Invalid object layout.")
+
+    _n = len(_body_keys)
+    _lines = ["def _build(_v):",
+              "    _o = _new(_cls)",
+              "    _o._body = {" + ", ".join(f"{_k!r}: _v[{_i}]" for _i, _k in enumerate(_body_keys)) + "}"]
+    # Attributes restored from the body are None if their key is not in the body
+    _lines += [f"    _o.{_a} = " + (f"_v[{_body_keys.index(_k)}]" if _k in _body_keys else "None")
+               for _a, _k in zip(_attrs, _keys)]
+    _lines += [f"    _o.{_name} = _v[{_n + _i}]" for _i, _name in enumerate(_names)]
+    _lines.append("    return _o")
+
+    _namespace = {"_new": _cls.__new__, "_cls": _cls}
+    exec("\n".join(_lines), _namespace)
+    _builder = _BUILDERS[(_cls, _layout)] = _namespace["_build"]
+    return _builder
+
+
+def _restore(cls, _layout: tuple, _values: tuple):
+    # Unpickles objects reduced by BlockInterface.__reduce__
+    return _compile(cls, _layout)(_values)
+
+
+class _Attributes:
+    # Base of BlockInterface holding the descriptor of the instance dictionary, BlockInterface shadows __dict__ by a
+    # method, so neither vars() nor object.__getstate__ (Python 3.11+) can be used to read it
+    pass
+
+
+_attributes = _Attributes.__dict__["__dict__"].__get__  # Instance dictionary of an object
+
+
+class BlockInterface(_Attributes):
+    _body = MappingProxyType({})  # Read-only, constructors must set their own body before writing into it
+    _size = None       # Cached encoded size, None if not measured yet or invalidated
+    _parents = None    # id -> weak reference of the objects containing this object in their tracked bodies
+    _index = None      # Index of the objects below, kept between selector queries
+    _observers = None  # Callables notified of the changes of the object and of the objects below it
+    _transient = frozenset(("_body", "_size", "_parents", "_index", "_observers"))  # Not sent by __reduce__
+    _registry = {}     # "module.ClassName" -> class of every subclass, used to restore snapshots
+    _child_keys = ()   # Body keys that may hold child objects or lists of them, in payload order, used by walk()
+    _walk_keys = ()    # _child_keys reversed, children are pushed onto the stack of walk() in reverse
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        BlockInterface._registry[f"{cls.__module__}.{cls.__qualname__}"] = cls
+        cls._walk_keys = cls._child_keys[::-1]
 
     def __eq__(self, other):
         if type(self) != type(other):
@@ -49,19 +333,285 @@ class BlockInterface:
         return self._body.get(key)
 
     def build(self) -> dict:
-        for key, value in self._body.items():
-            if isinstance(value, list):
-                self._body[key] = _build_list(value)
-            elif isinstance(value, dict):
-                self._body[key] = _build_dict(value)
-            elif isinstance(value, BlockInterface):
-                self._body[key] = value.build()
-
-        return self._body
+        return _build_dict(self._body)
 
     def __dict__(self) -> dict:
         return self.build()
 
+    def to_json(self) -> bytes:
+        """
+        Serialize the object to compact UTF-8 encoded JSON. Raw (pre-serialized) fragments, e.g. RawBlock objects,
+        are copied to the output verbatim rather than being encoded again.
+        :return: JSON bytes.
+        """
+        _raws = []
+        return _splice_raws(json.dumps(self._encodable(_raws), separators=(",", ":"), ensure_ascii=False).encode(),
+                            _raws)
+
+    def walk(self, types=None, prune=None):
+        """
+        Iterate over the object and all objects below it, depth first in payload order. The walk is not recursive
+        and looks only into the body keys declared by the classes as holding children, so other values are never
+        inspected.
+            buttons = [node for _, node in surface.walk(Button)]
+            action_ids = {node.action_id for _, node in surface.walk() if node.get_actual_value("action_id")}
+        :param types: Class or tuple of classes of the objects to be yielded, all objects if None. The objects of
+        other types are still walked through.
+        :param prune: Callable receiving path and object, if it returns True the objects below are not walked (the
+        object itself is still yielded), e.g. lambda path, node: isinstance(node, OptionCatalog).
+        :return: Generator of (path, object) pairs, path is the tuple of body keys and list indexes leading to the
+        object from this one, e.g. ("blocks", 2, "accessory").
+        """
+        _stack = [((), self)]
+        _pop = _stack.pop
+        _push = _stack.append
+        while _stack:
+            _path, _node = _pop()
+            if types is None or isinstance(_node, types):
+                yield _path, _node
+            if prune is not None and prune(_path, _node):
+                continue
+
+            _body = _node._body
+            for _key in _node._walk_keys:
+                _value = _body.get(_key)
+                if _value is None:
+                    continue
+                if type(_value) is list or type(_value) is tuple:
+                    for _i in range(len(_value) - 1, -1, -1):
+                        _push((_path + (_key, _i), _value[_i]))
+                else:
+                    _push((_path + (_key,), _value))
+
+    def select(self, selector: str) -> list:
+        """
+        Find objects of the tree by a selector, e.g. surface.select("SectionBlock > Button[style=primary]"). The
+        index of the tree is kept by this object, so repeated queries cost about the size of their results.
+        :param selector: Selector, see the Select module.
+        :return: Matching objects in document order.
+        :raises ValueError: If the selector is not valid.
+        """
+        from BlockAPI.Select import select  # Selectors resolve class names through the registry of this module
+        return select(self, selector)
+
+    def drop_index(self):
+        """
+        Drop the index kept by select() and the observer it registered. While any object is observed, every change
+        of a tracked tree travels up to its roots, so drop the index of objects not queried anymore. The next query
+        indexes the object again.
+        """
+        _index = self._index
+        if _index is not None:
+            object.__setattr__(self, "_index", None)
+            self.unobserve(_index.changed)
+
+    def select_one(self, selector: str):
+        """
+        :return: First object matching the selector or None.
+        """
+        _result = self.select(selector)
+        return _result[0] if _result else None
+
+    def freeze(self):
+        """
+        Create immutable, hashable snapshot of the object tree with the JSON payload serialized in advance, safe to
+        be shared by threads without locks. Use thaw() of the snapshot to get a mutable copy back.
+        :return: Frozen snapshot.
+        """
+        from BlockAPI.Frozen import Frozen  # Frozen depends on the snapshots, which depend on this module
+        return Frozen(self)
+
+    @property
+    def encoded_size(self) -> int:
+        """
+        Length in bytes of the object encoded by to_json(). The size is cached on every object of the tree and kept
+        up to date by the property setters and by the add methods of the surfaces, so only the objects changed since
+        the last measurement are measured again. In-place changes of lists (e.g. surface.blocks.append(...)) are not
+        tracked, assign the list again to account for them.
+        :return: Size of the encoded object in bytes.
+        """
+        if self._size is None:
+            if type(self._body) is dict:
+                object.__setattr__(self, "_body", _Body(self, self._body))
+            object.__setattr__(self, "_size", self._compute_size())
+        return self._size
+
+    def _compute_size(self) -> int:
+        return _encoded_size(self._body, self)
+
+    def _add_parent(self, _parent):
+        if self._parents is None:
+            object.__setattr__(self, "_parents", {})
+        _ref = self._parents.get(id(_parent))
+        # The id may be left over by a collected parent
+        if _ref is None or _ref() is not _parent:
+            self._parents[id(_parent)] = ref(_parent)
+
+    def _invalidate_size(self):
+        # A measured object only contains measured objects, so the walk up can stop at objects already invalidated
+        _stack = [self]
+        while _stack:
+            _node = _stack.pop()
+            if _node._size is None:
+                continue
+            object.__setattr__(_node, "_size", None)
+            if _node._parents:
+                for _ref in list(_node._parents.values()):
+                    _parent = _ref()
+                    if _parent is not None:
+                        _stack.append(_parent)
+
+    # CHANGE TRACKING #
+    def observe(self, observer: Callable):
+        """
+        Subscribe to the changes of the object and of all objects below it. The observer is called right after
+        every change of a body (property setters, add methods of the surfaces, direct changes of the body) with a
+        Change holding the path from this object, the changed object, the key and the old and new values.
+            surface.observe(lambda change: log.info("%s.%s = %r", change.path, change.key, change.new))
+        Like for encoded_size, in-place changes of lists are not reported, assign the list again.
+        :param observer: Callable receiving the Change.
+        :return: The observer, so the method can be used as a decorator.
+        """
+        self._track()
+        if self._observers is None:
+            object.__setattr__(self, "_observers", [])
+        self._observers.append(observer)
+        _OBSERVED[id(self)] = self
+        return observer
+
+    def unobserve(self, observer: Callable):
+        """
+        :raises ValueError: If the observer does not observe the object.
+        """
+        if not self._observers or observer not in self._observers:
+            raise ValueError("Observer does not observe the object.")
+        self._observers.remove(observer)
+        if not self._observers:
+            _OBSERVED.pop(id(self), None)
+
+    def _track(self):
+        # Make the bodies of the tree report their changes and link the objects to their parents
+        for _, _node in self.walk():
+            if type(_node._body) is dict:
+                object.__setattr__(_node, "_body", _Body(_node, _node._body))
+            for _child in _node._children():
+                _child._add_parent(_node)
+
+    def _changed(self, _key: str, _old, _new):
+        # Single channel of the changes of the tracked bodies
+        _adopt(_new, self)
+        self._invalidate_size()
+        if _OBSERVED:
+            _notify(self, _key, _old, _new)
+
+    def _list_changed(self, _key: str):
+        # In-place change of the list under the key, made by the object itself (e.g. the add methods of surfaces)
+        if type(self._body) is _Body:
+            _list = self._body.get(_key)
+            self._changed(_key, _list, _list)
+
+    def _children(self) -> list:
+        _body = self._body
+        _result = []
+        for _key in self._child_keys:
+            _value = _body.get(_key)
+            if _value is None:
+                continue
+            if type(_value) is list or type(_value) is tuple:
+                _result.extend(_value)
+            else:
+                _result.append(_value)
+        return _result
+
+    def _locate(self, _child) -> Optional[tuple]:
+        # Path of the child in the body, None if the object does not contain it
+        _body = self._body
+        for _key in self._child_keys:
+            _value = _body.get(_key)
+            if _value is _child:
+                return _key,
+            if type(_value) is list or type(_value) is tuple:
+                for _i, _v in enumerate(_value):
+                    if _v is _child:
+                        return _key, _i
+        return None
+
+    def _encodable(self, _raws: list):
+        return _to_encodable(self._body, _raws)
+
+    def _add_raw(self, _raws: list, _raw: bytes) -> str:
+        # The first item of _raws holds a random nonce making the placeholders impossible to forge by user strings
+        if not _raws:
+            _raws.append(urandom(16).hex().encode())
+        _raws.append(_raw)
+        return f"{_raws[0].decode()}{len(_raws) - 1}"
+
+    def __reduce__(self):
+        # Used by pickle and copy. Objects are restored by a function generated per layout (body keys and attribute
+        # names), which is shared by all objects of the same shape and sent once per stream. Values shared by an
+        # attribute and the body are sent once, as pickle memoizes them. Cached sizes are not sent.
+        _state = _attributes(self)
+        _body = self._body
+        _shape = (type(self), *_state, None, *_body)
+        _cached = _PICKLE_LAYOUTS.get(_shape)
+        if _cached is None:
+            _sent = tuple(_n not in type(self)._transient for _n in _state)
+            _cached = _PICKLE_LAYOUTS[_shape] = ((tuple(_body), (), (), tuple(compress(_state, _sent))), _sent)
+        _layout_, _sent = _cached
+        return _restore, (type(self), _layout_, (*_body.values(), *compress(_state.values(), _sent)))
+
+    def _reduce_state(self) -> tuple:
+        # State used by deepcopy and snapshots: (layout, body values, other attribute values), the layout holds the
+        # body keys and attribute names and is shared by all objects of the same shape. Most attributes hold the same
+        # object as the body under the key without the underscore, e.g. self._text is self._body["text"], such
+        # attributes are restored from the body rather than stored twice.
+        _state = _attributes(self)
+        _body = self._body
+        _names = tuple(_state)
+        _values = _state.values()
+        _body_keys = tuple(_body)
+
+        _cached = _LAYOUTS.get((type(self), _names, _body_keys))
+        if _cached is None:
+            _cached = _LAYOUTS[(type(self), _names, _body_keys)] = (tuple(_n[1:] for _n in _names), {})
+        _keys, _layouts = _cached
+        _same = tuple(map(is_, map(_body.get, _keys), _values))
+        _layout_ = _layouts.get(_same)
+        if _layout_ is None:
+            _layout_ = _layouts[_same] = _layout(type(self), _names, _keys, _same, _body_keys)
+
+        _layout_, _selectors = _layout_
+        return _layout_, tuple(_body.values()), tuple(compress(_values, _selectors))
+
+    def __deepcopy__(self, memo: dict):
+        # Only the values are copied, the layout is immutable
+        _layout_, _body_values, _values = self._reduce_state()
+        _copy = type(self).__new__(type(self))
+        memo[id(self)] = _copy
+        _copy.__setstate__((_layout_, deepcopy(_body_values, memo), deepcopy(_values, memo)))
+        return _copy
+
+    def __setstate__(self, state: tuple):
+        # Restore state produced by _reduce_state (or pickled by __reduce__ of previous versions), the attributes
+        # duplicating values of the body are restored from it
+        if type(state) is tuple:
+            (_body_keys, _attrs, _keys, _names), _body_values, _values = state
+            _body = dict(zip(_body_keys, _body_values))
+            object.__setattr__(self, "_body", _body)
+            # The instance dictionary is filled directly
+            _state = _attributes(self)
+            _get = _body.get
+            for _attr, _key in zip(_attrs, _keys):
+                _state[_attr] = _get(_key)
+            for _name, _value in zip(_names, _values):
+                _state[_name] = _value
+            return
+
+        # State dictionary of objects pickled by previous versions. __dict__ is shadowed by the method above, so
+        # pickle can not update the instance dictionary directly.
+        for key, value in state.items():
+            object.__setattr__(self, key, value)
+
     # PROPERTY SETTING METHODS #
     # _type_name can be option, user, conversation or channel, append with 's' if multi type
     def _set_select_type(self, _type: str, _type_name: str):
@@ -116,19 +666,20 @@ class BlockInterface:
         self._placeholder = _placeholder
 
     def _set_init_options(self, _init_options: List, _type_name: str):
-        if self._type.startswith("multi"):
+        if not _init_options:
+            self._body.pop(f"initial_{_type_name}s", None)
+            self._body.pop(f"initial_{_type_name}", None)
+        elif self._type.startswith("multi"):
             self._body[f"initial_{_type_name}s"] = _init_options
         else:
-            self._body["initial_{_type_name}"] = _init_options[0]
+            self._body[f"initial_{_type_name}"] = _init_options[0]
 
-        if _type_name == "option":
+        if _type_name == "option" and _init_options:
             if self._options:
                 if not all(list(map(lambda x: x in self._options, _init_options))):
                     raise ValueError("Initial options must match the options list.")
             if self._option_groups:
-                _l = [all(list(map(lambda x: x in _og.options, _init_options))) for _og in self._option_groups]
-                if _l.count(True) != 1:
-                    raise ValueError("Initial options must match exactly on of the option groups ")
+                check_init_options_in_groups(_init_options, self._option_groups)
 
         self._init_options = _init_options
 
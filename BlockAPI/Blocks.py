@@ -1,11 +1,35 @@
-from BlockAPI.BlockElements import *
+from __future__ import annotations
+
+import json
+
+from BlockAPI.CompositionObjects import *
 from .utils import *
 
 
+def __getattr__(name: str):
+    # Block elements are imported on first use only, blocks refer to them just in annotations
+    if name.startswith("__"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from BlockAPI import BlockElements
+    try:
+        return getattr(BlockElements, name)
+    except AttributeError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+
+def _check_single_selects(_elements):
+    from BlockAPI.BlockElements import StaticOptions, ExternalDataOptions, UserListOptions, \
+        ConversationOptions, PublicChannelOptions
+
+    _restricted_types = (StaticOptions, ExternalDataOptions, UserListOptions, ConversationOptions,
+                         PublicChannelOptions)
+    for _e in _elements:
+        if type(_e) in _restricted_types and _e.type.startswith("multi"):
+            raise ValueError("Only single type options can be used with Action Block.")
+
+
 class ActionBlock(BlockInterface):
-    __restricted_types = [StaticOptions, ExternalDataOptions,
-                          UserListOptions, ConversationOptions,
-                          PublicChannelOptions]
+    _child_keys = ("elements",)
 
     def __init__(self,
                  elements: List[Union[Button, CheckBoxGroup, DatePicker,
@@ -14,9 +38,7 @@ class ActionBlock(BlockInterface):
                                 ConversationOptions, PublicChannelOptions, TimePicker]],
                  block_id: str = None):
         check_length(elements, _min=1, _max=25)
-        for _e in elements:
-            if type(_e) in self.__restricted_types and _e.type.startswith("multi"):
-                raise ValueError("Only single type options can be used with Action Block.")
+        _check_single_selects(elements)
 
         self._body = {
             "type": "actions",
@@ -37,9 +59,7 @@ class ActionBlock(BlockInterface):
     @elements.setter
     def elements(self, _elements):
         check_length(_elements, _min=1, _max=25)
-        for _e in _elements:
-            if type(_e) in self.__restricted_types and _e.type.startswith("multi"):
-                raise ValueError("Only single type options can be used with Action Block.")
+        _check_single_selects(_elements)
         self._body["elements"] = _elements
         self._elements = _elements
 
@@ -53,6 +73,7 @@ class ActionBlock(BlockInterface):
 
 
 class ContextBlock(BlockInterface):
+    _child_keys = ("elements",)
 
     def __init__(self,
                  elements: List[Union[Image, Text]],
@@ -150,6 +171,7 @@ class FileBlock(BlockInterface):
 
 
 class HeaderBlock(BlockInterface):
+    _child_keys = ("text",)
 
     def __init__(self,
                  text: Text,
@@ -190,6 +212,7 @@ class HeaderBlock(BlockInterface):
 
 
 class ImageBlock(BlockInterface):
+    _child_keys = ("title",)
 
     def __init__(self,
                  image_url: str,
@@ -240,7 +263,7 @@ class ImageBlock(BlockInterface):
 
     @property
     def title(self):
-        return self.title
+        return self._body.get("title")
 
     @title.setter
     def title(self, _title):
@@ -262,6 +285,7 @@ class ImageBlock(BlockInterface):
 
 
 class InputBlock(BlockInterface):
+    _child_keys = ("label", "element", "hint")
 
     def __init__(self,
                  label: Text,
@@ -364,6 +388,7 @@ class InputBlock(BlockInterface):
 
 
 class SectionBlock(BlockInterface):
+    _child_keys = ("text", "fields", "accessory")
 
     def __init__(self,
                  text: Text = None,
@@ -396,7 +421,7 @@ class SectionBlock(BlockInterface):
         if accessory:
             self._body["accessory"] = accessory
 
-        self._text = text,
+        self._text = text
         self._block_id = block_id
         self._fields = fields
         self._accessory = accessory
@@ -435,6 +460,7 @@ class SectionBlock(BlockInterface):
 
 
 class VideoBlock(BlockInterface):
+    _child_keys = ("title", "description")
 
     def __init__(self,
                  alt_text: str,
@@ -606,3 +632,66 @@ class VideoBlock(BlockInterface):
         else:
             self._body.pop("title_url", None)
         self._title_url = _title_url
+
+
+class RawBlock(BlockInterface):
+    """
+    Block that is already serialized, e.g. cached from an earlier render or produced by another service. The block
+    is validated once on creation, build() passes its dictionary through and to_json() copies its JSON bytes to the
+    output verbatim. The block must not be modified after it has been created.
+    The block is given as a JSON string or UTF-8 bytes, copied to the output as they are, or as a dictionary, which
+    is copied and encoded compactly. Other encodings, a byte order mark and NaN or infinite numbers are rejected, as
+    they would not be valid in the payload.
+    """
+
+    def __init__(self, block: Union[dict, str, bytes]):
+        if isinstance(block, dict):
+            try:
+                _raw = json.dumps(block, separators=(",", ":"), ensure_ascii=False, allow_nan=False).encode()
+            except ValueError:
+                raise ValueError("Raw block must not contain NaN or infinite numbers.")
+            _body = json.loads(_raw)
+        else:
+            try:
+                _text = block if isinstance(block, str) else bytes(block).decode()
+            except UnicodeDecodeError:
+                raise ValueError("Raw block must be UTF-8 encoded.")
+            try:
+                _raw = _text.encode()
+                _body = json.loads(_text, parse_constant=_reject_constant)
+            except ValueError:
+                raise ValueError("Raw block is not a valid JSON.")
+
+        if not isinstance(_body, dict) or not isinstance(_body.get("type"), str):
+            raise ValueError("Raw block must be a JSON object with type property.")
+        if _body.get("block_id") is not None:
+            check_length(_body["block_id"], _min=1, _max=255)
+
+        self._body = _body
+        self._raw = _raw
+
+    @property
+    def type(self) -> str:
+        return self._body["type"]
+
+    @property
+    def block_id(self) -> Optional[str]:
+        return self._body.get("block_id")
+
+    @property
+    def raw(self) -> bytes:
+        return self._raw
+
+    def build(self) -> dict:
+        return self._body
+
+    def _encodable(self, _raws: list):
+        return self._add_raw(_raws, self._raw)
+
+    def _compute_size(self) -> int:
+        return len(self._raw)
+
+
+def _reject_constant(_constant: str):
+    # NaN, Infinity and -Infinity are accepted by json.loads, but are not JSON
+    raise ValueError(f"{_constant} is not a valid JSON number.")
@@ -0,0 +1,234 @@
+import json
+from typing import Callable, Optional, Sequence
+
+from BlockAPI.BlockInterface import _splice_raws, _to_encodable
+from BlockAPI.Blocks import *
+
+TRIM_FIELDS = "trim_fields"
+SHORTEN_TEXT = "shorten_text"
+COLLAPSE_CONTEXT = "collapse_context"
+DROP_BLOCKS = "drop_blocks"
+
+ALL_STRATEGIES = (TRIM_FIELDS, SHORTEN_TEXT, COLLAPSE_CONTEXT, DROP_BLOCKS)
+
+
+def _size(_value) -> int:
+    return len(json.dumps(_value, separators=(",", ":"), ensure_ascii=False).encode())
+
+
+class PayloadBudget:
+    """
+    Limits of a payload and the strategies used to degrade the content of a surface until it fits them. The
+    strategies are applied in the given order, each of them to the blocks ordered from the lowest priority (and,
+    among equal priorities, from the end of the surface) and only as long as the payload does not fit:
+        - trim_fields: remove fields of section blocks from the end (a section keeps at least 1 field if it has
+          no text),
+        - shorten_text: shorten texts of section, header and context blocks, ending them with the ellipsis,
+        - collapse_context: merge all texts of a context block into a single text and drop its images,
+        - drop_blocks: remove whole blocks.
+    The block count limit is always enforced by dropping blocks.
+    """
+
+    def __init__(self,
+                 max_bytes: int = None,
+                 max_blocks: int = None,
+                 strategies: Sequence[str] = ALL_STRATEGIES,
+                 ellipsis: str = "…",
+                 min_text_length: int = 10):
+        """
+        :param max_bytes: Maximum size of the JSON encoded payload in bytes, unlimited if None.
+        :param max_blocks: Maximum number of blocks, if None the limit of the surface type is used.
+        :param strategies: Names of the degradation strategies in the order they are applied.
+        :param ellipsis: String ending shortened texts.
+        :param min_text_length: Texts are never shortened below this number of characters (ellipsis included).
+        """
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError("Maximum bytes must be positive.")
+        if max_blocks is not None and max_blocks < 0:
+            raise ValueError("Maximum blocks can not be negative.")
+        if not all(list(map(lambda x: x in ALL_STRATEGIES, strategies))):
+            raise ValueError(f"Unknown strategy, can only be: {ALL_STRATEGIES}.")
+        if min_text_length <= len(ellipsis):
+            raise ValueError("Minimum text length must be longer than the ellipsis.")
+
+        self._max_bytes = max_bytes
+        self._max_blocks = max_blocks
+        self._strategies = tuple(strategies)
+        self._ellipsis = ellipsis
+        self._min_text_length = min_text_length
+
+    @property
+    def max_bytes(self) -> Optional[int]:
+        return self._max_bytes
+
+    @property
+    def max_blocks(self) -> Optional[int]:
+        return self._max_blocks
+
+    @property
+    def strategies(self):
+        return self._strategies
+
+    @property
+    def ellipsis(self) -> str:
+        return self._ellipsis
+
+    @property
+    def min_text_length(self) -> int:
+        return self._min_text_length
+
+
+def build_within_budget(surface: BlockInterface,
+                        budget: PayloadBudget,
+                        max_blocks: int,
+                        priority: Callable[[BlockInterface], int] = None) -> bytes:
+    """
+    Serialize the surface so that the payload fits the budget. The surface itself is not modified. Block sizes are
+    taken from the cached encoded sizes, so only the degraded blocks are built and measured again.
+    :param surface: Surface to be serialized.
+    :param budget: Budget to be fitted.
+    :param max_blocks: Block limit of the surface type, used if the budget does not set its own.
+    :param priority: Callable returning priority of a block, lower priorities are degraded first. All blocks have
+    equal priority if None.
+    :return: JSON bytes encoded like to_json(), the blocks left intact are the same bytes as in to_json() of the
+    surface (raw blocks verbatim). The byte limit holds for these bytes, not for other encodings of the payload.
+    :raises ValueError: If the payload can not fit the budget using the configured strategies.
+    """
+    _blocks = surface._blocks
+    _built = {}  # Index -> degraded built block
+    _sizes = [_b.encoded_size for _b in _blocks]
+    _max_blocks = budget.max_blocks if budget.max_blocks is not None else max_blocks
+
+    # Block indices ordered from the one to be degraded first
+    _ranks = [priority(_b) for _b in _blocks] if priority else [0] * len(_blocks)
+    _order = sorted(range(len(_blocks)), key=lambda _i: (_ranks[_i], -_i))
+    _dropped = set()
+
+    def _drop(_i: int) -> int:
+        _dropped.add(_i)
+        # Bytes saved, the last remaining block has no separating comma
+        return _sizes[_i] + (1 if len(_dropped) < len(_blocks) else 0)
+
+    _excess = surface.encoded_size - (budget.max_bytes if budget.max_bytes is not None else surface.encoded_size)
+    for _i in _order[:max(0, len(_blocks) - _max_blocks)]:
+        _excess -= _drop(_i)
+
+    if _excess > 0:
+        for _strategy in budget.strategies:
+            for _i in _order:
+                if _excess <= 0:
+                    break
+                if _i in _dropped:
+                    continue
+                if _strategy == DROP_BLOCKS:
+                    _excess -= _drop(_i)
+                    continue
+
+                _block = _STRATEGIES[_strategy](_built[_i] if _i in _built else _blocks[_i].build(), _excess, budget)
+                if _block is not None:
+                    _new = _size(_block)
+                    _excess -= _sizes[_i] - _new
+                    _built[_i], _sizes[_i] = _block, _new
+
+        if _excess > 0:
+            raise ValueError(f"Payload exceeds the budget by {_excess} bytes after applying all strategies.")
+
+    if not _built and not _dropped:
+        return surface.to_json()
+    # Degraded blocks are encoded compactly by _size() rules, the others by to_json() rules
+    _body = dict(surface._body)
+    _body["blocks"] = [_built.get(_i, _b) for _i, _b in enumerate(_blocks) if _i not in _dropped]
+    _raws = []
+    return _splice_raws(json.dumps(_to_encodable(_body, _raws), separators=(",", ":"), ensure_ascii=False).encode(),
+                        _raws)
+
+
+# STRATEGIES #
+# Each strategy receives built block, returns its degraded copy or None if the strategy does not apply.
+def _trim_fields(_block: dict, _excess: int, budget: PayloadBudget) -> Optional[dict]:
+    _fields = _block.get("fields")
+    if _block.get("type") != "section" or not _fields:
+        return None
+
+    _keep = 0 if "text" in _block else 1
+    _fields = list(_fields)
+    while len(_fields) > _keep and _excess > 0:
+        _excess -= _size(_fields.pop()) + 1
+
+    if len(_fields) == len(_block["fields"]):
+        return None
+    _block = dict(_block)
+    if _fields:
+        _block["fields"] = _fields
+    else:
+        _block.pop("fields")
+    return _block
+
+
+def _shorten(_text: dict, _excess: int, budget: PayloadBudget) -> Optional[dict]:
+    _s = _text["text"]
+    if len(_s) <= budget.min_text_length:
+        return None
+    # Every removed character saves at least one byte, the ellipsis may take more bytes than characters
+    _extra = len(budget.ellipsis.encode()) - len(budget.ellipsis)
+    _length = max(budget.min_text_length, len(_s) - _excess - _extra) - len(budget.ellipsis)
+    _short = _s[:_length].rstrip() + budget.ellipsis
+    # Clamped to the minimum length, the ellipsis may take more bytes than the removed characters
+    if len(_short.encode()) >= len(_s.encode()):
+        return None
+    _text = dict(_text)
+    _text["text"] = _short
+    return _text
+
+
+def _shorten_text(_block: dict, _excess: int, budget: PayloadBudget) -> Optional[dict]:
+    _type = _block.get("type")
+    if _type in ("section", "header"):
+        _slots = [("text", None)] if isinstance(_block.get("text"), dict) else []
+        _slots += [("fields", _i) for _i in range(len(_block.get("fields", ())))]
+    elif _type == "context":
+        _slots = [("elements", _i) for _i, _e in enumerate(_block["elements"]) if "text" in _e]
+    else:
+        return None
+
+    # Longest texts first
+    _slots.sort(key=lambda _s: -len((_block[_s[0]] if _s[1] is None else _block[_s[0]][_s[1]])["text"]))
+    _result = None
+    for _key, _ix in _slots:
+        if _excess <= 0:
+            break
+        _text = _block[_key] if _ix is None else _block[_key][_ix]
+        _short = _shorten(_text, _excess, budget)
+        if _short is None:
+            continue
+
+        if _result is None:
+            _result = dict(_block)
+        if _ix is None:
+            _result[_key] = _short
+        else:
+            _result[_key] = list(_result[_key])
+            _result[_key][_ix] = _short
+        _excess -= _size(_text) - _size(_short)
+
+    return _result
+
+
+def _collapse_context(_block: dict, _excess: int, budget: PayloadBudget) -> Optional[dict]:
+    if _block.get("type") != "context" or len(_block["elements"]) < 2:
+        return None
+
+    _texts = [_e["text"] for _e in _block["elements"] if "text" in _e]
+    _text = " | ".join(_texts) if _texts else _block["elements"][0].get("alt_text", "")
+    if not _text:
+        return None
+    _block = dict(_block)
+    _block["elements"] = [{"type": MRKDWN, "text": _text[:3000], "verbatim": False}]
+    return _block
+
+
+_STRATEGIES = {
+    TRIM_FIELDS: _trim_fields,
+    SHORTEN_TEXT: _shorten_text,
+    COLLAPSE_CONTEXT: _collapse_context,
+}
@@ -1,9 +1,32 @@
-from typing import Optional
+import json
+import sys
+from copy import deepcopy
+from typing import Dict, Optional, Sequence, Tuple
 
 from BlockAPI.BlockInterface import BlockInterface
 from BlockAPI.utils import *
 
 
+def _invalid_rows(_column, _max: int, _optional: bool = False) -> list:
+    """
+    :return: Indices of the items of the column which are not strings of length in [1, _max]. If _optional, None
+    items are valid. NumPy string arrays are checked in a vectorized way.
+    """
+    # NumPy is an optional dependency, arrays can only be passed if it has been imported already
+    _np = sys.modules.get("numpy")
+    if _np is not None and isinstance(_column, _np.ndarray) and _column.dtype.kind == "U":
+        _lengths = _np.char.str_len(_column)
+        return _np.flatnonzero((_lengths < 1) | (_lengths > _max)).tolist()
+
+    return [_i for _i, _s in enumerate(_column)
+            if not (type(_s) is str and 1 <= len(_s) <= _max or _optional and _s is None)]
+
+
+def _as_list(_column) -> list:
+    # NumPy arrays convert to lists of Python strings at once
+    return _column.tolist() if hasattr(_column, "tolist") else list(_column)
+
+
 class Text(BlockInterface):
 
     def __init__(self, type: str, text: str, emoji: bool = True, verbatim: bool = False):
@@ -80,6 +103,7 @@ class Text(BlockInterface):
 
 
 class ConfirmationDialog(BlockInterface):
+    _child_keys = ("title", "text", "confirm", "deny")
 
     def __init__(self, title: Text, text: Text, confirm: Text, deny: Text, style: str = DEFAULT):
         check_length(title.text, _min=1, _max=100)
@@ -164,7 +188,19 @@ class ConfirmationDialog(BlockInterface):
         self._style = _style
 
 
+def _plain_text(_s: str) -> Text:
+    # Plain text of already validated string
+    _text = Text.__new__(Text)
+    _text._type = PLAIN_TEXT
+    _text._text = _s
+    _text._emoji = True
+    _text._verbatim = False
+    _text._body = {"type": PLAIN_TEXT, "text": _s, "emoji": True}
+    return _text
+
+
 class Option(BlockInterface):
+    _child_keys = ("text", "description")
 
     def __init__(self, text: Text, value: str, description: Text = None, url: str = None):
         check_length(text.text, _min=1, _max=75)
@@ -192,6 +228,56 @@ class Option(BlockInterface):
     def __eq__(self, other):
         return isinstance(other, Option) and self._body == other._body
 
+    @classmethod
+    def bulk(cls,
+             texts: Sequence[str],
+             values: Sequence[str],
+             descriptions: Sequence[Optional[str]] = None,
+             skip_invalid: bool = False) -> List["Option"]:
+        """
+        Create options from columns of data, e.g. rows of a query result. Every column is validated at once (NumPy
+        string arrays in a vectorized way) and the options are created without validating them one by one, which
+        is several times faster than creating them with the constructor.
+        :param texts: Plain texts of the options.
+        :param values: Values of the options.
+        :param descriptions: Plain text descriptions of the options, None items for options without description.
+        :param skip_invalid: If True, rows with invalid text, value or description are left out, else ValueError
+        is raised.
+        :return: List of the options in order of the rows.
+        :raises ValueError: If the columns differ in length or, unless skip_invalid, any row is invalid. The
+        message lists indices of the invalid rows.
+        """
+        if len(texts) != len(values) or descriptions is not None and len(descriptions) != len(texts):
+            raise ValueError("Texts, values and descriptions must have the same length.")
+
+        _invalid = set(_invalid_rows(texts, 75)).union(_invalid_rows(values, 75))
+        if descriptions is not None:
+            _invalid.update(_invalid_rows(descriptions, 75, _optional=True))
+        if _invalid and not skip_invalid:
+            _rows = sorted(_invalid)
+            raise ValueError(f"Invalid text, value or description in {len(_rows)} rows: {_rows[:10]}"
+                             + ("..." if len(_rows) > 10 else "") + ".")
+
+        _texts, _values = _as_list(texts), _as_list(values)
+        _descriptions = _as_list(descriptions) if descriptions is not None else [None] * len(_texts)
+        _options = []
+        _append = _options.append
+        for _i, (_t, _v, _d) in enumerate(zip(_texts, _values, _descriptions)):
+            if _i in _invalid:
+                continue
+            _o = cls.__new__(cls)
+            _o._text = _text = _plain_text(_t)
+            _o._value = _v
+            _o._url = None
+            if _d is None:
+                _o._description = None
+                _o._body = {"text": _text, "value": _v}
+            else:
+                _o._description = _description = _plain_text(_d)
+                _o._body = {"text": _text, "value": _v, "description": _description}
+            _append(_o)
+        return _options
+
     @property
     def text(self):
         return self._text
@@ -236,6 +322,7 @@ class Option(BlockInterface):
 
 
 class OptionGroups(BlockInterface):
+    _child_keys = ("label", "options")
 
     def __init__(self, label: Text, options: List[Option]):
         check_length(label.text, _min=1, _max=75)
@@ -336,3 +423,113 @@ class DispatchActionConfig(BlockInterface):
         check_config_options(_config)
         self._config = _config
         self._body["trigger_actions_on"] = _config
+
+
+class OptionCatalog(BlockInterface):
+    """
+    Immutable list of options (or option groups) meant to be shared by many elements, e.g. the same list of teams
+    used by several StaticOptions and CheckBoxGroup elements. The catalog is validated once on creation and
+    serialized once, on the first build; every element referencing it splices the same serialized fragment into
+    its payload. The options are copied on creation, so later changes to the passed objects do not affect it, and
+    the options handed out (indexing, iteration, options, option_groups, get()) are copies as well, so changing them
+    does not make the serialized fragment stale.
+    """
+    _fragment = None  # Built items, cached on the first build
+    _raw = None       # Encoded items, cached on the first encoding
+    _transient = BlockInterface._transient | {"_fragment", "_raw"}
+    _child_keys = ("options", "option_groups")
+
+    def __init__(self, options: List[Option] = None, option_groups: List[OptionGroups] = None):
+        if options is None and option_groups is None:
+            raise ValueError("Options and option groups are both None, exactly 1 must be specified.")
+        if options is not None and option_groups is not None:
+            raise ValueError("Options and option groups are both specified, exactly 1 must be specified")
+
+        if options is not None:
+            check_length(options, _min=1, _max=100)
+            self._kind = "options"
+            self._items = tuple(deepcopy(options))
+            _options = self._items
+        else:
+            check_length(option_groups, _min=1, _max=100)
+            self._kind = "option_groups"
+            self._items = tuple(deepcopy(option_groups))
+            _options = [_o for _og in self._items for _o in _og.options]
+
+        self._values = {_o.value: _o for _o in _options}
+        self._groups: Dict[str, List[Tuple[int, Option]]] = {}  # Value -> (group index, option) of option groups
+        if self._kind == "option_groups":
+            for _ix, _og in enumerate(self._items):
+                for _o in _og.options:
+                    self._groups.setdefault(_o.value, []).append((_ix, _o))
+        self._has_url = any(_o.url is not None for _o in _options)
+        self._fragment = None
+        self._raw = None
+
+        self._body = {self._kind: self._items}
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(deepcopy(self._items))
+
+    def __getitem__(self, ix):
+        return deepcopy(self._items[ix])
+
+    def __contains__(self, item):
+        # Constant time membership, used when checking initial options of the referencing elements
+        return isinstance(item, Option) and self._values.get(item.value) == item
+
+    def _matching_groups(self, _options: List[Option]) -> int:
+        # Number of the groups holding all of the options, looked up without copying the groups
+        _matching = None
+        for _option in _options:
+            _ixs = {_ix for _ix, _o in self._groups.get(_option.value, ()) if _o == _option}
+            _matching = _ixs if _matching is None else _matching & _ixs
+            if not _matching:
+                return 0
+        return len(_matching) if _matching is not None else len(self._items)
+
+    @property
+    def kind(self) -> str:
+        """
+        Either "options" or "option_groups".
+        """
+        return self._kind
+
+    @property
+    def options(self) -> Tuple[Option]:
+        return deepcopy(self._items if self._kind == "options" else tuple(self._values.values()))
+
+    @property
+    def option_groups(self) -> Optional[Tuple[OptionGroups]]:
+        return deepcopy(self._items) if self._kind == "option_groups" else None
+
+    @property
+    def has_url(self) -> bool:
+        return self._has_url
+
+    def get(self, value: str) -> Optional[Option]:
+        _option = self._values.get(value)
+        return deepcopy(_option) if _option is not None else None
+
+    def build(self) -> tuple:
+        """
+        :return: Built items, built on the first call. The same tuple is returned by every call and shared by the
+        builds of all referencing elements, it must not be changed.
+        """
+        if self._fragment is None:
+            self._fragment = tuple(_item.build() for _item in self._items)
+        return self._fragment
+
+    def _encodable(self, _raws: list):
+        return self._add_raw(_raws, self._encoded_fragment())
+
+    def _compute_size(self) -> int:
+        return len(self._encoded_fragment())
+
+    def _encoded_fragment(self) -> bytes:
+        if self._raw is None:
+            self._raw = json.dumps(self.build(), separators=(",", ":"), ensure_ascii=False).encode()
+        return self._raw
@@ -0,0 +1,204 @@
+"""
+In-process fake of the Slack Web API for tests and load benchmarks of publishing.
+
+    async with FakeSlackAPI(rate_limit=50, latency=0.01) as api:
+        scheduler = PublishScheduler(http_sender(api.url, "xoxb-test"))
+        ...
+        api.calls          # [(method, request), ...] of the accepted calls
+        api.views[user]    # last view published to the user
+        api.messages[chan] # messages posted to the channel
+
+The server speaks enough HTTP/1.1 for the senders of the package (keep-alive included) and validates only what
+posting depends on: the token, the target of the method and the presence of the view or message content.
+"""
+import asyncio
+import json
+from typing import Dict, List, Optional, Tuple
+
+
+class FakeSlackAPI:
+    """
+    Fake Web API server listening on localhost, answering views.publish, views.update, views.open and
+    chat.postMessage. Every other method answers with error unknown_method.
+    """
+
+    def __init__(self,
+                 token: str = None,
+                 rate_limit: int = None,
+                 period: float = 1.0,
+                 retry_after: float = 1,
+                 latency: float = 0.0,
+                 framing: str = "length"):
+        """
+        :param token: Bot token the requests must carry, any token is accepted if None.
+        :param rate_limit: Maximum number of calls per period, calls over the limit are answered with HTTP 429
+        and Retry-After. Unlimited if None.
+        :param period: Length of the rate limiting window in seconds.
+        :param retry_after: Seconds of the Retry-After header of rate limited calls (Slack sends whole seconds,
+        fractions keep tests fast).
+        :param latency: Seconds every call takes before it is answered.
+        :param framing: How the response bodies are delimited: "length" (Content-Length), "chunked" (chunked
+        transfer coding) or "close" (no length, the connection is closed after every response).
+        :raises ValueError: If the framing is not supported.
+        """
+        if framing not in _FRAMINGS:
+            raise ValueError(f"Unsupported framing {framing}, can only be: {_FRAMINGS}.")
+        self._token = token
+        self._rate_limit = rate_limit
+        self._period = period
+        self._retry_after = retry_after
+        self._latency = latency
+        self._framing = framing
+        self._window: List[float] = []   # Times of the calls of the last period
+        self._failures: List[int] = []  # HTTP statuses of the next calls, see fail()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._handlers = set()  # Tasks of the open connections, cancelled when the server is closed
+
+        self.calls: List[Tuple[str, dict]] = []
+        self.views: Dict[str, dict] = {}  # user_id, view_id or trigger_id -> last view
+        self.messages: Dict[str, List[dict]] = {}  # channel -> posted messages
+        self.rate_limited = 0
+        self.connections = 0
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def start(self, port: int = 0):
+        """
+        :param port: Port to listen on, any free port if 0.
+        """
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", port)
+
+    async def close(self):
+        """
+        Stop listening and close the open connections, like a restart of the server.
+        """
+        if self._server is not None:
+            self._server.close()
+            for _task in self._handlers:
+                _task.cancel()
+            await asyncio.gather(*self._handlers, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    @property
+    def url(self) -> str:
+        """
+        Base URL of the API, e.g. "http://127.0.0.1:43210/api".
+        """
+        if self._server is None:
+            raise ValueError("Server is not started.")
+        return "http://127.0.0.1:%d/api" % self._server.sockets[0].getsockname()[1]
+
+    def fail(self, *statuses: int):
+        """
+        Answer the next calls with the HTTP statuses, e.g. fail(500, 503) fails the next two calls.
+        """
+        self._failures.extend(statuses)
+
+    async def _handle(self, _reader: asyncio.StreamReader, _writer: asyncio.StreamWriter):
+        self.connections += 1
+        self._handlers.add(asyncio.current_task())
+        try:
+            while True:
+                _request = await _read_request(_reader)
+                if _request is None:
+                    break
+                _path, _headers, _body = _request
+                if self._latency:
+                    await asyncio.sleep(self._latency)
+                _status, _response_headers, _response = self._respond(_path, _headers, _body)
+                _close = _headers.get("connection", "").lower() == "close"
+                _head = f"HTTP/1.1 {_status} {_REASONS.get(_status, 'Error')}\r\n" \
+                        f"Content-Type: application/json; charset=utf-8\r\n"
+                if self._framing == "length":
+                    _head += f"Content-Length: {len(_response)}\r\n"
+                elif self._framing == "chunked":
+                    # Split in two chunks, so clients can not get away with reading the first one
+                    _half = len(_response) // 2
+                    _head += "Transfer-Encoding: chunked\r\n"
+                    _response = b"".join(b"%x\r\n%s\r\n" % (len(_c), _c) for _c in
+                                         (_response[:_half], _response[_half:]) if _c) + b"0\r\n\r\n"
+                _head += "".join(f"{_k}: {_v}\r\n" for _k, _v in _response_headers.items())
+                if _close:
+                    _head += "Connection: close\r\n"
+                _writer.write(_head.encode() + b"\r\n" + _response)
+                await _writer.drain()
+                if _close or self._framing == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._handlers.discard(asyncio.current_task())
+            _writer.close()
+
+    def _respond(self, _path: str, _headers: dict, _body: bytes) -> Tuple[int, dict, bytes]:
+        if self._failures:
+            return self._failures.pop(0), {}, b'{"ok":false,"error":"fatal_error"}'
+
+        if self._rate_limit is not None:
+            _now = asyncio.get_running_loop().time()
+            self._window = [_t for _t in self._window if _now - _t < self._period]
+            if len(self._window) >= self._rate_limit:
+                self.rate_limited += 1
+                return 429, {"Retry-After": "%g" % self._retry_after}, b'{"ok":false,"error":"ratelimited"}'
+            self._window.append(_now)
+
+        if self._token is not None and _headers.get("authorization") != f"Bearer {self._token}":
+            return 200, {}, _error("invalid_auth")
+
+        _method = _path.rsplit("/", 1)[-1]
+        _target_key = _TARGET_KEYS.get(_method)
+        if _target_key is None:
+            return 200, {}, _error("unknown_method")
+        try:
+            _request = json.loads(_body)
+        except ValueError:
+            return 200, {}, _error("invalid_json")
+        _target = _request.get(_target_key)
+        if not _target:
+            return 200, {}, _error("invalid_arguments")
+
+        if _method == "chat.postMessage":
+            if not _request.get("blocks") and not _request.get("text"):
+                return 200, {}, _error("no_text")
+            self.calls.append((_method, _request))
+            self.messages.setdefault(_target, []).append(_request)
+            return 200, {}, json.dumps({"ok": True, "channel": _target, "message": _request}).encode()
+
+        if not isinstance(_request.get("view"), dict):
+            return 200, {}, _error("invalid_arguments")
+        self.calls.append((_method, _request))
+        self.views[_target] = _request["view"]
+        return 200, {}, json.dumps({"ok": True, "view": {"id": _target, **_request["view"]}}).encode()
+
+
+# Method -> key of the target in the request
+_TARGET_KEYS = {"views.publish": "user_id", "views.update": "view_id", "views.open": "trigger_id",
+                "chat.postMessage": "channel"}
+_FRAMINGS = ("length", "chunked", "close")
+_REASONS = {200: "OK", 429: "Too Many Requests", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+def _error(_code: str) -> bytes:
+    return b'{"ok":false,"error":"%s"}' % _code.encode()
+
+
+async def _read_request(_reader: asyncio.StreamReader) -> Optional[Tuple[str, dict, bytes]]:
+    _line = await _reader.readline()
+    if not _line.strip():
+        return None
+    _path = _line.split()[1].decode()
+    _headers = {}
+    while True:
+        _line = await _reader.readline()
+        if _line in (b"\r\n", b"\n", b""):
+            break
+        _name, _, _value = _line.decode("latin-1").partition(":")
+        _headers[_name.strip().lower()] = _value.strip()
+    _body = await _reader.readexactly(int(_headers.get("content-length", 0)))
+    return _path, _headers, _body
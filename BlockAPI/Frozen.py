@@ -0,0 +1,95 @@
+"""
+Immutable snapshots of BlockAPI trees, meant to be shared by threads, e.g. prebuilt templates of a thread pool.
+
+    TEMPLATE = home_tab.freeze()   # once, at startup
+    client.views_publish(user_id=user, view=TEMPLATE.to_json())
+    surface = TEMPLATE.thaw()      # mutable copy to be personalized
+"""
+import json
+
+from BlockAPI import Snapshot
+from BlockAPI.BlockInterface import BlockInterface
+
+
+class Frozen:
+    """
+    Deeply immutable and hashable snapshot of an object tree. The snapshot holds only bytes: the JSON payload,
+    serialized when frozen, and the binary snapshot of the objects. Nothing of it can be changed after creation, so
+    any number of threads can read it without locks. Changes of the original tree after freezing do not affect it.
+    """
+    __slots__ = ("_type", "_json", "_snapshot", "_hash")
+
+    def __init__(self, obj: BlockInterface):
+        """
+        :param obj: Root of the tree to be frozen, e.g. a surface.
+        """
+        object.__setattr__(self, "_type", type(obj))
+        object.__setattr__(self, "_json", obj.to_json())
+        object.__setattr__(self, "_snapshot", Snapshot.dump(obj, include_json=False))
+        object.__setattr__(self, "_hash", None)
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"{type(self).__name__} is immutable.")
+
+    def __delattr__(self, key):
+        raise AttributeError(f"{type(self).__name__} is immutable.")
+
+    def __eq__(self, other):
+        return isinstance(other, Frozen) and self._type is other._type and self._json == other._json
+
+    def __hash__(self):
+        # Computed on the first use, racing threads compute the same value
+        if self._hash is None:
+            object.__setattr__(self, "_hash", hash((self._type, self._json)))
+        return self._hash
+
+    def __repr__(self):
+        return f"Frozen({self._type.__name__}, {len(self._json)} bytes)"
+
+    def __reduce__(self):
+        return _restore, (self._type, self._json, self._snapshot)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo: dict):
+        return self
+
+    @property
+    def type(self) -> type:
+        """
+        Class of the frozen object.
+        """
+        return self._type
+
+    @property
+    def encoded_size(self) -> int:
+        return len(self._json)
+
+    def to_json(self) -> bytes:
+        """
+        :return: JSON payload serialized when the tree was frozen.
+        """
+        return self._json
+
+    def build(self) -> dict:
+        """
+        :return: New dictionary of the payload, the caller is free to change it.
+        """
+        return json.loads(self._json)
+
+    def thaw(self) -> BlockInterface:
+        """
+        :return: New mutable tree equal to the frozen one. Every call returns an independent copy, restored from
+        the binary snapshot without running the constructors, so the frozen data is never written to.
+        """
+        return Snapshot.load(self._snapshot)
+
+
+def _restore(_type: type, _json: bytes, _snapshot: bytes) -> Frozen:
+    _frozen = Frozen.__new__(Frozen)
+    object.__setattr__(_frozen, "_type", _type)
+    object.__setattr__(_frozen, "_json", _json)
+    object.__setattr__(_frozen, "_snapshot", _snapshot)
+    object.__setattr__(_frozen, "_hash", None)
+    return _frozen
@@ -0,0 +1,233 @@
+"""
+Opt-in instrumentation of BlockAPI hot paths:
+    - blockapi_objects_constructed_total{class}: number of objects constructed per class,
+    - blockapi_build_seconds{surface, method}: histogram of build() and to_json() durations per surface type,
+    - blockapi_validation_calls_total{check}: number of calls of the check_* validation functions.
+
+Instrumentation works by wrapping the constructors, the surface build methods and the validation functions when
+enabled and restoring the originals when disabled, hence it costs nothing while disabled.
+
+    from BlockAPI import Instrumentation
+    Instrumentation.enable(sink=lambda name, labels, value: statsd.send(name, labels, value))
+    ...
+    print(Instrumentation.to_prometheus())
+"""
+import sys
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+from typing import Callable, Dict, Optional, Tuple
+
+from BlockAPI import utils
+from BlockAPI.BlockInterface import BlockInterface
+from BlockAPI.Surfaces import HomeSurface, MessageSurface, ModalSurface
+
+OBJECTS_CONSTRUCTED = "blockapi_objects_constructed_total"
+BUILD_SECONDS = "blockapi_build_seconds"
+VALIDATION_CALLS = "blockapi_validation_calls_total"
+
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, float("inf"))
+
+_SURFACES = (HomeSurface, MessageSurface, ModalSurface)
+
+_lock = threading.Lock()
+_sink: Optional[Callable[[str, dict, float], None]] = None
+_restore = []  # Callables undoing the patches
+_checks: Dict[Callable, Callable] = {}  # Wrapper -> original of the patched check_* functions
+_counters: Dict[Tuple[str, Tuple], int] = {}
+_histograms: Dict[Tuple[str, Tuple], "Histogram"] = {}
+
+
+class Histogram:
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def is_enabled() -> bool:
+    return bool(_restore)
+
+
+def enable(sink: Callable[[str, dict, float], None] = None):
+    """
+    Start collecting metrics. Enabling already enabled instrumentation only replaces the sink.
+    :param sink: Optional callable receiving every observation as (metric name, labels, value), e.g. to forward
+    the metrics to statsd. Metrics are aggregated in-process regardless of the sink.
+    """
+    global _sink
+    _sink = sink
+    if _restore:
+        return
+
+    for _cls in _subclasses(BlockInterface):
+        if "__init__" in _cls.__dict__:
+            _patch(_cls, "__init__", _counted_init(_cls.__dict__["__init__"], _cls.__name__))
+
+    for _cls in _SURFACES:
+        for _method in ("build", "to_json"):
+            _patch(_cls, _method, _timed(getattr(_cls, _method), _cls.__name__, _method))
+
+    # Modules import the checks with "from utils import *", each of them holds its own reference
+    _wrappers = {}
+    for _attr, _value in vars(utils).items():
+        if _attr.startswith("check_"):
+            _wrapper = _wrappers[_value] = _counted_check(_value, _attr)
+            _checks[_wrapper] = _value
+    for _module in _modules():
+        for _attr, _value in list(vars(_module).items()):
+            if _attr.startswith("check_") and _value in _wrappers:
+                _patch(_module, _attr, _wrappers[_value])
+
+
+def disable():
+    """
+    Stop collecting metrics and restore the original (uninstrumented) code. Collected metrics are kept.
+    """
+    global _sink
+    while _restore:
+        _restore.pop()()
+    # Modules imported while enabled copied the wrapped checks from the patched modules
+    if _checks:
+        for _module in _modules():
+            for _attr, _value in list(vars(_module).items()):
+                if _attr.startswith("check_") and _value in _checks:
+                    setattr(_module, _attr, _checks[_value])
+        _checks.clear()
+    _sink = None
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+def counters() -> Dict[Tuple[str, Tuple], int]:
+    """
+    :return: Copy of the counters keyed by (metric name, sorted label items).
+    """
+    with _lock:
+        return dict(_counters)
+
+
+def histograms() -> Dict[Tuple[str, Tuple], Histogram]:
+    """
+    :return: The histograms keyed by (metric name, sorted label items).
+    """
+    with _lock:
+        return dict(_histograms)
+
+
+def to_prometheus() -> str:
+    """
+    :return: Collected metrics in Prometheus text exposition format.
+    """
+    _lines = []
+    with _lock:
+        for _metric in (OBJECTS_CONSTRUCTED, VALIDATION_CALLS):
+            _lines.append(f"# TYPE {_metric} counter")
+            for (_name, _labels), _value in sorted(_counters.items()):
+                if _name == _metric:
+                    _lines.append(f"{_name}{_format_labels(_labels)} {_value}")
+
+        _lines.append(f"# TYPE {BUILD_SECONDS} histogram")
+        for (_name, _labels), _h in sorted(_histograms.items(), key=lambda _i: _i[0]):
+            _cumulative = 0
+            for _bound, _count in zip(BUCKETS, _h.counts):
+                _cumulative += _count
+                _le = "+Inf" if _bound == float("inf") else repr(_bound)
+                _lines.append(f"{_name}_bucket{_format_labels(_labels + (('le', _le),))} {_cumulative}")
+            _lines.append(f"{_name}_sum{_format_labels(_labels)} {_h.sum!r}")
+            _lines.append(f"{_name}_count{_format_labels(_labels)} {_h.count}")
+
+    return "\n".join(_lines) + "\n"
+
+
+def _format_labels(_labels: Tuple) -> str:
+    return "{" + ",".join(f'{_k}="{_v}"' for _k, _v in _labels) + "}"
+
+
+def _modules():
+    return [_module for _name, _module in list(sys.modules.items())
+            if _name.startswith("BlockAPI") and _module is not None]
+
+
+def _subclasses(_cls):
+    for _sub in _cls.__subclasses__():
+        yield _sub
+        yield from _subclasses(_sub)
+
+
+def _patch(_owner, _attr: str, _wrapper):
+    _had_own = _attr in vars(_owner)
+    _original = vars(_owner).get(_attr)
+    setattr(_owner, _attr, _wrapper)
+
+    def _undo():
+        if _had_own:
+            setattr(_owner, _attr, _original)
+        else:
+            delattr(_owner, _attr)
+
+    _restore.append(_undo)
+
+
+def _increment(_name: str, _labels: Tuple):
+    with _lock:
+        _counters[(_name, _labels)] = _counters.get((_name, _labels), 0) + 1
+    if _sink is not None:
+        _sink(_name, dict(_labels), 1)
+
+
+def _observe(_name: str, _labels: Tuple, _value: float):
+    with _lock:
+        _h = _histograms.get((_name, _labels))
+        if _h is None:
+            _h = _histograms[(_name, _labels)] = Histogram()
+        _h.observe(_value)
+    if _sink is not None:
+        _sink(_name, dict(_labels), _value)
+
+
+def _counted_init(_init, _class_name: str):
+    _labels = (("class", _class_name),)
+
+    @wraps(_init)
+    def _wrapper(self, *args, **kwargs):
+        _init(self, *args, **kwargs)
+        _increment(OBJECTS_CONSTRUCTED, _labels)
+
+    return _wrapper
+
+
+def _timed(_method, _surface: str, _method_name: str):
+    _labels = (("method", _method_name), ("surface", _surface))
+
+    @wraps(_method)
+    def _wrapper(self, *args, **kwargs):
+        _start = time.perf_counter()
+        try:
+            return _method(self, *args, **kwargs)
+        finally:
+            _observe(BUILD_SECONDS, _labels, time.perf_counter() - _start)
+
+    return _wrapper
+
+
+def _counted_check(_check, _check_name: str):
+    _labels = (("check", _check_name),)
+
+    @wraps(_check)
+    def _wrapper(*args, **kwargs):
+        _increment(VALIDATION_CALLS, _labels)
+        return _check(*args, **kwargs)
+
+    return _wrapper
@@ -0,0 +1,191 @@
+"""
+Localized rendering of surface templates from translation catalogs compiled once.
+
+    catalog = Catalog({"de": {"Approve": "Genehmigen", ...}, "fr": {"Approve": "Approuver", ...}})
+    template = LocalizedTemplate(approve_modal, catalog)  # e.g. at startup, raises if a translation does not fit
+    payload = template.render("de")                        # JSON bytes, same as to_json() of a translated copy
+
+Templates are written in the source language and the catalogs map the source texts to their translations, like
+gettext: the text of every Text object (labels, placeholders, option texts, ...) is looked up, texts without a
+translation are rendered as they are. The template is serialized once with the texts cut out, every locale has its
+strings encoded once, so a render only joins bytes and its result is cached per locale.
+
+Translations are validated when the template is compiled, against the limits of the places they are used at (e.g.
+75 characters of a button text, 150 of a header), by the same property setters that validate the surfaces. Only
+the slot holding a text is checked again: slots without a setter (SectionBlock.accessory, the initial option of
+selects) hold no texts themselves, the objects in them check their texts by their own setters.
+Texts of pre-serialized objects (RawBlock, OptionCatalog) are not translated.
+"""
+import json
+import re
+from copy import deepcopy
+from os import urandom
+from typing import Dict, List
+
+from BlockAPI.BlockInterface import BlockInterface
+from BlockAPI.CompositionObjects import Text
+from BlockAPI.utils import check_length
+
+
+def _encode(_text: str) -> bytes:
+    # Same encoding of strings as to_json()
+    return json.dumps(_text, ensure_ascii=False).encode()
+
+
+def _serialized(_path: tuple, _node: BlockInterface) -> bool:
+    # Objects encoding themselves (raw fragments) are not looked into
+    return type(_node)._encodable is not BlockInterface._encodable
+
+
+class Catalog:
+    """
+    Translations of the texts of templates to any number of locales, immutable once created.
+    """
+
+    def __init__(self, translations: Dict[str, Dict[str, str]]):
+        """
+        :param translations: Locale -> {source text: translated text}, e.g. {"de": {"Approve": "Genehmigen"}}.
+        :raises ValueError: If a translation is not a string or does not fit the length limit of texts.
+        """
+        self._translations: Dict[str, Dict[str, str]] = {}
+        self._fragments: Dict[str, Dict[str, bytes]] = {}  # Locale -> source text -> encoded translation
+        for _locale, _strings in translations.items():
+            for _source, _text in _strings.items():
+                if not isinstance(_text, str):
+                    raise ValueError(f"Translation of {_source!r} to {_locale} must be a string.")
+                try:
+                    check_length(_text, _min=1, _max=3000)
+                except ValueError as _e:
+                    raise ValueError(f"Translation of {_source!r} to {_locale}: {_e}") from _e
+            self._translations[_locale] = dict(_strings)
+            self._fragments[_locale] = {_source: _encode(_text) for _source, _text in _strings.items()}
+
+    @property
+    def locales(self) -> List[str]:
+        return list(self._translations)
+
+    def __contains__(self, locale: str) -> bool:
+        return locale in self._translations
+
+    def translate(self, locale: str, text: str) -> str:
+        """
+        :return: Translation of the text, the text itself if it has no translation.
+        :raises KeyError: If the catalog has no such locale.
+        """
+        return self._translations[locale].get(text, text)
+
+    def fragment(self, locale: str, text: str) -> bytes:
+        """
+        :return: Translation of the text encoded as a JSON string. Fragments of texts without a translation are
+        cached as well.
+        :raises KeyError: If the catalog has no such locale.
+        """
+        _fragments = self._fragments[locale]
+        _fragment = _fragments.get(text)
+        if _fragment is None:
+            _fragment = _fragments[text] = _encode(text)
+        return _fragment
+
+
+class LocalizedTemplate:
+    """
+    Surface template compiled against a catalog. Changes of the surface made afterwards are not rendered, compile
+    the template again.
+    """
+
+    def __init__(self, surface: BlockInterface, catalog: Catalog):
+        """
+        :param surface: Surface (or any other object) with texts in the source language.
+        :param catalog: Translations of the texts.
+        :raises ValueError: If a translation does not fit the place it is used at.
+        """
+        self._catalog = catalog
+        self._sources: List[str] = []  # Source text of every text cut out of the payload, in payload order
+        self._segments: List[bytes] = []  # Payload around the texts, one more than the texts
+        self._rendered: Dict[str, bytes] = {}
+
+        for _locale in catalog.locales:
+            self._validate(surface, _locale)
+        self._compile(surface)
+
+    def _compile(self, _surface: BlockInterface):
+        # Texts of a copy are replaced by "<nonce><index>" placeholders, the payload is split at them
+        _copy = deepcopy(_surface)
+        _nonce = urandom(16).hex()
+        _indexes = {}
+        _texts = []
+        for _, _text in _copy.walk(Text, prune=_serialized):
+            if id(_text) not in _indexes:
+                _indexes[id(_text)] = len(_texts)
+                _texts.append(_text)
+        for _i, _text in enumerate(_texts):
+            _text._body["text"] = f"{_nonce}{_i}"
+
+        _parts = re.split(b'"' + _nonce.encode() + rb'(\d+)"', _copy.to_json())
+        self._segments = _parts[0::2]
+        self._sources = [_texts[int(_i)].text for _i in _parts[1::2]]
+
+    def _validate(self, _surface: BlockInterface, _locale: str):
+        # The translations are set on a copy, then the parent of every translated text sets it again by its property
+        # setter, which checks the limits of the place. Slots are skipped only if they have no setter, none of them
+        # holds a text directly
+        _copy = deepcopy(_surface)
+        _translate = self._catalog.translate
+        # Sources are read first, texts shared by several places are translated by the first of them
+        for _path, _text, _source in [(_p, _t, _t.text) for _p, _t in _copy.walk(Text, prune=_serialized)]:
+            _translation = _translate(_locale, _source)
+            if _translation == _source or not _path:
+                continue
+            try:
+                if _text.text != _translation:
+                    _text.text = _translation
+                _parent, _key = _parent_of(_copy, _path)
+                _property = getattr(type(_parent), _key, None)
+                if isinstance(_property, property) and _property.fset is not None:
+                    setattr(_parent, _key, getattr(_parent, _key))
+            except ValueError as _e:
+                raise ValueError(f"Translation of {_source!r} to {_locale} does not fit "
+                                 f"{'/'.join(map(str, _path))}: {_e}") from _e
+
+    @property
+    def catalog(self) -> Catalog:
+        return self._catalog
+
+    def render(self, locale: str) -> bytes:
+        """
+        :param locale: Locale of the catalog.
+        :return: JSON payload of the surface with the texts translated, the same bytes as to_json() of a translated
+        copy. The payload is cached, the same bytes object is returned by the next renders of the locale.
+        :raises KeyError: If the catalog has no such locale.
+        """
+        _rendered = self._rendered.get(locale)
+        if _rendered is None:
+            if locale not in self._catalog:
+                raise KeyError(locale)
+            _fragment = self._catalog.fragment
+            _parts = [self._segments[0]]
+            for _source, _segment in zip(self._sources, self._segments[1:]):
+                _parts.append(_fragment(locale, _source))
+                _parts.append(_segment)
+            _rendered = self._rendered[locale] = b"".join(_parts)
+        return _rendered
+
+    def missing(self, locale: str) -> List[str]:
+        """
+        :return: Texts of the template without a translation to the locale, in payload order.
+        :raises KeyError: If the catalog has no such locale.
+        """
+        _translations = self._catalog._translations[locale]
+        return list(dict.fromkeys(_s for _s in self._sources if _s not in _translations))
+
+
+def _parent_of(_root: BlockInterface, _path: tuple) -> tuple:
+    """
+    :return: (parent, body key) of the object at the path.
+    """
+    _parent_path = _path[:-2] if type(_path[-1]) is int else _path[:-1]
+    _key = _path[-2] if type(_path[-1]) is int else _path[-1]
+    _parent = _root
+    for _step in _parent_path:
+        _parent = _parent._body[_step] if type(_step) is str else _parent[_step]
+    return _parent, _key
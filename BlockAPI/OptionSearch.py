@@ -0,0 +1,213 @@
+import bisect
+from collections import Counter
+from math import ceil
+from typing import Dict, Iterable
+
+from BlockAPI.CompositionObjects import *
+
+_NGRAM_SIZE = 3
+_MAX_RESULTS = 100  # Slack accepts at most 100 options in an external data source response
+
+
+def _normalize(_s: str) -> str:
+    return " ".join(_s.casefold().split())
+
+
+def _ngrams(_s: str) -> set:
+    _padded = f" {_s} "
+    return {_padded[_i:_i + _NGRAM_SIZE] for _i in range(len(_padded) - _NGRAM_SIZE + 1)}
+
+
+class _Entry:
+    __slots__ = ("option", "group", "text", "tokens", "ngrams")
+
+    def __init__(self, option: Option, group: Optional[str]):
+        self.option = option
+        self.group = group
+        self.text = _normalize(option.text.text)
+        self.tokens = tuple(dict.fromkeys(self.text.split() + [_normalize(option.value)]))
+        self.ngrams = _ngrams(self.text)
+
+
+class OptionIndex:
+    """
+    Search index over a catalog of Option objects, meant to back the options load URL used by
+    ExternalDataOptions. Queries are answered from sorted prefix tables (full text and individual words of both
+    text and value), whose cost depends on the number of results rather than on the size of the catalog. Queries
+    with fewer prefix matches than the limit fall back to a trigram index for fuzzy matches, which counts the options
+    sharing each trigram of the query, so its cost grows with the number of options containing those trigrams (up to
+    the size of the catalog for common ones).
+
+    Ranking: exact text match, then text prefix match (alphabetically), then word prefix match (by matching word),
+    then fuzzy (trigram) match (by number of shared trigrams).
+    """
+
+    def __init__(self, options: List[Option] = None, group: str = None, default_group: str = "Other"):
+        """
+        :param options: Initial options of the catalog.
+        :param group: Label of the option group the initial options belong to (used by search_groups).
+        :param default_group: Label used by search_groups for options added without a group.
+        """
+        check_length(default_group, _min=1, _max=75)
+
+        self._entries: Dict[str, _Entry] = {}
+        self._texts = []    # Sorted (normalized text, value) pairs
+        self._tokens = []   # Sorted (word, value) pairs
+        self._postings: Dict[str, set] = {}
+        self._default_group = default_group
+
+        if options:
+            self.add(options, group)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, value: str):
+        return value in self._entries
+
+    def get(self, value: str) -> Optional[Option]:
+        _entry = self._entries.get(value)
+        return _entry.option if _entry else None
+
+    # CATALOG UPDATES #
+    def add(self, options: Iterable[Option], group: str = None):
+        """
+        Add options to the catalog. Options whose value is already indexed replace the previous entry.
+        :param options: Options to be added.
+        :param group: Label of the option group the options belong to.
+        :return: Self.
+        """
+        if group is not None:
+            check_length(group, _min=1, _max=75)
+
+        _texts, _tokens = [], []
+        # Values repeated within the batch are not merged into the tables yet, the last of them is kept
+        _batch = {}
+        for _option in options:
+            _batch[_option.value] = _option
+        for _option in _batch.values():
+            if _option.value in self._entries:
+                self._remove(_option.value)
+
+            _entry = _Entry(_option, group)
+            self._entries[_option.value] = _entry
+            _texts.append((_entry.text, _option.value))
+            _tokens.extend((_token, _option.value) for _token in _entry.tokens)
+            for _gram in _entry.ngrams:
+                self._postings.setdefault(_gram, set()).add(_option.value)
+
+        self._merge(self._texts, _texts)
+        self._merge(self._tokens, _tokens)
+        return self
+
+    def remove(self, values: Iterable[str]):
+        """
+        Remove options from the catalog.
+        :param values: Values of the options to be removed. Unknown values are ignored.
+        :return: Self.
+        """
+        for _value in values:
+            if _value in self._entries:
+                self._remove(_value)
+        return self
+
+    def _remove(self, _value: str):
+        _entry = self._entries.pop(_value)
+
+        del self._texts[bisect.bisect_left(self._texts, (_entry.text, _value))]
+        for _token in _entry.tokens:
+            del self._tokens[bisect.bisect_left(self._tokens, (_token, _value))]
+        for _gram in _entry.ngrams:
+            _posting = self._postings[_gram]
+            _posting.discard(_value)
+            if not _posting:
+                del self._postings[_gram]
+
+    # QUERIES #
+    def search(self, query: str, limit: int = _MAX_RESULTS) -> List[Option]:
+        """
+        Find the best matching options for the query typed by the user.
+        :param query: Query string as sent by Slack in the "value" field of the options load request.
+        :param limit: Maximum number of options to be returned, must be in range [1, 100].
+        :return: Ranked list of matching options.
+        """
+        if not 1 <= limit <= _MAX_RESULTS:
+            raise ValueError(f"Limit must be in range [1, {_MAX_RESULTS}].")
+
+        _query = _normalize(query)
+        _found = {}  # Insertion ordered, value -> entry
+
+        # Exact and full text prefix matches (exact match sorts first)
+        self._scan_prefix(self._texts, _query, _found, limit)
+        if len(_found) >= limit or not _query:
+            return [_e.option for _e in _found.values()]
+
+        # Word prefix matches, every word of the query must prefix some word of the option
+        _words = _query.split()
+        _lead = max(_words, key=len)
+        self._scan_prefix(self._tokens, _lead, _found, limit,
+                          lambda _e: all(any(_t.startswith(_w) for _t in _e.tokens) for _w in _words))
+        if len(_found) >= limit or len(_query) < _NGRAM_SIZE:
+            return [_e.option for _e in _found.values()]
+
+        # Fuzzy matches, at least half of the query trigrams must be present
+        _grams = _ngrams(_query)
+        _hits = Counter()
+        for _gram in _grams:
+            _hits.update(self._postings.get(_gram, ()))
+        _threshold = ceil(len(_grams) / 2)
+        _fuzzy = sorted(((-_n, self._entries[_v].text, _v) for _v, _n in _hits.items()
+                         if _n >= _threshold and _v not in _found))
+        for _, _, _v in _fuzzy[:limit - len(_found)]:
+            _found[_v] = self._entries[_v]
+
+        return [_e.option for _e in _found.values()]
+
+    def search_groups(self, query: str, limit: int = _MAX_RESULTS) -> List[OptionGroups]:
+        """
+        Same as search, but the results are arranged into option groups. Groups are ordered by their best ranked
+        option.
+        :param query: Query string as sent by Slack in the "value" field of the options load request.
+        :param limit: Maximum number of options (across all groups) to be returned, must be in range [1, 100].
+        :return: List of option groups.
+        """
+        _groups: Dict[str, List[Option]] = {}
+        for _option in self.search(query, limit):
+            _group = self._entries[_option.value].group or self._default_group
+            _groups.setdefault(_group, []).append(_option)
+
+        return [OptionGroups(Text(type=PLAIN_TEXT, text=_label), _options) for _label, _options in _groups.items()]
+
+    def response(self, query: str, limit: int = _MAX_RESULTS, grouped: bool = False) -> dict:
+        """
+        Build the body of the response to an options load request.
+        :param query: Query string as sent by Slack in the "value" field of the options load request.
+        :param limit: Maximum number of options to be returned, must be in range [1, 100].
+        :param grouped: If True, respond with option groups rather than a flat list of options.
+        :return: Dictionary ready to be serialized to JSON.
+        """
+        if grouped:
+            return {"option_groups": [_og.build() for _og in self.search_groups(query, limit)]}
+        return {"options": [_o.build() for _o in self.search(query, limit)]}
+
+    @staticmethod
+    def _merge(_table: list, _items: list):
+        # Single insertions keep the table sorted in place, bulk loads are cheaper to sort once
+        if len(_items) <= 8:
+            for _item in _items:
+                bisect.insort(_table, _item)
+        else:
+            _table.extend(_items)
+            _table.sort()
+
+    def _scan_prefix(self, _table: list, _prefix: str, _found: dict, _limit: int, _accept=None):
+        _ix = bisect.bisect_left(_table, (_prefix,))
+        while _ix < len(_table) and len(_found) < _limit:
+            _key, _value = _table[_ix]
+            if not _key.startswith(_prefix):
+                break
+            if _value not in _found:
+                _entry = self._entries[_value]
+                if _accept is None or _accept(_entry):
+                    _found[_value] = _entry
+            _ix += 1
@@ -0,0 +1,353 @@
+"""
+Coalescing publishing of views, e.g. home tabs re-rendered by bursts of events.
+
+    transport = HTTPTransport("https://slack.com/api", token)
+    scheduler = PublishScheduler(transport.call, workers=4, rate=2)
+    async with scheduler:
+        scheduler.publish(user_id, home_tab)            # views.publish
+        scheduler.publish(view_id, modal, VIEWS_UPDATE)  # views.update
+        await scheduler.join()
+
+Only the newest surface of every target is sent, surfaces equal to the one sent last to the target are not sent at
+all, and the sends are spread by a token bucket shared by all workers. Sends failing with a transient error (network
+errors, HTTP 5xx, rate limiting) are retried with exponential backoff, or after the delay requested by Slack.
+"""
+import asyncio
+import hashlib
+import json
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+VIEWS_PUBLISH = "views.publish"
+VIEWS_UPDATE = "views.update"
+
+# Method -> key of the target in the request
+_TARGET_KEYS = {VIEWS_PUBLISH: "user_id", VIEWS_UPDATE: "view_id"}
+
+
+class PublishError(Exception):
+    """
+    Failed call of the Web API.
+    """
+
+    def __init__(self, error: str, transient: bool = False, retry_after: float = None):
+        """
+        :param error: Error code returned by Slack or description of the failure.
+        :param transient: If True, the call may succeed when retried.
+        :param retry_after: Seconds to wait before retrying, as requested by Slack when rate limiting.
+        """
+        super().__init__(error)
+        self.error = error
+        self.transient = transient
+        self.retry_after = retry_after
+
+
+class _TokenBucket:
+    """
+    Token bucket shared by the workers, every send takes one token.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated = None
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        # Waiting callers queue on the lock, so tokens are handed out in order of the requests
+        async with self._lock:
+            _loop = asyncio.get_running_loop()
+            while True:
+                _now = _loop.time()
+                if self._updated is not None:
+                    self._tokens = min(self._burst, self._tokens + (_now - self._updated) * self._rate)
+                self._updated = _now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+
+    def pause(self, seconds: float):
+        # Rate limited by Slack, no tokens until the delay passes
+        self._tokens = min(self._tokens, 0) - seconds * self._rate
+
+
+class PublishScheduler:
+    """
+    Scheduler of views.publish and views.update calls drained by a bounded pool of asyncio workers. Publishing
+    is synchronous and cheap: it only replaces the pending surface of the target, the surfaces are serialized by
+    the workers right before being sent.
+    """
+
+    def __init__(self,
+                 send: Callable[[str, bytes], Awaitable[dict]],
+                 workers: int = 4,
+                 rate: float = 1.0,
+                 burst: int = None,
+                 max_retries: int = 3,
+                 backoff: float = 0.5,
+                 max_backoff: float = 30.0,
+                 on_error: Callable[[str, str, PublishError], None] = None):
+        """
+        :param send: Coroutine function calling the Web API method with the JSON request body, returning the
+        response or raising PublishError, e.g. http_sender(...).
+        :param workers: Number of concurrent sends.
+        :param rate: Average number of sends per second.
+        :param burst: Number of sends allowed at once after an idle period, the number of workers if None.
+        :param max_retries: Number of retries of a send failing with a transient error.
+        :param backoff: Delay before the first retry in seconds, doubled with every retry.
+        :param max_backoff: Maximum delay between retries in seconds.
+        :param on_error: Callable receiving method, target and the error of sends that failed for good.
+        """
+        if workers < 1:
+            raise ValueError("Number of workers must be positive.")
+        if rate <= 0:
+            raise ValueError("Rate must be positive.")
+        if max_retries < 0:
+            raise ValueError("Number of retries can not be negative.")
+
+        self._send = send
+        self._workers = workers
+        self._rate = rate
+        self._burst = burst if burst is not None else workers
+        self._max_retries = max_retries
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self._on_error = on_error
+
+        self._pending: Dict[Tuple[str, str], object] = {}  # (method, target) -> newest surface not sent yet
+        self._in_flight = set()                             # (method, target) being sent by a worker
+        self._sent_hashes: Dict[Tuple[str, str], bytes] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._bucket: Optional[_TokenBucket] = None
+        self._tasks = []
+        self.stats = {"published": 0, "coalesced": 0, "sent": 0, "skipped": 0, "retried": 0, "failed": 0}
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def start(self):
+        """
+        Start the workers, must be called from a running event loop.
+        """
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue()
+        self._bucket = _TokenBucket(self._rate, self._burst)
+        self._tasks = [asyncio.ensure_future(self._work()) for _ in range(self._workers)]
+        for _key in self._pending:
+            self._queue.put_nowait(_key)
+
+    async def close(self):
+        """
+        Stop the workers, pending surfaces are kept and sent if the scheduler is started again. Sends cancelled in
+        flight are pending again unless a newer surface was published for the target meanwhile.
+        """
+        for _task in self._tasks:
+            _task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def join(self):
+        """
+        Wait until all published surfaces are sent (or failed).
+        """
+        if self._queue is None:
+            raise ValueError("Scheduler is not started.")
+        await self._queue.join()
+
+    def publish(self, target: str, surface, method: str = VIEWS_PUBLISH):
+        """
+        Schedule sending of the surface, replacing the surface scheduled for the same target and not sent yet.
+        :param target: User id for views.publish, view id for views.update.
+        :param surface: Surface, frozen surface or JSON bytes of the view. Surfaces are serialized when sent, so
+        changes made until then are sent too.
+        :param method: VIEWS_PUBLISH or VIEWS_UPDATE.
+        """
+        if method not in _TARGET_KEYS:
+            raise ValueError(f"Unknown method {method}, can only be: {tuple(_TARGET_KEYS)}.")
+        _key = (method, target)
+        self.stats["published"] += 1
+        if _key in self._pending:
+            self.stats["coalesced"] += 1
+        elif _key not in self._in_flight and self._queue is not None:
+            self._queue.put_nowait(_key)
+        self._pending[_key] = surface
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def forget(self, target: str, method: str = VIEWS_PUBLISH):
+        """
+        Forget the content sent last to the target, e.g. when the user changed the view in between, so the next
+        surface is sent even if it is equal.
+        """
+        self._sent_hashes.pop((method, target), None)
+
+    async def _work(self):
+        while True:
+            _key = await self._queue.get()
+            try:
+                if _key in self._pending and _key not in self._in_flight:
+                    self._in_flight.add(_key)
+                    try:
+                        await self._deliver(_key)
+                    finally:
+                        self._in_flight.discard(_key)
+                        # Published again while being sent
+                        if _key in self._pending:
+                            self._queue.put_nowait(_key)
+            finally:
+                self._queue.task_done()
+
+    async def _deliver(self, _key: Tuple[str, str]):
+        _method, _target = _key
+        _surface = self._pending.pop(_key)
+        _view = _surface if isinstance(_surface, (bytes, bytearray)) else _surface.to_json()
+        _hash = hashlib.blake2b(_view, digest_size=16).digest()
+        if self._sent_hashes.get(_key) == _hash:
+            self.stats["skipped"] += 1
+            return
+
+        _body = b'{"%s":%s,"view":%s}' % (_TARGET_KEYS[_method].encode(), json.dumps(_target).encode(), _view)
+        try:
+            await self._send_retrying(_key, _body, _hash)
+        except asyncio.CancelledError:
+            # Stopped by close(), the surface is sent after a restart unless a newer one replaced it
+            self._pending.setdefault(_key, _surface)
+            raise
+
+    async def _send_retrying(self, _key: Tuple[str, str], _body: bytes, _hash: bytes):
+        _method, _target = _key
+        _attempt = 0
+        while True:
+            await self._bucket.acquire()
+            try:
+                await self._send(_method, _body)
+            except (PublishError, OSError, asyncio.TimeoutError) as _e:
+                _error = _e if isinstance(_e, PublishError) else PublishError(repr(_e), transient=True)
+                if not _error.transient or _attempt >= self._max_retries:
+                    self.stats["failed"] += 1
+                    if self._on_error is not None:
+                        self._on_error(_method, _target, _error)
+                    return
+
+                if _error.retry_after is not None:
+                    self._bucket.pause(_error.retry_after)
+                    _delay = _error.retry_after
+                else:
+                    _delay = min(self._max_backoff, self._backoff * 2 ** _attempt)
+                await asyncio.sleep(_delay)
+                if _key in self._pending:
+                    # Newer surface was published meanwhile, it is sent instead of retrying this one
+                    return
+                _attempt += 1
+                self.stats["retried"] += 1
+            else:
+                self._sent_hashes[_key] = _hash
+                self.stats["sent"] += 1
+                return
+
+
+# HTTP #
+async def _request(_host: str, _port: int, _ssl: bool, _path: str, _headers: dict, _body: bytes,
+                   _timeout: float) -> Tuple[int, dict, bytes]:
+    _reader, _writer = await asyncio.wait_for(asyncio.open_connection(_host, _port, ssl=_ssl or None), _timeout)
+    try:
+        _head = f"POST {_path} HTTP/1.1\r\nHost: {_host}\r\nContent-Length: {len(_body)}\r\nConnection: close\r\n"
+        _head += "".join(f"{_k}: {_v}\r\n" for _k, _v in _headers.items())
+        _writer.write(_head.encode() + b"\r\n" + _body)
+        await _writer.drain()
+        return await asyncio.wait_for(_read_response(_reader), _timeout)
+    finally:
+        _writer.close()
+        try:
+            await _writer.wait_closed()
+        except OSError:
+            pass
+
+
+async def _read_response(_reader: asyncio.StreamReader, _keep_alive: bool = False) -> Tuple[int, dict, bytes]:
+    """
+    Read a response, the body is delimited by Content-Length, by chunked transfer coding or by the end of the
+    connection.
+    :param _keep_alive: True if the connection is meant to be reused, responses delimited by the end of the
+    connection are then accepted only with Connection: close.
+    :raises PublishError: If the body of a response on a kept-alive connection has no length.
+    """
+    _line = await _reader.readline()
+    if not _line:
+        raise ConnectionResetError("Connection closed by the server.")
+    _status = int(_line.split()[1])
+    _headers = await _read_headers(_reader)
+    if _status in (204, 304) or 100 <= _status < 200:
+        _body = b""
+    elif "chunked" in _headers.get("transfer-encoding", "").lower():
+        _chunks = []
+        while True:
+            _size = int((await _reader.readline()).split(b";", 1)[0].strip() or b"0", 16)
+            if _size == 0:
+                await _read_headers(_reader)  # Trailers
+                break
+            _chunks.append(await _reader.readexactly(_size))
+            await _reader.readexactly(2)  # CRLF ending the chunk
+        _body = b"".join(_chunks)
+    elif "content-length" in _headers:
+        _body = await _reader.readexactly(int(_headers["content-length"]))
+    elif _keep_alive and _headers.get("connection", "").lower() != "close":
+        raise PublishError(f"Response without length on a kept-alive connection, HTTP {_status}.")
+    else:
+        _body = await _reader.read()
+    return _status, _headers, _body
+
+
+async def _read_headers(_reader: asyncio.StreamReader) -> dict:
+    _headers = {}
+    while True:
+        _line = await _reader.readline()
+        if _line in (b"\r\n", b"\n", b""):
+            return _headers
+        _name, _, _value = _line.decode("latin-1").partition(":")
+        _headers[_name.strip().lower()] = _value.strip()
+
+
+def _check_response(_status: int, _headers: dict, _body: bytes) -> dict:
+    if _status == 429:
+        raise PublishError("ratelimited", transient=True, retry_after=float(_headers.get("retry-after", 1)))
+    if _status >= 500:
+        raise PublishError(f"HTTP {_status}", transient=True)
+    try:
+        _response = json.loads(_body)
+    except ValueError:
+        raise PublishError(f"Invalid response, HTTP {_status}.")
+    if not _response.get("ok"):
+        raise PublishError(_response.get("error", f"HTTP {_status}"))
+    return _response
+
+
+def http_sender(base_url: str, token: str, timeout: float = 10.0) -> Callable[[str, bytes], Awaitable[dict]]:
+    """
+    Create sender calling the Web API over HTTP, one connection per call. HTTPTransport keeps the connections
+    alive and is preferred for anything but occasional calls.
+    :param base_url: URL of the API, e.g. "https://slack.com/api".
+    :param token: Bot token.
+    :param timeout: Timeout of connecting and of reading the response in seconds.
+    :return: Coroutine function for PublishScheduler.
+    """
+    _url = urlsplit(base_url)
+    _ssl = _url.scheme == "https"
+    _port = _url.port or (443 if _ssl else 80)
+    _headers = {"Content-Type": "application/json; charset=utf-8", "Authorization": f"Bearer {token}"}
+
+    async def _send(method: str, body: bytes) -> dict:
+        _response = await _request(_url.hostname, _port, _ssl, f"{_url.path.rstrip('/')}/{method}", _headers,
+                                   body, timeout)
+        return _check_response(*_response)
+
+    return _send
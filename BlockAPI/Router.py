@@ -0,0 +1,176 @@
+"""
+Routing of Slack interaction payloads (block_actions, view_submission) to handlers by action_id and block_id.
+
+    router = InteractionRouter()
+
+    @router.route(approve_button)        # the element used to build the surface
+    def approve(action, payload): ...
+
+    router.route("task-*", open_task)    # every action_id starting with "task-"
+    router.route(due_block, set_due)     # blocks are routed by their block_id
+
+    results = router.dispatch(payload)
+
+Handlers are compiled into a dictionary of the exact ids and a single prefix trie, so dispatching an action costs
+one dictionary lookup (plus a walk of the trie along the id if any prefix routes are registered), no matter how many
+handlers there are.
+"""
+from typing import Callable, List, Optional, Union
+
+from BlockAPI.BlockInterface import BlockInterface
+
+ACTION = "action_id"
+BLOCK = "block_id"
+
+_WILDCARD = "*"
+_HANDLER = None  # Key of the handler in a trie node, never clashes with the characters of the ids
+
+
+def _parse(_target: Union[str, BlockInterface], _key: Optional[str]) -> tuple:
+    """
+    :return: Key, id and whether the id is a prefix.
+    """
+    if isinstance(_target, BlockInterface):
+        # Ids are taken at registration, later changes of the element are not followed
+        _key = ACTION if hasattr(type(_target), ACTION) else BLOCK
+        _id = getattr(_target, _key, None)
+        if _id is None:
+            raise ValueError(f"{type(_target).__name__} has no {_key} to be routed by.")
+        return _key, _id, False
+
+    _key = _key if _key is not None else ACTION
+    if _key not in (ACTION, BLOCK):
+        raise ValueError(f"Unknown key {_key}, can only be: {ACTION}, {BLOCK}.")
+    if _target.endswith(_WILDCARD):
+        return _key, _target[:-1], True
+    return _key, _target, False
+
+
+class InteractionRouter:
+    """
+    Registry of handlers of interactions keyed by action_id or block_id. An action is routed to the handler of:
+        - its exact action_id,
+        - the longest prefix of its action_id,
+        - its exact block_id,
+        - the longest prefix of its block_id,
+        - the default handler,
+    whichever is registered first in this order. Actions matching no handler are skipped.
+    """
+
+    def __init__(self, default: Callable[[dict, dict], object] = None):
+        """
+        :param default: Handler of the actions matching no route.
+        """
+        self._default = default
+        self._routes = {}    # (key, id, prefix) -> handler, in order of registration
+        self._exact = None   # Compiled routes, None when they need to be compiled again
+        self._trie = None
+
+    def route(self,
+              target: Union[str, BlockInterface],
+              handler: Callable[[dict, dict], object] = None,
+              key: str = None):
+        """
+        Register handler of the target. Can be used as a decorator if the handler is not given.
+        :param target: Element (routed by its action_id), block (routed by its block_id) or id. Id ending with
+        "*" matches every id starting with the rest of it, e.g. "task-*".
+        :param handler: Callable receiving the action (entry of the actions of block_actions payload or value of
+        an input of view_submission payload, with action_id and block_id keys) and the whole payload.
+        :param key: ACTION or BLOCK, the kind of id of string targets. Ids are action ids by default.
+        :return: The handler.
+        :raises ValueError: If the target has no id or the key is unknown.
+        """
+        if handler is None:
+            return lambda _handler: self.route(target, _handler, key)
+
+        self._routes[_parse(target, key)] = handler
+        self._exact = None
+        return handler
+
+    def remove(self, target: Union[str, BlockInterface], key: str = None):
+        """
+        Remove route of the target, the arguments are the same as of route().
+        :raises KeyError: If the target has no route.
+        """
+        del self._routes[_parse(target, key)]
+        self._exact = None
+
+    def __len__(self):
+        return len(self._routes)
+
+    def _compile(self):
+        _exact = {}
+        _trie = {}
+        for (_key, _id, _prefix), _handler in self._routes.items():
+            if not _prefix:
+                _exact[(_key, _id)] = _handler
+                continue
+            # The first level of the trie is the kind of the id
+            _node = _trie.setdefault(_key, {})
+            for _c in _id:
+                _node = _node.setdefault(_c, {})
+            _node[_HANDLER] = _handler
+        self._exact, self._trie = _exact, _trie
+
+    def _longest_prefix(self, _key: str, _id: str):
+        _node = self._trie.get(_key)
+        if _node is None:
+            return None
+        _found = _node.get(_HANDLER)
+        for _c in _id:
+            _node = _node.get(_c)
+            if _node is None:
+                break
+            _handler = _node.get(_HANDLER)
+            if _handler is not None:
+                _found = _handler
+        return _found
+
+    def resolve(self, action_id: Optional[str], block_id: str = None) -> Optional[Callable[[dict, dict], object]]:
+        """
+        :return: Handler of the ids (the default handler if none matches) or None.
+        """
+        if self._exact is None:
+            self._compile()
+
+        _handler = self._exact.get((ACTION, action_id))
+        if _handler is not None:
+            return _handler
+        if self._trie and action_id is not None:
+            _handler = self._longest_prefix(ACTION, action_id)
+            if _handler is not None:
+                return _handler
+        _handler = self._exact.get((BLOCK, block_id))
+        if _handler is not None:
+            return _handler
+        if self._trie and block_id is not None:
+            _handler = self._longest_prefix(BLOCK, block_id)
+            if _handler is not None:
+                return _handler
+        return self._default
+
+    def dispatch(self, payload: dict) -> List[object]:
+        """
+        Call handlers of all actions of the payload. Actions of block_actions payloads are the entries of its
+        actions, actions of view_submission payloads are the values of the inputs in the state of the view, each
+        with its action_id and block_id added.
+        :param payload: Interaction payload sent by Slack (already parsed).
+        :return: Results of the called handlers in order of the actions.
+        :raises ValueError: If the payload type is not supported.
+        """
+        _type = payload.get("type")
+        if _type == "block_actions":
+            _actions = payload.get("actions", ())
+        elif _type == "view_submission":
+            _actions = [dict(_value, block_id=_block_id, action_id=_action_id)
+                        for _block_id, _inputs in payload["view"]["state"]["values"].items()
+                        for _action_id, _value in _inputs.items()]
+        else:
+            raise ValueError(f"Unsupported payload type {_type}, can only be: block_actions, view_submission.")
+
+        _results = []
+        for _action in _actions:
+            _handler = self.resolve(_action.get(ACTION), _action.get(BLOCK))
+            if _handler is not None:
+                _results.append(_handler(_action, payload))
+        return _results
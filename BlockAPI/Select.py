@@ -0,0 +1,325 @@
+"""
+Selector queries over object trees.
+
+    surface.select("SectionBlock > Button[style=primary]")
+    surface.select("InputBlock#title StaticOptions")
+    surface.select("#approve, ActionBlock Button[value=42]")
+
+Syntax, a subset of CSS selectors:
+    - TypeName: class name of the object (e.g. SectionBlock, Button, Text), * matches any object,
+    - #id: block_id or action_id of the object,
+    - [key] and [key=value]: key present in the payload of the object, with the value (quotes are optional; booleans
+      are true or false),
+    - A B: B anywhere below A, A > B: B directly below A (e.g. SectionBlock > Button is the accessory),
+    - A, B: objects matching either selector.
+
+The index is kept on the object queried: types, block ids and action ids of all objects below it, grouped by its
+direct children (the blocks of a surface). The index observes the object (see BlockInterface.observe), the changes
+mark the groups of the changed children, so only those are indexed again by the next query. Like for the other
+observers, in-place changes of lists (e.g. surface.blocks[0].elements.append(...)) are not reported, assign the list
+again or use the add methods of the surfaces. The index and its observer are kept until drop_index() of the object:
+while any object is observed, changes of all tracked trees are propagated to their roots.
+"""
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from weakref import ref
+
+from BlockAPI.BlockInterface import BlockInterface, Change
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<comma>,) |
+        (?P<child>>) |
+        (?P<type>\*|[A-Za-z_]\w*) |
+        \#(?P<id>[^\s#\[\]>,]+) |
+        \[\s*(?P<key>\w+)\s*(?:=\s*(?:"(?P<dq>[^"]*)"|'(?P<sq>[^']*)'|(?P<value>[^\]\s]+))\s*)?]
+    )""", re.VERBOSE)
+
+_DESCENDANT = " "
+_CHILD = ">"
+
+
+class _Compound:
+    """
+    Conditions on a single object, e.g. Button#approve[style=primary].
+    """
+    __slots__ = ("type", "id", "attrs")
+
+    def __init__(self):
+        self.type: Optional[type] = None
+        self.id: Optional[str] = None
+        self.attrs: List[Tuple[str, Optional[str]]] = []
+
+    @property
+    def exact(self) -> bool:
+        """
+        True if the candidates looked up by the index all match, i.e. the compound is a single type or id.
+        """
+        return not self.attrs and (self.id is None or self.type is None)
+
+    def matches(self, _node: BlockInterface) -> bool:
+        if self.type is not None and type(_node) is not self.type:
+            return False
+        _body = _node._body
+        if self.id is not None and _body.get("block_id") != self.id and _body.get("action_id") != self.id:
+            return False
+        for _key, _expected in self.attrs:
+            _value = _body.get(_key)
+            if _value is None:
+                return False
+            if _expected is not None and _expected != _format(_value):
+                return False
+        return True
+
+
+def _format(_value) -> str:
+    if _value is True:
+        return "true"
+    if _value is False:
+        return "false"
+    return str(_value)
+
+
+def _class(_name: str) -> type:
+    for _qualified, _cls in BlockInterface._registry.items():
+        if _qualified.rsplit(".", 1)[-1] == _name:
+            return _cls
+    raise ValueError(f"Unknown type {_name} in the selector.")
+
+
+@lru_cache(maxsize=256)
+def _compile(selector: str) -> tuple:
+    """
+    :return: Tuple of the selectors of the comma separated list, each a tuple of compounds interleaved with the
+    combinators, e.g. (compound, " ", compound, ">", compound).
+    """
+    _selectors = []
+    _parts = []
+    _compound = None
+    _combinator = None
+    _end = len(selector.rstrip())
+    _pos = 0
+    while _pos < _end:
+        _m = _TOKEN.match(selector, _pos)
+        if _m is None:
+            raise ValueError(f"Invalid selector {selector!r} at position {_pos}.")
+        _spaced = selector[_pos].isspace()
+        _kind = next(_k for _k in ("comma", "child", "type", "id", "key") if _m[_k] is not None)
+        _pos = _m.end()
+
+        if _kind == "comma" or _kind == "child":
+            if _compound is None or _combinator is not None:
+                raise ValueError(f"Invalid selector {selector!r} at position {_m.start(_kind)}.")
+            if _kind == "comma":
+                _selectors.append(tuple(_parts))
+                _parts = []
+            else:
+                _combinator = _CHILD
+            _compound = None
+            continue
+
+        if _compound is None or _spaced:
+            if _compound is not None and _combinator is None:
+                _combinator = _DESCENDANT
+            if _combinator is not None:
+                _parts.append(_combinator)
+                _combinator = None
+            _compound = _Compound()
+            _parts.append(_compound)
+        elif _kind == "type":
+            raise ValueError(f"Type must start the compound selector, {selector!r} at position {_m.start(_kind)}.")
+
+        if _kind == "type":
+            _compound.type = _class(_m["type"]) if _m["type"] != "*" else None
+        elif _kind == "id":
+            _compound.id = _m["id"]
+        else:
+            _value = _m["dq"] if _m["dq"] is not None else _m["sq"] if _m["sq"] is not None else _m["value"]
+            _compound.attrs.append((_m["key"], _value))
+
+    if _compound is None:
+        raise ValueError(f"Invalid selector {selector!r}, selector can not be empty or end with a combinator.")
+    _selectors.append(tuple(_parts))
+    return tuple(_selectors)
+
+
+# INDEX #
+# Entries are (node, parent entry) tuples, one per place of an object in the tree, so objects shared by several
+# places have several entries.
+class _Group:
+    """
+    Entries of the subtree of a direct child of the indexed object.
+    """
+    __slots__ = ("node", "entries", "types", "ids")
+
+    def __init__(self, _node: BlockInterface, _parent: tuple):
+        self.node = _node
+        self.entries = []
+        self.types: Dict[type, list] = {}
+        self.ids: Dict[str, list] = {}
+
+        _stack = [(_node, _parent)]
+        _pop = _stack.pop
+        _push = _stack.append
+        while _stack:
+            _entry = _pop()
+            _n = _entry[0]
+            self.entries.append(_entry)
+            self.types.setdefault(type(_n), []).append(_entry)
+            _body = _n._body
+            _block_id = _body.get("block_id")
+            if _block_id is not None:
+                self.ids.setdefault(_block_id, []).append(_entry)
+            _action_id = _body.get("action_id")
+            if _action_id is not None and _action_id != _block_id:
+                self.ids.setdefault(_action_id, []).append(_entry)
+            for _key in _n._walk_keys:
+                _value = _body.get(_key)
+                if _value is None:
+                    continue
+                if type(_value) is list or type(_value) is tuple:
+                    for _i in range(len(_value) - 1, -1, -1):
+                        _push((_value[_i], _entry))
+                else:
+                    _push((_value, _entry))
+
+
+class _Index:
+    """
+    Index of the objects below the root, kept by the root between queries. The index references the root weakly,
+    so the root is not kept alive by a reference cycle; its entry holds None in place of the object.
+    """
+    __slots__ = ("root", "entry", "groups", "lengths", "types", "ids", "dirty", "stale")
+
+    def __init__(self, _root: BlockInterface):
+        self.root = ref(_root)
+        self.entry = (None, None)
+        self.groups: List[_Group] = []
+        self.lengths = None
+        self.types: Dict[type, List[_Group]] = {}  # Groups containing objects of the type, in document order
+        self.ids: Dict[str, List[_Group]] = {}     # Groups containing objects with the id, in document order
+        self.dirty = set()  # ids of the children changed since the last query
+        self.stale = True   # Children of the root changed since the last query
+
+    def changed(self, _change: Change):
+        """
+        Observer of the root, marks the child containing the changed object.
+        """
+        _path = _change.path
+        if not _path:
+            if _change.key in _change.node._child_keys:
+                self.stale = True
+            return
+        _child = self.root()._body.get(_path[0])
+        if len(_path) > 1 and type(_path[1]) is int:
+            _child = _child[_path[1]]
+        self.dirty.add(id(_child))
+
+    def refresh(self, _root: BlockInterface):
+        # In-place changes of the child lists of the root are not reported, their lengths are checked
+        _body = _root._body
+        _lengths = tuple(len(_v) if type(_v) is list else -1 for _v in map(_body.get, _root._child_keys))
+        if not self.stale and not self.dirty and self.lengths == _lengths:
+            return
+
+        # Groups of the children not changed since the last query are kept
+        _old = {id(_g.node): _g for _g in self.groups if id(_g.node) not in self.dirty}
+        self.groups = [_old.pop(id(_c), None) or _Group(_c, self.entry) for _c in _root._children()]
+        self.types = {}
+        self.ids = {}
+        for _group in self.groups:
+            for _type in _group.types:
+                self.types.setdefault(_type, []).append(_group)
+            for _id in _group.ids:
+                self.ids.setdefault(_id, []).append(_group)
+        self.lengths = _lengths
+        self.dirty.clear()
+        self.stale = False
+
+    def candidates(self, _compound: _Compound, _root: BlockInterface) -> list:
+        """
+        :return: Entries possibly matching the compound in document order, looked up by id or type if possible.
+        """
+        _result = [self.entry] if _compound.matches(_root) else []
+        if _compound.id is not None:
+            for _group in self.ids.get(_compound.id, ()):
+                _result.extend(_group.ids[_compound.id])
+        elif _compound.type is not None:
+            for _group in self.types.get(_compound.type, ()):
+                _result.extend(_group.types[_compound.type])
+        else:
+            for _group in self.groups:
+                _result.extend(_group.entries)
+        return _result
+
+    def order(self) -> Dict[int, int]:
+        """
+        :return: id of entry -> position of the entry in document order.
+        """
+        _order = {id(self.entry): 0}
+        for _group in self.groups:
+            for _entry in _group.entries:
+                _order[id(_entry)] = len(_order)
+        return _order
+
+
+def _match_up(_entry: tuple, _parts: tuple, _i: int, _root: BlockInterface, _memo: dict) -> bool:
+    """
+    :return: True if the ancestors of the entry match the parts of the selector before the index _i (the part at
+    _i is the combinator right before the already matched compound). Results are memoized by (parent entry, _i),
+    siblings share their ancestors.
+    """
+    if _i < 0:
+        return True
+    _key = (id(_entry[1]), _i)
+    _result = _memo.get(_key)
+    if _result is None:
+        _result = _memo[_key] = _match_parents(_entry, _parts, _i, _root, _memo)
+    return _result
+
+
+def _match_parents(_entry: tuple, _parts: tuple, _i: int, _root: BlockInterface, _memo: dict) -> bool:
+    _combinator, _compound = _parts[_i], _parts[_i - 1]
+    _parent = _entry[1]
+    while _parent is not None:
+        _node = _parent[0] if _parent[0] is not None else _root
+        if _compound.matches(_node) and _match_up(_parent, _parts, _i - 2, _root, _memo):
+            return True
+        if _combinator == _CHILD:
+            return False
+        _parent = _parent[1]
+    return False
+
+
+def select(root: BlockInterface, selector: str) -> List[BlockInterface]:
+    """
+    :param root: Object whose subtree (the object included) is queried, e.g. a surface.
+    :param selector: Selector, see the module documentation.
+    :return: Matching objects in document order, objects placed at several places of the tree are returned once
+    per place.
+    :raises ValueError: If the selector is not valid.
+    """
+    _selectors = _compile(selector)
+    _index = root._index
+    if _index is None:
+        _index = _Index(root)
+        object.__setattr__(root, "_index", _index)
+        root.observe(_index.changed)
+    _index.refresh(root)
+
+    _matched = []
+    for _parts in _selectors:
+        _last = _parts[-1]
+        _candidates = _index.candidates(_last, root)
+        if not _last.exact:
+            _candidates = [_e for _e in _candidates if _last.matches(_e[0] if _e[0] is not None else root)]
+        if len(_parts) > 1:
+            _memo = {}
+            _candidates = [_e for _e in _candidates if _match_up(_e, _parts, len(_parts) - 2, root, _memo)]
+        _matched.extend(_candidates)
+    if len(_selectors) > 1:
+        # Union of the selectors in document order
+        _order = _index.order()
+        _matched = sorted({id(_e): _e for _e in _matched}.values(), key=lambda _e: _order[id(_e)])
+    return [_e[0] if _e[0] is not None else root for _e in _matched]
@@ -0,0 +1,192 @@
+"""
+Compact binary snapshots of BlockAPI trees, e.g. for caching rendered views on disk between deploys.
+
+    data = Snapshot.dump(surface)
+    surface = Snapshot.load(data)                # live objects
+    payload = Snapshot.load(data, as_json=True)  # JSON bytes ready to be sent
+
+A snapshot holds a table of the classes (by their registry names), a table of the object layouts (body keys and
+attribute names, the same as used by copies) and the objects as flat tuples of values in marshal format, so loading
+does not parse any JSON nor run any constructor or validation. By default the snapshot also holds the JSON encoding
+of the tree, so loading it as JSON is just a slice.
+
+Snapshots are meant to be loaded by the same or a newer version of BlockAPI. Like pickle, never load snapshots from
+untrusted sources.
+"""
+import importlib
+import marshal
+import pickle
+import struct
+from datetime import date
+
+from BlockAPI.BlockInterface import BlockInterface, _compile
+
+_MAGIC = b"BKS"
+_VERSION = 1
+_HEADER = struct.Struct(">3sBI")  # Magic, version, length of the JSON section
+
+# Values holding objects (or values marshal does not support) are replaced by tuples starting with Ellipsis, which
+# never appears in a tree otherwise:
+#   (..., index) object from the object table,
+#   (..., "n", [index, ...]), (..., "N", (index, ...)) list or tuple of objects,
+#   (..., "l", list), (..., "t", tuple), (..., "d", dict) containers holding such values,
+#   (..., "D", ordinal) datetime.date, e.g. initial date of date pickers,
+#   (..., "p", bytes) pickled value of any other type, e.g. time zone of time pickers.
+_MARSHALLED = frozenset((str, int, float, bool, type(None), bytes))
+
+
+def dump(obj: BlockInterface, include_json: bool = True) -> bytes:
+    """
+    Encode the tree as a snapshot.
+    :param obj: Root of the tree, e.g. a surface.
+    :param include_json: If True, store the JSON encoding of the tree too, so it can be loaded without
+    reconstructing the objects.
+    :return: Snapshot bytes.
+    """
+    _encoder = _Encoder()
+    _root = _encoder.node(obj)
+    _json = obj.to_json() if include_json else b""
+    _tree = marshal.dumps((tuple(_encoder.classes), tuple(_encoder.layouts), _encoder.nodes, _root), 4)
+    return _HEADER.pack(_MAGIC, _VERSION, len(_json)) + _json + _tree
+
+
+def load(data: bytes, as_json: bool = False):
+    """
+    Load a snapshot created by dump().
+    :param data: Snapshot bytes.
+    :param as_json: If True, return the JSON encoding of the tree instead of the objects.
+    :return: Root of the tree or its JSON bytes.
+    :raises ValueError: If the data is not a snapshot or it was created by an unsupported version.
+    """
+    _data = memoryview(data)
+    if len(_data) < _HEADER.size:
+        raise ValueError("Data is not a BlockAPI snapshot.")
+    _magic, _version, _json_length = _HEADER.unpack_from(_data)
+    if _magic != _MAGIC:
+        raise ValueError("Data is not a BlockAPI snapshot.")
+    if _version != _VERSION:
+        raise ValueError(f"Unsupported snapshot version {_version}, expected {_VERSION}.")
+
+    _start = _HEADER.size + _json_length
+    if as_json and _json_length:
+        return bytes(_data[_HEADER.size:_start])
+
+    _classes, _layouts, _nodes, _root = marshal.loads(_data[_start:])
+    _classes = [_class(_name) for _name in _classes]
+    _builders = [_compile(_classes[_ix], _layout) for _ix, _layout in _layouts]
+    _objects = []
+    _append = _objects.append
+    for _layout, _values, _marked in _nodes:
+        if _marked is not None:
+            _values = list(_values)
+            for _i in _marked:
+                _v = _values[_i]
+                _values[_i] = _objects[_v[1]] if len(_v) == 2 else _decode(_v, _objects)
+        _append(_builders[_layout](_values))
+
+    _obj = _objects[_root]
+    return _obj.to_json() if as_json else _obj
+
+
+def _class(_name: str):
+    _cls = BlockInterface._registry.get(_name)
+    if _cls is None:
+        # Modules are imported lazily, the class may not be registered yet
+        _module, _, _ = _name.rpartition(".")
+        try:
+            importlib.import_module(_module)
+        except ImportError:
+            pass
+        _cls = BlockInterface._registry.get(_name)
+        if _cls is None:
+            raise ValueError(f"Unknown class {_name} in the snapshot.")
+    return _cls
+
+
+class _Encoder:
+
+    def __init__(self):
+        self.classes = []
+        self.layouts = []
+        self.nodes = []
+        self._class_ix = {}
+        self._layout_ix = {}
+        self._node_ix = {}  # id -> index of the objects already encoded, keeps shared objects shared
+
+    def node(self, _obj: BlockInterface) -> int:
+        _ix = self._node_ix.get(id(_obj))
+        if _ix is not None:
+            return _ix
+
+        _layout, _body_values, _values = _obj._reduce_state()
+        _values = list(_body_values + _values)
+        _marked = []
+        for _i, _v in enumerate(_values):
+            if type(_v) not in _MARSHALLED:
+                _values[_i], _m = self.value(_v)
+                if _m:
+                    _marked.append(_i)
+
+        _layout_ix = self._layout_ix.get(id(_layout))
+        if _layout_ix is None:
+            _cls = type(_obj)
+            _class_ix = self._class_ix.get(_cls)
+            if _class_ix is None:
+                _class_ix = self._class_ix[_cls] = len(self.classes)
+                self.classes.append(f"{_cls.__module__}.{_cls.__qualname__}")
+            _layout_ix = self._layout_ix[id(_layout)] = len(self.layouts)
+            self.layouts.append((_class_ix, _layout))
+
+        _ix = self._node_ix[id(_obj)] = len(self.nodes)
+        self.nodes.append((_layout_ix, tuple(_values), tuple(_marked) if _marked else None))
+        return _ix
+
+    def value(self, _v) -> tuple:
+        """
+        :return: Encoded value and whether it was replaced by a marked tuple.
+        """
+        _type = type(_v)
+        if _type in _MARSHALLED:
+            return _v, False
+        if isinstance(_v, BlockInterface):
+            return (..., self.node(_v)), True
+
+        if _type is list or _type is tuple:
+            if _v and all(isinstance(_i, BlockInterface) for _i in _v):
+                _items = [self.node(_i) for _i in _v]
+                return (..., "n", _items) if _type is list else (..., "N", tuple(_items)), True
+            _items = [self.value(_i) for _i in _v]
+            if not any(_m for _, _m in _items):
+                return _v, False
+            _items = [_i for _i, _ in _items]
+            return (..., "l", _items) if _type is list else (..., "t", tuple(_items)), True
+        if _type is dict:
+            _items = {_k: self.value(_i) for _k, _i in _v.items()}
+            if not any(_m for _, _m in _items.values()):
+                return _v, False
+            return (..., "d", {_k: _i for _k, (_i, _) in _items.items()}), True
+
+        if _type is date:
+            return (..., "D", _v.toordinal()), True
+        return (..., "p", pickle.dumps(_v, protocol=pickle.HIGHEST_PROTOCOL)), True
+
+
+def _decode(_v: tuple, _objects: list):
+    if len(_v) == 2:
+        return _objects[_v[1]]
+
+    _kind, _items = _v[1], _v[2]
+    if _kind == "n":
+        return list(map(_objects.__getitem__, _items))
+    if _kind == "N":
+        return tuple(map(_objects.__getitem__, _items))
+    if _kind == "l":
+        return [_decode(_i, _objects) if type(_i) is tuple and _i and _i[0] is ... else _i for _i in _items]
+    if _kind == "t":
+        return tuple(_decode(_i, _objects) if type(_i) is tuple and _i and _i[0] is ... else _i for _i in _items)
+    if _kind == "d":
+        return {_k: _decode(_i, _objects) if type(_i) is tuple and _i and _i[0] is ... else _i
+                for _k, _i in _items.items()}
+    if _kind == "D":
+        return date.fromordinal(_items)
+    return pickle.loads(_items)
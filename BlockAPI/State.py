@@ -0,0 +1,344 @@
+"""
+Typed extraction of the state of submitted views.
+
+    extractor = StateExtractor(modal)
+    values = extractor.extract(payload["view"]["state"]["values"])
+    values["due"]       # datetime.date
+    values["estimate"]  # int or float
+    values["team"]      # Option of the static select
+
+The extractor is compiled once from the surface; extracting the state is a single pass over the submitted values,
+the surface is not walked again.
+"""
+import datetime
+from typing import Callable, Dict, Optional
+
+from BlockAPI.Blocks import *
+
+_MISSING = object()
+_STATELESS = frozenset(("button", "overflow"))  # Elements without state in the submitted view
+
+
+def _value(_state: dict):
+    return _state.get("value")
+
+
+def _number(_state: dict):
+    _v = _state.get("value")
+    return get_number_from_string(_v) if _v is not None else None
+
+
+def _date(_state: dict):
+    _v = _state.get("selected_date")
+    return datetime.date.fromisoformat(_v) if _v is not None else None
+
+
+def _time(_state: dict):
+    _v = _state.get("selected_time")
+    return datetime.time.fromisoformat(_v) if _v is not None else None
+
+
+def _date_time(_state: dict):
+    _v = _state.get("selected_date_time")
+    return datetime.datetime.fromtimestamp(_v, datetime.timezone.utc) if _v is not None else None
+
+
+def _field(_key: str) -> Callable[[dict], object]:
+    return lambda _state: _state.get(_key)
+
+
+def _payload_option(_option: dict) -> Option:
+    # Options of external data sources are not known in advance
+    _text = _option["text"]
+    return Option(Text(type=_text.get("type", PLAIN_TEXT), text=_text["text"]), _option["value"])
+
+
+def _known_options(_element: BlockInterface) -> Dict[str, Option]:
+    _items = _element._body.get("options") or _element._body.get("option_groups") or ()
+    if isinstance(_items, OptionCatalog):
+        return {_o.value: _o for _o in _items.options}
+    _options = {}
+    for _item in _items:
+        for _o in _item.options if isinstance(_item, OptionGroups) else (_item,):
+            _options[_o.value] = _o
+    return _options
+
+
+def _option(_element: BlockInterface) -> Callable[[dict], Optional[Option]]:
+    _get = _known_options(_element).get
+
+    def _parse(_state: dict):
+        _selected = _state.get("selected_option")
+        if _selected is None:
+            return None
+        _o = _get(_selected["value"])
+        return _o if _o is not None else _payload_option(_selected)
+
+    return _parse
+
+
+def _options(_element: BlockInterface) -> Callable[[dict], list]:
+    _get = _known_options(_element).get
+
+    def _parse(_state: dict):
+        return [_get(_s["value"]) or _payload_option(_s) for _s in _state.get("selected_options") or ()]
+
+    return _parse
+
+
+def _external_option(_element: BlockInterface):
+    return lambda _state: _payload_option(_state["selected_option"]) if _state.get("selected_option") else None
+
+
+def _external_options(_element: BlockInterface):
+    return lambda _state: [_payload_option(_s) for _s in _state.get("selected_options") or ()]
+
+
+# Element type -> function creating the parser of its state for the element
+_PARSERS = {
+    "plain_text_input": lambda _e: _value,
+    "email_text_input": lambda _e: _value,
+    "url_text_input": lambda _e: _value,
+    "number_input": lambda _e: _number,
+    "datepicker": lambda _e: _date,
+    "timepicker": lambda _e: _time,
+    "datetimepicker": lambda _e: _date_time,
+    "static_select": _option,
+    "radio_buttons": _option,
+    "multi_static_select": _options,
+    "checkboxes": _options,
+    "external_select": _external_option,
+    "multi_external_select": _external_options,
+    "users_select": lambda _e: _field("selected_user"),
+    "multi_users_select": lambda _e: _field("selected_users"),
+    "conversations_select": lambda _e: _field("selected_conversation"),
+    "multi_conversations_select": lambda _e: _field("selected_conversations"),
+    "channels_select": lambda _e: _field("selected_channel"),
+    "multi_channels_select": lambda _e: _field("selected_channels"),
+}
+
+
+def _input_elements(_surface: BlockInterface):
+    """
+    :return: Generator of (block_id, element) of the elements with state in input blocks, action blocks and
+    section accessories of the surface. Pre-serialized blocks (RawBlock) hold plain dictionaries, their elements are
+    skipped.
+    """
+    for _block in _surface._body.get("blocks", ()):
+        if not isinstance(_block, BlockInterface) or isinstance(_block, RawBlock):
+            continue
+        _body = _block._body
+        if "element" in _body:
+            _elements = (_body["element"],)
+        elif "accessory" in _body:
+            _elements = (_body["accessory"],)
+        elif _body.get("type") == "actions":
+            _elements = _body["elements"]
+        else:
+            continue
+
+        for _element in _elements:
+            if not isinstance(_element, BlockInterface):
+                continue
+            if _element._body.get("action_id") is not None and _element._body.get("type") not in _STATELESS:
+                yield _body.get("block_id"), _element
+
+
+class StateExtractor:
+    """
+    Converter of state values of a submitted view (view.state.values) into typed Python values keyed by the
+    action_id of the elements:
+        - text, email and URL inputs: str,
+        - number inputs: int or float (the rules of get_number_from_string),
+        - date, time and date time pickers: datetime.date, datetime.time and aware datetime.datetime (UTC),
+        - static selects, radio buttons and checkboxes: the Option objects of the element (a list of them for
+          multi selects and checkboxes),
+        - external selects: Option objects created from the payload,
+        - user, conversation and channel selects: the selected ids.
+    Empty inputs are None (empty lists for multi selects and checkboxes are kept as submitted).
+    Values of elements of unknown types are returned as submitted, values of pre-serialized blocks (RawBlock) are
+    skipped.
+    """
+
+    def __init__(self, surface: BlockInterface):
+        """
+        Compile the extractor from the input blocks, action blocks and section accessories of the surface.
+        :param surface: Surface whose submissions are extracted, e.g. a ModalSurface.
+        :raises ValueError: If two input elements of the surface share action_id.
+        """
+        # Action ids of the inputs must be unique within the surface, so the block ids (possibly generated by
+        # Slack) are not needed
+        self._parsers = {}  # action_id -> parser, None for elements of unknown types
+
+        for _, _element in _input_elements(surface):
+            _action_id = _element._body["action_id"]
+            if _action_id in self._parsers:
+                raise ValueError(f"Action id {_action_id} is used by more than one element.")
+            _factory = _PARSERS.get(_element._body.get("type"))
+            self._parsers[_action_id] = _factory(_element) if _factory else None
+        self._empty = dict.fromkeys(self._parsers)
+
+    def __len__(self):
+        return len(self._parsers)
+
+    def extract(self, values: dict) -> dict:
+        """
+        :param values: State values of the submitted view, i.e. payload["view"]["state"]["values"].
+        :return: Dictionary of the typed values keyed by action_id, every element of the surface is present.
+        Values of elements not known to the surface are skipped.
+        """
+        _result = dict(self._empty)
+        _parsers = self._parsers
+        for _inputs in values.values():
+            for _action_id, _state in _inputs.items():
+                _parse = _parsers.get(_action_id, _MISSING)
+                if _parse is _MISSING:
+                    continue
+                _result[_action_id] = _parse(_state) if _parse is not None else _state
+        return _result
+
+
+# APPLYING STATE #
+# Each function receives an element and its submitted state and returns the validated update of the element:
+# attribute, its value, body key and its value (_MISSING to remove the key).
+def _text_input(_attr: str):
+    def _apply(_element: BlockInterface, _state: dict) -> tuple:
+        _v = _state.get("value")
+        if _v is not None:
+            check_length(_v, _min=1, _max=3000)
+        return _attr, _v, "initial_value", _v if _v is not None else _MISSING
+
+    return _apply
+
+
+def _number_input(_element: BlockInterface, _state: dict) -> tuple:
+    _v = _state.get("value")
+    if _v is not None:
+        check_is_number(_v, _element._is_decimal_allowed)
+    return "_init_value", _v, "initial_value", _v if _v is not None else _MISSING
+
+
+def _date_picker(_element: BlockInterface, _state: dict) -> tuple:
+    _v = _date(_state)
+    return "_init_date", _v, "initial_date", str(_v) if _v is not None else _MISSING
+
+
+def _time_picker(_element: BlockInterface, _state: dict) -> tuple:
+    _v = _time(_state)
+    return "_init_time", _v, "initial_time", _v.strftime("%H:%M") if _v is not None else _MISSING
+
+
+def _date_time_picker(_element: BlockInterface, _state: dict) -> tuple:
+    _v = _date_time(_state)
+    return "_initial_date_time", _v, "initial_date_time", str(int(_v.timestamp())) if _v is not None else _MISSING
+
+
+def _selected(_element: BlockInterface, _state: dict, _known: bool) -> list:
+    _submitted = _state.get("selected_options")
+    if _submitted is None:
+        _submitted = [_state["selected_option"]] if _state.get("selected_option") else []
+    if not _known:
+        return [_payload_option(_s) for _s in _submitted]
+
+    # Constant time lookup by value, catalogs keep their own index
+    _items = _element._body.get("options") or _element._body.get("option_groups")
+    _get = _items.get if isinstance(_items, OptionCatalog) else _known_options(_element).get
+    _options = []
+    for _s in _submitted:
+        _o = _get(_s["value"])
+        if _o is None:
+            raise ValueError(f"Value {_s['value']} is not an option of {_element._body['action_id']}.")
+        _options.append(_o)
+    return _options
+
+
+def _select(_known: bool):
+    def _apply(_element: BlockInterface, _state: dict) -> tuple:
+        _options = _selected(_element, _state, _known)
+        if _element._body["type"] in ("static_select", "external_select"):
+            return "_init_options", _options or None, "initial_option", _options[0] if _options else _MISSING
+        return "_init_options", _options or None, "initial_options", _options if _options else _MISSING
+
+    return _apply
+
+
+def _radio_buttons(_element: BlockInterface, _state: dict) -> tuple:
+    _options = _selected(_element, _state, True)
+    _v = _options[0] if _options else None
+    return "_init_option", _v, "initial_option", _v if _v is not None else _MISSING
+
+
+def _ids(_name: str, _attr: str):
+    def _apply(_element: BlockInterface, _state: dict) -> tuple:
+        if _element._body["type"].startswith("multi"):
+            _v = _state.get(f"selected_{_name}s") or None
+            return _attr, _v, f"initial_{_name}s", _v if _v else _MISSING
+        _v = _state.get(f"selected_{_name}")
+        return _attr, [_v] if _v else None, f"initial_{_name}", _v if _v else _MISSING
+
+    return _apply
+
+
+# Element type -> function updating the element by its state
+_APPLIERS = {
+    "plain_text_input": _text_input("_init_value"),
+    "email_text_input": _text_input("_initial_value"),
+    "url_text_input": _text_input("_init_value"),
+    "number_input": _number_input,
+    "datepicker": _date_picker,
+    "timepicker": _time_picker,
+    "datetimepicker": _date_time_picker,
+    "static_select": _select(True),
+    "multi_static_select": _select(True),
+    "checkboxes": _select(True),
+    "radio_buttons": _radio_buttons,
+    "external_select": _select(False),
+    "multi_external_select": _select(False),
+    "users_select": _ids("user", "_init_options"),
+    "multi_users_select": _ids("user", "_init_options"),
+    "conversations_select": _ids("conversation", "_init_conversations"),
+    "multi_conversations_select": _ids("conversation", "_init_conversations"),
+    "channels_select": _ids("channel", "_init_channels"),
+    "multi_channels_select": _ids("channel", "_init_channels"),
+}
+
+
+def apply_state(surface: BlockInterface, values: dict):
+    """
+    Set the submitted values of the view as the initial values of the elements of the surface. All values are
+    validated before the first element is changed, so the surface is either updated completely or not at all.
+    :param surface: Surface the view was opened with.
+    :param values: State values of the submitted view, i.e. payload["view"]["state"]["values"].
+    :raises ValueError: If a submitted value is not valid for its element, e.g. an option of a static select
+    the element does not have, or if the block id is not known and the action id is used by several elements.
+    """
+    # Elements are looked up by block_id and action_id, by action_id alone for block ids generated by Slack. An
+    # action id used by several elements maps to None, the element can not be told without the block id
+    _index = {}
+    _by_action = {}
+    for _block_id, _element in _input_elements(surface):
+        _action_id = _element._body["action_id"]
+        _index[(_block_id, _action_id)] = _element
+        _by_action[_action_id] = None if _action_id in _by_action else _element
+
+    _updates = []
+    for _block_id, _inputs in values.items():
+        for _action_id, _state in _inputs.items():
+            _element = _index.get((_block_id, _action_id))
+            if _element is None:
+                _element = _by_action.get(_action_id, _MISSING)
+                if _element is _MISSING:
+                    continue
+                if _element is None:
+                    raise ValueError(f"Action id {_action_id} is used by more than one element, block {_block_id} "
+                                     f"is not known.")
+            _apply = _APPLIERS.get(_element._body["type"])
+            if _apply is not None:
+                _updates.append((_element, _apply(_element, _state)))
+
+    for _element, (_attr, _value, _key, _body_value) in _updates:
+        setattr(_element, _attr, _value)
+        if _body_value is _MISSING:
+            _element._body.pop(_key, None)
+        else:
+            _element._body[_key] = _body_value
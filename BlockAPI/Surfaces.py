@@ -1,12 +1,15 @@
 from copy import deepcopy, copy
-from typing import Type
+from typing import Callable, Type
 
+from BlockAPI.BlockElements import *
 from BlockAPI.Blocks import *
+from BlockAPI.Budget import *
+from BlockAPI.State import *
 
 # List of types supported by home surface and modals
 _home_and_modal_types = Union[ActionBlock, ContextBlock, DividerBlock,
                               HeaderBlock, ImageBlock, InputBlock,
-                              SectionBlock, VideoBlock]
+                              SectionBlock, VideoBlock, RawBlock]
 
 _all_types = Union[_home_and_modal_types, FileBlock]  # File block is allowed only for message surfaces
 
@@ -23,6 +26,8 @@ def _add(self,
     else:
         self._blocks.insert(index, item)
 
+    self._list_changed("blocks")
+
 
 def _add_after(self,
                _block: _all_types,
@@ -57,6 +62,8 @@ def _add_after(self,
                 raise ValueError(f"Could not find instance of {_type.__name__}.")
             self._blocks.append(_block)
 
+    self._list_changed("blocks")
+
 
 def _add_before(self,
                 _block: _all_types,
@@ -91,8 +98,26 @@ def _add_before(self,
                 raise ValueError(f"Could not find instance of {_type.__name__}.")
             self._blocks.append(_block)
 
+    self._list_changed("blocks")
+
+
+async def _add_async(self, items: list, timeout: float):
+    # Imported here, so asyncio is imported only by the handlers building surfaces asynchronously
+    from BlockAPI.AsyncBuild import resolve_blocks
+    for _block in await resolve_blocks(items, timeout):
+        _add(self, _block)
+
+
+async def _to_json_async(self, items: list, timeout: float) -> bytes:
+    from BlockAPI.AsyncBuild import resolve_blocks
+    _blocks = await resolve_blocks(items, timeout, serialize=True)
+    _surface = copy(self)  # Shallow, the blocks are shared
+    _surface.blocks = self._blocks + _blocks
+    return _surface.to_json()
+
 
 class HomeSurface(BlockInterface):
+    _child_keys = ("blocks",)
 
     def __init__(self, blocks: _home_and_modal_types = None):
         self._blocks = blocks if blocks else []
@@ -151,6 +176,41 @@ class HomeSurface(BlockInterface):
         _add_before(self, _block, _type, _instance_num, _strict)
         return self
 
+    def build_within(self,
+                     budget: PayloadBudget,
+                     priority: Callable[[BlockInterface], int] = None) -> bytes:
+        """
+        Serialize the surface degraded to fit the budget in a single pass, the surface itself is not modified.
+        :param budget: Byte and block count limits and the degradation strategies. If the budget does not limit
+        the block count, the limit of the surface (100 blocks) is used.
+        :param priority: Callable returning priority of a block, lower priorities are degraded first.
+        :return: JSON bytes like to_json(), fitting the byte limit of the budget.
+        :raises ValueError: If the payload can not fit the budget.
+        """
+        return build_within_budget(self, budget, 100, priority)
+
+    async def add_async(self, items: list, timeout: float = None):
+        """
+        Add blocks whose data is still being fetched. Slots of the items are resolved concurrently, the blocks are
+        added at the end in order of the items.
+        :param items: Blocks, Slot objects, or awaitables and async iterables resolving to blocks.
+        :param timeout: Default timeout of the slots in seconds. Slots which time out are replaced by their fallback
+        blocks (or left out).
+        :return: Self.
+        """
+        await _add_async(self, items, timeout)
+        return self
+
+    async def to_json_async(self, items: list, timeout: float = None) -> bytes:
+        """
+        Serialize the surface with blocks whose data is still being fetched added at the end, the surface itself
+        is not modified. Blocks of every slot are serialized as soon as the slot is resolved.
+        :param items: Blocks, Slot objects, or awaitables and async iterables resolving to blocks.
+        :param timeout: Default timeout of the slots in seconds.
+        :return: JSON bytes.
+        """
+        return await _to_json_async(self, items, timeout)
+
     def copy(self):
         temp = HomeSurface()
         temp._body = deepcopy(self._body)
@@ -164,9 +224,11 @@ class HomeSurface(BlockInterface):
     @blocks.setter
     def blocks(self, _blocks):
         self._blocks = _blocks
+        self._body["blocks"] = _blocks
 
 
 class MessageSurface(BlockInterface):
+    _child_keys = ("blocks",)
 
     def __init__(self, blocks: _all_types = None):
         self._blocks = blocks if blocks else []
@@ -224,14 +286,59 @@ class MessageSurface(BlockInterface):
         _add_before(self, _block, _type, _instance_num, _strict)
         return self
 
+    def build_within(self,
+                     budget: PayloadBudget,
+                     priority: Callable[[BlockInterface], int] = None) -> bytes:
+        """
+        Serialize the surface degraded to fit the budget in a single pass, the surface itself is not modified.
+        :param budget: Byte and block count limits and the degradation strategies. If the budget does not limit
+        the block count, the limit of the surface (50 blocks) is used.
+        :param priority: Callable returning priority of a block, lower priorities are degraded first.
+        :return: JSON bytes like to_json(), fitting the byte limit of the budget.
+        :raises ValueError: If the payload can not fit the budget.
+        """
+        return build_within_budget(self, budget, 50, priority)
+
+    async def add_async(self, items: list, timeout: float = None):
+        """
+        Add blocks whose data is still being fetched. Slots of the items are resolved concurrently, the blocks are
+        added at the end in order of the items.
+        :param items: Blocks, Slot objects, or awaitables and async iterables resolving to blocks.
+        :param timeout: Default timeout of the slots in seconds. Slots which time out are replaced by their fallback
+        blocks (or left out).
+        :return: Self.
+        """
+        await _add_async(self, items, timeout)
+        return self
+
+    async def to_json_async(self, items: list, timeout: float = None) -> bytes:
+        """
+        Serialize the surface with blocks whose data is still being fetched added at the end, the surface itself
+        is not modified. Blocks of every slot are serialized as soon as the slot is resolved.
+        :param items: Blocks, Slot objects, or awaitables and async iterables resolving to blocks.
+        :param timeout: Default timeout of the slots in seconds.
+        :return: JSON bytes.
+        """
+        return await _to_json_async(self, items, timeout)
+
     def copy(self):
         temp = MessageSurface()
         temp._body = deepcopy(self._body)
         temp._blocks = temp._body["blocks"]
         return temp
 
+    @property
+    def blocks(self):
+        return self._blocks
+
+    @blocks.setter
+    def blocks(self, _blocks):
+        self._blocks = _blocks
+        self._body["blocks"] = _blocks
+
 
 class ModalSurface(BlockInterface):
+    _child_keys = ("title", "close", "submit", "blocks")
 
     def __init__(self, title: Text, close: Text, blocks: List[_home_and_modal_types] = None, submit: Text = None):
         self._blocks = blocks if blocks else []
@@ -243,7 +350,7 @@ class ModalSurface(BlockInterface):
             "type": "modal",
             "title": title,
             "close": close,
-            "blocks": blocks
+            "blocks": self._blocks
         }
 
         if submit:
@@ -299,6 +406,54 @@ class ModalSurface(BlockInterface):
         _add_before(self, _block, _type, _instance_num, _strict)
         return self
 
+    def build_within(self,
+                     budget: PayloadBudget,
+                     priority: Callable[[BlockInterface], int] = None) -> bytes:
+        """
+        Serialize the surface degraded to fit the budget in a single pass, the surface itself is not modified.
+        :param budget: Byte and block count limits and the degradation strategies. If the budget does not limit
+        the block count, the limit of the surface (100 blocks) is used.
+        :param priority: Callable returning priority of a block, lower priorities are degraded first.
+        :return: JSON bytes like to_json(), fitting the byte limit of the budget.
+        :raises ValueError: If the payload can not fit the budget.
+        """
+        return build_within_budget(self, budget, 100, priority)
+
+    async def add_async(self, items: list, timeout: float = None):
+        """
+        Add blocks whose data is still being fetched. Slots of the items are resolved concurrently, the blocks are
+        added at the end in order of the items.
+        :param items: Blocks, Slot objects, or awaitables and async iterables resolving to blocks.
+        :param timeout: Default timeout of the slots in seconds. Slots which time out are replaced by their fallback
+        blocks (or left out).
+        :return: Self.
+        """
+        await _add_async(self, items, timeout)
+        return self
+
+    async def to_json_async(self, items: list, timeout: float = None) -> bytes:
+        """
+        Serialize the surface with blocks whose data is still being fetched added at the end, the surface itself
+        is not modified. Blocks of every slot are serialized as soon as the slot is resolved.
+        :param items: Blocks, Slot objects, or awaitables and async iterables resolving to blocks.
+        :param timeout: Default timeout of the slots in seconds.
+        :return: JSON bytes.
+        """
+        return await _to_json_async(self, items, timeout)
+
+    def apply_state(self, state_values: dict):
+        """
+        Set the values submitted in the view as the initial values of the elements, e.g. to re-open the view with
+        the previous answers in multi-step modals. Elements are found by block_id and action_id, options of selects
+        by their value in constant time; all values are validated before any element is changed.
+        :param state_values: State values of the submitted view, i.e. payload["view"]["state"]["values"].
+        :return: Self.
+        :raises ValueError: If a submitted value is not valid for its element, or if an element can not be told by
+        its action_id alone and the block_id is not known.
+        """
+        apply_state(self, state_values)
+        return self
+
     def copy(self):
         _title = copy(self._title)
         _close = copy(self._close)
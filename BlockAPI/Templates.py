@@ -0,0 +1,189 @@
+"""
+Store of pre-serialized surface payloads in a single memory-mapped file, shared by any number of processes.
+
+    TemplateStore.write("templates.bin", [("welcome", 1, welcome_home), ("approve", 3, approve_modal)])
+
+    store = TemplateStore("templates.bin")      # e.g. in every worker
+    payload = store.get("approve")              # memoryview of the latest version, no copy
+    payload = store.get("approve", version=2)
+
+The file is mapped read-only, so its pages are shared through the page cache and the memory does not grow with the
+number of processes; every process keeps only the small index. A store is replaced atomically by writing it again,
+open stores keep reading the previous file until refresh() is called, views already returned stay valid.
+"""
+import mmap
+import os
+import struct
+import tempfile
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from BlockAPI.BlockInterface import BlockInterface
+
+_MAGIC = b"BKTS"
+_VERSION = 1
+_HEADER = struct.Struct(">4sBIQ")  # Magic, format version, number of templates, offset of the index
+_ENTRY = struct.Struct(">HIQI")    # Length of the name, template version, offset and length of the payload
+
+
+class TemplateStore:
+
+    @staticmethod
+    def write(path: str, templates: Iterable[Tuple[str, int, Union[BlockInterface, bytes]]]):
+        """
+        Write the templates into a new store file, replacing the existing one atomically.
+        :param path: Path of the store file.
+        :param templates: (name, version, surface, frozen surface or JSON bytes) triples. Surfaces are serialized
+        by to_json().
+        :raises ValueError: If a (name, version) pair is not unique, the name is too long or the version is out of
+        range.
+        """
+        _fd, _tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix=".templates-")
+        try:
+            os.fchmod(_fd, 0o644)  # Readable by workers running as other users, like a regularly created file
+            with os.fdopen(_fd, "wb") as _f:
+                _f.write(_HEADER.pack(_MAGIC, _VERSION, 0, 0))
+                _offset = _HEADER.size
+                _index = []
+                _seen = set()
+                for _name, _version, _template in templates:
+                    if (_name, _version) in _seen:
+                        raise ValueError(f"Template {_name} version {_version} is not unique.")
+                    if len(_name.encode()) > 0xFFFF:
+                        raise ValueError("Template name is too long.")
+                    if not 0 <= _version <= 0xFFFFFFFF:
+                        raise ValueError("Template version must be in range [0, 2^32).")
+                    _seen.add((_name, _version))
+
+                    _payload = _template.to_json() if hasattr(_template, "to_json") else bytes(_template)
+                    _f.write(_payload)
+                    _index.append((_name.encode(), _version, _offset, len(_payload)))
+                    _offset += len(_payload)
+
+                for _name, _version, _start, _length in _index:
+                    _f.write(_ENTRY.pack(len(_name), _version, _start, _length))
+                    _f.write(_name)
+
+                _f.seek(0)
+                _f.write(_HEADER.pack(_MAGIC, _VERSION, len(_index), _offset))
+                _f.flush()
+                os.fsync(_f.fileno())
+            os.replace(_tmp, path)
+        except BaseException:
+            os.unlink(_tmp)
+            raise
+
+    def __init__(self, path: str):
+        """
+        :param path: Path of a store file created by write().
+        :raises ValueError: If the file is not a template store.
+        """
+        self._path = path
+        self._mmap = None
+        self._view = None
+        self._stat = None
+        self._index: Dict[str, Dict[int, Tuple[int, int]]] = {}
+        self._latest: Dict[str, int] = {}
+        self._open()
+
+    def _open(self):
+        # The map holds its own duplicate of the file descriptor, the file itself can be closed right away
+        with open(self._path, "rb") as _file:
+            _stat = os.fstat(_file.fileno())
+            _mmap = mmap.mmap(_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        _view = memoryview(_mmap)
+        try:
+            _index = self._read_index(_view)
+        except BaseException:
+            _view.release()
+            _mmap.close()
+            raise
+
+        self._close()
+        self._mmap, self._view, self._stat, self._index = _mmap, _view, _stat, _index
+        self._latest = {_name: max(_versions) for _name, _versions in _index.items()}
+
+    @staticmethod
+    def _read_index(_view: memoryview) -> Dict[str, Dict[int, Tuple[int, int]]]:
+        if len(_view) < _HEADER.size:
+            raise ValueError("File is not a template store.")
+        _magic, _version, _count, _offset = _HEADER.unpack_from(_view)
+        if _magic != _MAGIC:
+            raise ValueError("File is not a template store.")
+        if _version != _VERSION:
+            raise ValueError(f"Unsupported template store version {_version}, expected {_VERSION}.")
+
+        _index = {}
+        for _ in range(_count):
+            _name_length, _template_version, _start, _length = _ENTRY.unpack_from(_view, _offset)
+            _offset += _ENTRY.size
+            _name = bytes(_view[_offset:_offset + _name_length]).decode()
+            _offset += _name_length
+            _index.setdefault(_name, {})[_template_version] = (_start, _length)
+        return _index
+
+    def _close(self):
+        if self._view is None:
+            return
+        self._view.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass  # Views returned by get() are still in use, the file is unmapped once the last of them is released
+        self._view = self._mmap = None
+
+    def close(self):
+        """
+        Close the store. The file is unmapped once all views returned by get() are released.
+        """
+        self._close()
+        self._index = {}
+        self._latest = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def refresh(self) -> bool:
+        """
+        Map the store file again if it was replaced since it was opened.
+        :return: True if the store was reopened.
+        """
+        _stat = os.stat(self._path)
+        if self._stat is not None and (_stat.st_ino, _stat.st_mtime_ns) == (self._stat.st_ino, self._stat.st_mtime_ns):
+            return False
+        self._open()
+        return True
+
+    def get(self, name: str, version: int = None) -> memoryview:
+        """
+        :param name: Name of the template.
+        :param version: Version of the template, the latest version if None.
+        :return: Read-only view of the JSON payload of the template, without copying it.
+        :raises KeyError: If there is no such template.
+        """
+        _versions = self._index.get(name)
+        if _versions is None:
+            raise KeyError(name)
+        _location = _versions.get(self._latest[name] if version is None else version)
+        if _location is None:
+            raise KeyError((name, version))
+        _start, _length = _location
+        return self._view[_start:_start + _length]
+
+    def versions(self, name: str) -> List[int]:
+        return sorted(self._index.get(name, ()))
+
+    def latest(self, name: str) -> Optional[int]:
+        return self._latest.get(name)
+
+    def names(self) -> List[str]:
+        return sorted(self._index)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    def __len__(self) -> int:
+        return sum(len(_v) for _v in self._index.values())
@@ -0,0 +1,250 @@
+"""
+Pooled asynchronous HTTP transport posting surfaces to the Web API.
+
+    async with HTTPTransport("https://slack.com/api", token, pool_size=4) as transport:
+        await transport.publish(user_id, home_tab)
+        await transport.post_message(channel, message)
+        await transport.call_many([("views.publish", {"user_id": _u, "view": home_tab}) for _u in users])
+
+Connections are kept alive and reused by all calls; call_many() writes batches of requests back to back on every
+connection (HTTP/1.1 pipelining) and reads the responses in order. Surfaces are serialized with orjson when it is
+installed, falling back to the json module of the standard library; the output is the same bytes either way.
+"""
+import asyncio
+import json
+import ssl
+from typing import Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from BlockAPI.BlockInterface import BlockInterface, _splice_raws
+from BlockAPI.Publish import PublishError, _check_response, _read_response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def encode(payload) -> bytes:
+    """
+    Serialize a payload with the fastest available encoder.
+    :param payload: Surface or any other object of the package, object with to_json() (frozen surfaces, versions),
+    JSON bytes, or a dictionary whose values may be any of them, e.g. {"user_id": user, "view": home_tab}.
+    :return: Compact UTF-8 encoded JSON.
+    """
+    if isinstance(payload, (bytes, bytearray)):
+        return bytes(payload)
+    if isinstance(payload, BlockInterface):
+        if orjson is None:
+            return payload.to_json()
+        _raws = []
+        return _splice_raws(orjson.dumps(payload._encodable(_raws)), _raws)
+    if isinstance(payload, dict):
+        # Values are encoded separately, so surfaces are serialized by the fast path as well
+        return b"{" + b",".join(b"%s:%s" % (_dumps(_k), encode(_v)) for _k, _v in payload.items()) + b"}"
+    if hasattr(payload, "to_json"):
+        return payload.to_json()
+    return _dumps(payload)
+
+
+def _dumps(_value) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(_value)
+    return json.dumps(_value, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+class _Connection:
+    __slots__ = ("reader", "writer", "reused")
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.reused = False
+
+
+class HTTPTransport:
+    """
+    Client of the Web API with a pool of keep-alive connections. Its call() method can be used as the sender of
+    PublishScheduler.
+    """
+
+    def __init__(self,
+                 base_url: str,
+                 token: str,
+                 pool_size: int = 4,
+                 timeout: float = 10.0,
+                 max_pipeline: int = 16):
+        """
+        :param base_url: URL of the API, e.g. "https://slack.com/api".
+        :param token: Bot token.
+        :param pool_size: Maximum number of open connections.
+        :param timeout: Timeout of connecting and of reading a response in seconds.
+        :param max_pipeline: Maximum number of requests written to a connection before reading their responses.
+        """
+        if pool_size < 1:
+            raise ValueError("Pool size must be positive.")
+        if max_pipeline < 1:
+            raise ValueError("Maximum pipeline length must be positive.")
+        _url = urlsplit(base_url)
+        if _url.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme {_url.scheme}, can only be: ('http', 'https').")
+
+        self._host = _url.hostname
+        self._ssl = ssl.create_default_context() if _url.scheme == "https" else None
+        self._port = _url.port or (443 if self._ssl else 80)
+        self._path = _url.path.rstrip("/")
+        self._head = (f"Host: {self._host}\r\nAuthorization: Bearer {token}\r\n"
+                      f"Content-Type: application/json; charset=utf-8\r\n").encode()
+        self._pool_size = pool_size
+        self._timeout = timeout
+        self._max_pipeline = max_pipeline
+
+        self._idle: List[_Connection] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.stats = {"requests": 0, "connections": 0, "reconnects": 0}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """
+        Close the idle connections, connections in use are closed when their calls finish.
+        """
+        _idle, self._idle = self._idle, []
+        for _conn in _idle:
+            _conn.writer.close()
+
+    # CONNECTION POOL #
+    async def _acquire(self) -> _Connection:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self._pool_size)
+        await self._slots.acquire()
+        if self._idle:
+            return self._idle.pop()
+        try:
+            _reader, _writer = await asyncio.wait_for(
+                asyncio.open_connection(self._host, self._port, ssl=self._ssl), self._timeout)
+        except BaseException:
+            self._slots.release()
+            raise
+        self.stats["connections"] += 1
+        return _Connection(_reader, _writer)
+
+    def _release(self, _conn: _Connection, _keep: bool):
+        if _keep and not _conn.writer.is_closing():
+            _conn.reused = True
+            self._idle.append(_conn)
+        else:
+            _conn.writer.close()
+        self._slots.release()
+
+    def _request(self, _method: str, _body: bytes) -> bytes:
+        return b"POST %s/%s HTTP/1.1\r\n%sContent-Length: %d\r\n\r\n%s" % (
+            self._path.encode(), _method.encode(), self._head, len(_body), _body)
+
+    async def _exchange(self, _calls: List[Tuple[str, bytes]]) -> List[Tuple[int, dict, bytes]]:
+        """
+        Send the requests pipelined on one connection.
+        :return: Responses in order of the requests.
+        """
+        _responses = []
+        while len(_responses) < len(_calls):
+            _pending = _calls[len(_responses):len(_responses) + self._max_pipeline]
+            _conn = await self._acquire()
+            _keep = False
+            _received = 0
+            try:
+                _conn.writer.write(b"".join(self._request(_m, _b) for _m, _b in _pending))
+                await _conn.writer.drain()
+                _keep = True
+                for _ in _pending:
+                    _response = await asyncio.wait_for(_read_response(_conn.reader, True), self._timeout)
+                    _responses.append(_response)
+                    _received += 1
+                    if _response[1].get("connection", "").lower() == "close":
+                        # The rest of the batch is sent again on another connection
+                        _keep = False
+                        break
+            except (ConnectionError, asyncio.IncompleteReadError) as _e:
+                _keep = False
+                # Idle connection closed by the server in the meantime, the requests never reached it
+                if not (_conn.reused and _received == 0):
+                    raise ConnectionResetError(str(_e)) from _e
+                self.stats["reconnects"] += 1
+            except BaseException:
+                _keep = False
+                raise
+            finally:
+                self._release(_conn, _keep)
+            self.stats["requests"] += _received
+        return _responses
+
+    # CALLS #
+    async def call(self, method: str, body) -> dict:
+        """
+        Call a method of the Web API.
+        :param method: Name of the method, e.g. "views.publish".
+        :param body: Arguments of the method, anything encode() accepts.
+        :return: Response of the method.
+        :raises PublishError: If the method fails, transient errors (HTTP 5xx and rate limiting) are marked so.
+        :raises OSError: If the connection fails.
+        """
+        _response, = await self._exchange([(method, encode(body))])
+        return _check_response(*_response)
+
+    async def call_many(self, calls: Iterable[Tuple[str, object]], return_exceptions: bool = False) -> list:
+        """
+        Call methods of the Web API concurrently, the calls are spread over the pool and pipelined on the
+        connections.
+        :param calls: (method, body) pairs, see call().
+        :param return_exceptions: If True, failed calls return their PublishError instead of raising it.
+        :return: Responses in order of the calls.
+        :raises PublishError: If a method fails and return_exceptions is False.
+        """
+        _calls = [(_m, encode(_b)) for _m, _b in calls]
+        _size = -(-len(_calls) // self._pool_size) if _calls else 0
+        _chunks = [_calls[_i:_i + _size] for _i in range(0, len(_calls), _size or 1)]
+        _results = []
+        for _responses in await asyncio.gather(*(self._exchange(_c) for _c in _chunks)):
+            for _response in _responses:
+                try:
+                    _results.append(_check_response(*_response))
+                except PublishError as _e:
+                    if not return_exceptions:
+                        raise
+                    _results.append(_e)
+        return _results
+
+    async def publish(self, user_id: str, surface) -> dict:
+        """
+        Publish the surface (e.g. HomeSurface) to the Home tab of the user, views.publish.
+        """
+        return await self.call("views.publish", {"user_id": user_id, "view": surface})
+
+    async def update(self, view_id: str, surface, hash: str = None) -> dict:
+        """
+        Update an opened view, views.update.
+        :param hash: Hash of the view being updated, the update fails if the view changed in the meantime.
+        """
+        _body = {"view_id": view_id, "view": surface}
+        if hash is not None:
+            _body["hash"] = hash
+        return await self.call("views.update", _body)
+
+    async def open(self, trigger_id: str, surface) -> dict:
+        """
+        Open a modal (ModalSurface), views.open.
+        """
+        return await self.call("views.open", {"trigger_id": trigger_id, "view": surface})
+
+    async def post_message(self, channel: str, surface) -> dict:
+        """
+        Post a message (MessageSurface) to a channel, chat.postMessage.
+        """
+        _json = encode(surface)
+        _channel = b'{"channel":%s' % _dumps(channel)
+        return await self.call("chat.postMessage", _channel + (b"," + _json[1:] if _json != b"{}" else b"}"))
+
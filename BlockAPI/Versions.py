@@ -0,0 +1,276 @@
+"""
+Persistent versions of a surface with undo and redo, e.g. for multi-step modals where users can go back.
+
+    versions = SurfaceVersions(modal)
+    versions.update(2, text=Text(type=MRKDWN, text="Step 2"))
+    versions.append(DividerBlock())
+    versions.undo()
+    payload = versions.current.build()
+
+Versions share everything their edits did not touch: the block list of every version is a persistent balanced tree,
+an edit copies only the path to the changed block (O(log n)) and the changed block itself, which shares all its
+children with the previous version. Snapshots are O(1), a version is just the root of its tree.
+"""
+from copy import copy
+from typing import Iterator, List
+
+from BlockAPI.BlockInterface import BlockInterface
+
+
+# PERSISTENT LIST #
+# Immutable AVL tree ordered by position, nodes are (left, value, right, size, height) tuples, None is empty tree.
+# Every operation returns a new tree sharing the untouched nodes with the old one.
+def _size(_n) -> int:
+    return _n[3] if _n is not None else 0
+
+
+def _height(_n) -> int:
+    return _n[4] if _n is not None else 0
+
+
+def _node(_l, _v, _r) -> tuple:
+    return _l, _v, _r, _size(_l) + _size(_r) + 1, max(_height(_l), _height(_r)) + 1
+
+
+def _balance(_l, _v, _r) -> tuple:
+    _hl, _hr = _height(_l), _height(_r)
+    if _hl > _hr + 1:
+        _ll, _lv, _lr = _l[0], _l[1], _l[2]
+        if _height(_ll) >= _height(_lr):
+            return _node(_ll, _lv, _node(_lr, _v, _r))
+        return _node(_node(_ll, _lv, _lr[0]), _lr[1], _node(_lr[2], _v, _r))
+    if _hr > _hl + 1:
+        _rl, _rv, _rr = _r[0], _r[1], _r[2]
+        if _height(_rr) >= _height(_rl):
+            return _node(_node(_l, _v, _rl), _rv, _rr)
+        return _node(_node(_l, _v, _rl[0]), _rl[1], _node(_rl[2], _rv, _rr))
+    return _node(_l, _v, _r)
+
+
+def _from_list(_items: list, _lo: int, _hi: int):
+    if _lo >= _hi:
+        return None
+    _mid = (_lo + _hi) // 2
+    return _node(_from_list(_items, _lo, _mid), _items[_mid], _from_list(_items, _mid + 1, _hi))
+
+
+def _get(_n, _i: int):
+    while True:
+        _sl = _size(_n[0])
+        if _i < _sl:
+            _n = _n[0]
+        elif _i > _sl:
+            _i -= _sl + 1
+            _n = _n[2]
+        else:
+            return _n[1]
+
+
+def _set(_n, _i: int, _v) -> tuple:
+    _sl = _size(_n[0])
+    if _i < _sl:
+        return (_set(_n[0], _i, _v),) + _n[1:]
+    if _i > _sl:
+        return _n[:2] + (_set(_n[2], _i - _sl - 1, _v),) + _n[3:]
+    return (_n[0], _v) + _n[2:]
+
+
+def _insert(_n, _i: int, _v) -> tuple:
+    if _n is None:
+        return None, _v, None, 1, 1
+    _sl = _size(_n[0])
+    if _i <= _sl:
+        return _balance(_insert(_n[0], _i, _v), _n[1], _n[2])
+    return _balance(_n[0], _n[1], _insert(_n[2], _i - _sl - 1, _v))
+
+
+def _remove(_n, _i: int):
+    _l, _v, _r = _n[0], _n[1], _n[2]
+    _sl = _size(_l)
+    if _i < _sl:
+        return _balance(_remove(_l, _i), _v, _r)
+    if _i > _sl:
+        return _balance(_l, _v, _remove(_r, _i - _sl - 1))
+    if _l is None:
+        return _r
+    if _r is None:
+        return _l
+    return _balance(_l, _get(_r, 0), _remove(_r, 0))
+
+
+def _iter(_n) -> Iterator:
+    _stack = []
+    while _stack or _n is not None:
+        while _n is not None:
+            _stack.append(_n)
+            _n = _n[0]
+        _n = _stack.pop()
+        yield _n[1]
+        _n = _n[2]
+
+
+class Version:
+    """
+    Immutable version of a surface. The blocks and the surface object of a version are shared with the other
+    versions, treat them as read-only; surface() returns an object whose block list can be changed freely.
+    """
+    __slots__ = ("_surface", "_root")
+
+    def __init__(self, surface: BlockInterface, root):
+        self._surface = surface  # Surface holding the other properties (title, submit...), its blocks are not used
+        self._root = root
+
+    def __len__(self):
+        return _size(self._root)
+
+    def __getitem__(self, index: int) -> BlockInterface:
+        return _get(self._root, _index(self._root, index))
+
+    def __iter__(self) -> Iterator[BlockInterface]:
+        return _iter(self._root)
+
+    @property
+    def blocks(self) -> List[BlockInterface]:
+        return list(_iter(self._root))
+
+    def surface(self) -> BlockInterface:
+        """
+        :return: New surface object with the properties and the blocks of the version. The surface and its block
+        list are new, the blocks are shared with the version.
+        """
+        _surface = copy(self._surface)
+        _surface.blocks = self.blocks
+        return _surface
+
+    def build(self) -> dict:
+        return self.surface().build()
+
+    def to_json(self) -> bytes:
+        return self.surface().to_json()
+
+
+def _index(_root, _i: int, _inserting: bool = False) -> int:
+    _n = _size(_root) + (1 if _inserting else 0)
+    if _i < 0:
+        _i += _n
+    if not 0 <= _i < _n:
+        raise IndexError("Block index out of range.")
+    return _i
+
+
+class SurfaceVersions:
+    """
+    History of versions of a surface. Every edit creates a new version which shares all untouched blocks and
+    subtrees with the previous one; undo() and redo() move between the versions, an edit after undo() drops the
+    versions that could be redone. The surface passed in is not changed by the edits, but its blocks become part of
+    the first version and must not be changed afterwards.
+    """
+
+    def __init__(self, surface: BlockInterface, max_versions: int = None):
+        """
+        :param surface: Initial version of the surface (any surface with blocks).
+        :param max_versions: Maximum number of versions kept for undo, the oldest are dropped. Unlimited if None.
+        """
+        if max_versions is not None and max_versions < 1:
+            raise ValueError("Maximum number of versions must be positive.")
+        _blocks = list(surface.blocks)
+        _surface = copy(surface)
+        _surface.blocks = []  # Blocks of the versions are kept in their trees
+        self._versions = [Version(_surface, _from_list(_blocks, 0, len(_blocks)))]
+        self._position = 0
+        self._max_versions = max_versions
+
+    def __len__(self):
+        return len(self._versions)
+
+    @property
+    def current(self) -> Version:
+        return self._versions[self._position]
+
+    def snapshot(self) -> Version:
+        """
+        :return: Current version, which stays valid whatever edits follow.
+        """
+        return self.current
+
+    @property
+    def can_undo(self) -> bool:
+        return self._position > 0
+
+    @property
+    def can_redo(self) -> bool:
+        return self._position < len(self._versions) - 1
+
+    def undo(self) -> Version:
+        """
+        :return: Previous version, which becomes the current one.
+        :raises IndexError: If there is no version to go back to.
+        """
+        if not self.can_undo:
+            raise IndexError("Nothing to undo.")
+        self._position -= 1
+        return self.current
+
+    def redo(self) -> Version:
+        """
+        :return: Next version, which becomes the current one.
+        :raises IndexError: If there is no undone version.
+        """
+        if not self.can_redo:
+            raise IndexError("Nothing to redo.")
+        self._position += 1
+        return self.current
+
+    def _commit(self, _version: Version) -> Version:
+        del self._versions[self._position + 1:]
+        self._versions.append(_version)
+        if self._max_versions is not None and len(self._versions) > self._max_versions:
+            del self._versions[:len(self._versions) - self._max_versions]
+        self._position = len(self._versions) - 1
+        return _version
+
+    # EDITS, EACH CREATES NEW VERSION #
+    def insert(self, index: int, block: BlockInterface) -> Version:
+        _current = self.current
+        _root = _insert(_current._root, _index(_current._root, index, _inserting=True), block)
+        return self._commit(Version(_current._surface, _root))
+
+    def append(self, block: BlockInterface) -> Version:
+        return self.insert(len(self.current), block)
+
+    def remove(self, index: int) -> Version:
+        _current = self.current
+        _root = _remove(_current._root, _index(_current._root, index))
+        return self._commit(Version(_current._surface, _root))
+
+    def replace(self, index: int, block: BlockInterface) -> Version:
+        _current = self.current
+        _root = _set(_current._root, _index(_current._root, index), block)
+        return self._commit(Version(_current._surface, _root))
+
+    def update(self, index: int, **properties) -> Version:
+        """
+        Set properties of a block, e.g. update(0, text=Text(...)). The block is copied shallowly, the copy shares
+        all its children with the block of the previous version, and its setters validate the values.
+        :param index: Index of the block.
+        :param properties: Property names and their new values.
+        :return: New version.
+        """
+        _current = self.current
+        _i = _index(_current._root, index)
+        _block = copy(_get(_current._root, _i))
+        for _name, _value in properties.items():
+            setattr(_block, _name, _value)
+        return self._commit(Version(_current._surface, _set(_current._root, _i, _block)))
+
+    def update_surface(self, **properties) -> Version:
+        """
+        Set properties of the surface itself, e.g. update_surface(title=Text(...)).
+        :param properties: Property names and their new values.
+        :return: New version.
+        """
+        _current = self.current
+        _surface = copy(_current._surface)
+        for _name, _value in properties.items():
+            setattr(_surface, _name, _value)
+        return self._commit(Version(_surface, _current._root))
@@ -0,0 +1,54 @@
+"""
+Public namespace of BlockAPI. Every class and constant is available directly from the package, e.g.
+
+    from BlockAPI import Text, SectionBlock, MRKDWN
+
+Modules are imported lazily on the first access of one of their names, so a handler using only a few blocks does
+not pay for importing all the block elements and surfaces.
+"""
+import importlib
+
+_EXPORTS = {
+    "BlockAPI.utils": ("PLAIN_TEXT", "MRKDWN", "DEFAULT", "DANGER", "PRIMARY"),
+    "BlockAPI.BlockInterface": ("BlockInterface", "Change", "build_many"),
+    "BlockAPI.CompositionObjects": ("Text", "ConfirmationDialog", "Option", "OptionGroups", "ConversationFilters",
+                                    "DispatchActionConfig", "OptionCatalog"),
+    "BlockAPI.BlockElements": ("Button", "CheckBoxGroup", "DatePicker", "DateTimePicker", "EmailInput", "Image",
+                               "StaticOptions", "ExternalDataOptions", "UserListOptions", "ConversationOptions",
+                               "PublicChannelOptions", "OverFlowMenu", "NumberInput", "PlainTextInput",
+                               "RadioButtonGroup", "TimePicker", "UrlInput"),
+    "BlockAPI.Blocks": ("ActionBlock", "ContextBlock", "DividerBlock", "FileBlock", "HeaderBlock", "ImageBlock",
+                        "InputBlock", "SectionBlock", "VideoBlock", "RawBlock"),
+    "BlockAPI.Surfaces": ("HomeSurface", "MessageSurface", "ModalSurface"),
+    "BlockAPI.Budget": ("PayloadBudget", "TRIM_FIELDS", "SHORTEN_TEXT", "COLLAPSE_CONTEXT", "DROP_BLOCKS",
+                        "ALL_STRATEGIES"),
+    "BlockAPI.OptionSearch": ("OptionIndex",),
+    "BlockAPI.Templates": ("TemplateStore",),
+    "BlockAPI.Localization": ("Catalog", "LocalizedTemplate"),
+    "BlockAPI.Router": ("InteractionRouter",),
+    "BlockAPI.State": ("StateExtractor",),
+    "BlockAPI.Frozen": ("Frozen",),
+    "BlockAPI.Versions": ("SurfaceVersions", "Version"),
+    "BlockAPI.AsyncBuild": ("Slot",),
+    "BlockAPI.Publish": ("PublishScheduler", "PublishError", "http_sender", "VIEWS_PUBLISH", "VIEWS_UPDATE"),
+    "BlockAPI.FakeSlack": ("FakeSlackAPI",),
+    "BlockAPI.Transport": ("HTTPTransport",),
+}
+
+_MODULES = {_name: _module for _module, _names in _EXPORTS.items() for _name in _names}
+
+__all__ = list(_MODULES)
+
+
+def __getattr__(name: str):
+    _module = _MODULES.get(name)
+    if _module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    _value = getattr(importlib.import_module(_module), name)
+    globals()[name] = _value  # Later accesses do not go through __getattr__
+    return _value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,88 @@
+import asyncio
+import json
+import unittest
+
+from BlockAPI.AsyncBuild import Slot
+
+from BlockAPI.Surfaces import *
+
+
+class AsyncBuildTestCase(unittest.IsolatedAsyncioTestCase):
+    @staticmethod
+    async def _later(_value, _delay=0.01):
+        await asyncio.sleep(_delay)
+        return _value
+
+    @staticmethod
+    async def _generate(_n):
+        for _i in range(_n):
+            await asyncio.sleep(0)
+            yield DividerBlock(block_id=f"divider-{_i}")
+
+    def _section(self, _text):
+        return SectionBlock(text=Text(type=MRKDWN, text=_text))
+
+    async def test_add_async(self):
+        _s = HomeSurface([HeaderBlock(Text(type=PLAIN_TEXT, text="Header"))])
+        _teams = [Option(Text(type=PLAIN_TEXT, text="Core"), "core")]
+        await _s.add_async([
+            self._later(self._section("first"), 0.02),
+            Slot(self._later(_teams),
+                 build=lambda _o: ActionBlock([StaticOptions("static_select", "team", options=_o)])),
+            self._generate(2),
+            self._section("last"),
+        ])
+        self.assertEqual([type(_b) for _b in _s.blocks],
+                         [HeaderBlock, SectionBlock, ActionBlock, DividerBlock, DividerBlock, SectionBlock])
+        self.assertEqual(_s.blocks[1].text.text, "first")
+        self.assertEqual(_s.encoded_size, len(_s.to_json()))
+
+    async def test_timeout(self):
+        _s = MessageSurface()
+        await _s.add_async([Slot(self._later(self._section("slow"), 1), fallback=self._section("fallback")),
+                            Slot(self._later(self._section("fast"), 0), timeout=1),
+                            self._later(self._section("dropped"), 1)], timeout=0.05)
+        self.assertEqual([_b.text.text for _b in _s.blocks], ["fallback", "fast"])
+
+        async def _fail():
+            raise KeyError("foo")
+
+        with self.assertRaises(KeyError):
+            await _s.add_async([_fail()])
+        self.assertRaises(ValueError, Slot, self._section("foo"))
+
+    async def test_timeout_close(self):
+        class _Stream:
+            # Async iterator not cancelled itself when the slot times out, only the item being awaited is
+            def __init__(self):
+                self.closed = False
+
+            def __aiter__(self):
+                return self
+
+            async def __anext__(self):
+                await asyncio.sleep(1)
+                return DividerBlock()
+
+            async def aclose(self):
+                self.closed = True
+
+        _stream = _Stream()
+        _generator = self._generate(10 ** 6)
+        _s = MessageSurface()
+        await _s.add_async([Slot(_stream, timeout=0.01), Slot(_generator, timeout=0.01)])
+        self.assertEqual(_s.blocks, [])
+        self.assertTrue(_stream.closed)
+        self.assertIsNone(_generator.ag_frame, "Generator should be closed.")
+
+    async def test_to_json_async(self):
+        _s = ModalSurface(Text(type=PLAIN_TEXT, text="Title"), Text(type=PLAIN_TEXT, text="Close"),
+                          [self._section("foo")])
+        _json = _s.to_json()
+        _payload = await _s.to_json_async([self._later(self._section("bar"))])
+        self.assertEqual(_s.to_json(), _json, "Surface should not be modified.")
+        self.assertEqual([_b["text"]["text"] for _b in json.loads(_payload)["blocks"]], ["foo", "bar"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,28 @@
+import os
+import subprocess
+import sys
+import unittest
+
+import BlockAPI
+
+from BlockAPI.Surfaces import *
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # Directory holding the package
+
+
+class PackageTestCase(unittest.TestCase):
+    def test_exports(self):
+        for _name in BlockAPI.__all__:
+            self.assertIsNotNone(getattr(BlockAPI, _name))
+        self.assertIs(BlockAPI.HomeSurface, HomeSurface)
+        self.assertRaises(AttributeError, getattr, BlockAPI, "Foo")
+
+    def test_lazy(self):
+        _code = "import sys; from BlockAPI import Text, SectionBlock; print('BlockAPI.BlockElements' in sys.modules)"
+        _out = subprocess.run([sys.executable, "-c", _code], capture_output=True, text=True, check=True,
+                              cwd=_ROOT)
+        self.assertEqual(_out.stdout.strip(), "False", "Blocks should not import all block elements.")
+
+
+if __name__ == '__main__':
+    unittest.main()
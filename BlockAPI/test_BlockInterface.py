@@ -0,0 +1,227 @@
+import json
+import pickle
+import unittest
+from copy import copy, deepcopy
+from weakref import ref
+
+import BlockAPI
+
+from BlockAPI.Surfaces import *
+
+
+class ToJsonTestCase(unittest.TestCase):
+    def setUp(self):
+        self._raw = RawBlock(b'{"type": "divider", "block_id": "raw"}')
+        self._s = HomeSurface([SectionBlock(text=Text(type=MRKDWN, text="fö\"o")), self._raw])
+
+    def test_to_json(self):
+        _json = self._s.to_json()
+        self.assertEqual(json.loads(_json), self._s.build())
+        self.assertIn(b'{"type": "divider", "block_id": "raw"}', _json, "Raw blocks should be copied verbatim.")
+
+
+class EncodedSizeTestCase(unittest.TestCase):
+    def setUp(self):
+        self._text = Text(type=PLAIN_TEXT, text="foo")
+        self._s = HomeSurface([HeaderBlock(self._text), DividerBlock()])
+
+    def assertSize(self, _surface):
+        self.assertEqual(_surface.encoded_size, len(_surface.to_json()))
+
+    def test_setters(self):
+        self.assertSize(self._s)
+        self._text.text = "é \"quoted\" \\ \n"
+        self.assertSize(self._s)
+        self._text.type = MRKDWN
+        self.assertSize(self._s)
+        self._s.blocks[1].block_id = "foo"
+        self.assertSize(self._s)
+
+    def test_add(self):
+        self.assertSize(self._s)
+        self._s.add(SectionBlock(text=self._text))
+        self.assertSize(self._s)
+        self._s.add_after(RawBlock(b'{"type":"divider"}'), HeaderBlock)
+        self.assertSize(self._s)
+        self._s.add_before(SectionBlock(text=Text(type=MRKDWN, text="bar")), DividerBlock, -1)
+        self.assertSize(self._s)
+
+    def test_shared(self):
+        _other = MessageSurface([HeaderBlock(self._text)])
+        self.assertSize(self._s)
+        self.assertSize(_other)
+        self._text.text = "foo bar"
+        self.assertSize(self._s)
+        self.assertSize(_other)
+
+    def test_copy(self):
+        self.assertSize(self._s)
+        _copy = self._s.copy()
+        _copy.blocks[0].text.text = "bar"
+        self.assertSize(_copy)
+        self.assertSize(self._s)
+
+    def test_reused_id(self):
+        # The parent link of a collected parent is left behind, a new parent may get the same id
+        _header = self._s.blocks[0]
+        self.assertSize(MessageSurface([_header]))
+        _dead = ref(DividerBlock())
+        self.assertIsNone(_dead())
+        _header._parents[id(self._s)] = _dead
+        self.assertSize(self._s)
+        self._text.text = "foo bar"
+        self.assertSize(self._s)
+
+
+class PickleTestCase(unittest.TestCase):
+    def setUp(self):
+        self._text = Text(type=MRKDWN, text="foo", emoji=False)
+        self._catalog = OptionCatalog([Option(Text(type=PLAIN_TEXT, text="a"), "a")])
+        self._s = ModalSurface(Text(type=PLAIN_TEXT, text="Title"), Text(type=PLAIN_TEXT, text="Close"), [
+            SectionBlock(text=self._text),
+            ActionBlock([StaticOptions("static_select", "pick", options=self._catalog)]),
+            RawBlock(b'{"type":"divider"}')
+        ])
+
+    def test_round_trip(self):
+        self._s.encoded_size
+        _copy = pickle.loads(pickle.dumps(self._s))
+        self.assertIsNone(_copy.blocks[1].elements[0].options._raw, "Caches should not be pickled.")
+        self.assertEqual(_copy.to_json(), self._s.to_json())
+        self.assertEqual(_copy.encoded_size, self._s.encoded_size)
+        self.assertIs(_copy.blocks, _copy._body["blocks"])
+        self.assertFalse(_copy.blocks[0].text.emoji, "Attributes not in the body should be kept.")
+
+    def test_original_unchanged(self):
+        self.assertEqual(self._s.encoded_size, len(self._s.to_json()))
+        pickle.dumps(self._s)
+        deepcopy(self._s)
+        self._text.text = "foo bar"
+        self.assertEqual(self._s.encoded_size, len(self._s.to_json()), "Pickling should keep the cached sizes.")
+
+    def test_compact(self):
+        _copy = deepcopy(self._s)
+        _copy.blocks[0].text.text = "bar"
+        self.assertEqual(self._s.blocks[0].text.text, "foo")
+        self.assertEqual(_copy.blocks[0].text.get_actual_value("text"), "bar")
+        # Attributes holding the body values are restored from the body, emoji is not in the body of mrkdwn text
+        _layout = self._text._reduce_state()[0]
+        self.assertEqual(_layout[1], ("_type", "_text", "_verbatim"))
+        self.assertEqual(_layout[3], ("_emoji",))
+
+    def test_legacy_state(self):
+        _text = Text.__new__(Text)
+        _text.__setstate__({"_body": {"type": PLAIN_TEXT, "text": "foo"}, "_type": PLAIN_TEXT, "_text": "foo"})
+        self.assertEqual(_text.text, "foo")
+
+
+def _probe(_value, _path=()):
+    # Reference walk looking into every value of the bodies
+    if isinstance(_value, BlockInterface):
+        yield _path, _value
+        for _key, _v in _value._body.items():
+            yield from _probe(_v, _path + (_key,))
+    elif isinstance(_value, (list, tuple)):
+        for _i, _v in enumerate(_value):
+            yield from _probe(_v, _path + (_i,))
+
+
+class WalkTestCase(unittest.TestCase):
+    def setUp(self):
+        _t = lambda _text: Text(type=PLAIN_TEXT, text=_text)
+        _options = [Option(_t(_v), _v, description=_t(f"About {_v}")) for _v in ("a", "b")]
+        _confirm = ConfirmationDialog(_t("Sure?"), _t("Really"), _t("Yes"), _t("No"))
+        self._s = ModalSurface(_t("Title"), _t("Close"), [
+            SectionBlock(text=_t("Section"), fields=[_t("f1"), _t("f2")],
+                         accessory=OverFlowMenu("more", _options, confirm=_confirm)),
+            InputBlock(_t("Group"), StaticOptions("static_select", "group", placeholder=_t("Pick"),
+                                                  option_groups=[OptionGroups(_t("G"), _options)]), hint=_t("Hint")),
+            InputBlock(_t("Email"), EmailInput("email", dispatch_action_config=DispatchActionConfig(["on_enter_pressed"]))),
+            ActionBlock([Button(_t("Go"), "go", confirm=_confirm),
+                         RadioButtonGroup("radio", _options, init_option=_options[0]),
+                         ConversationOptions("conversations_select", "conv", filter=ConversationFilters(["im"])),
+                         CheckBoxGroup("labels", OptionCatalog(_options))]),
+            ContextBlock([Image("https://example.com/a.png", "a"), _t("Context")]),
+            ImageBlock("https://example.com/b.png", "b", title=_t("Image")),
+        ], submit=_t("Submit"))
+
+    def test_child_keys(self):
+        # Declared child keys cover every object of the tree
+        self.assertEqual(sorted(_p for _p, _ in self._s.walk()), sorted(_p for _p, _ in _probe(self._s)))
+        self.assertEqual([_p for _p, _ in self._s.walk()][:4], [(), ("title",), ("close",), ("submit",)])
+
+    def test_filter_and_prune(self):
+        _ids = [_n.action_id for _, _n in self._s.walk((Button, OverFlowMenu, RadioButtonGroup))]
+        self.assertEqual(_ids, ["more", "go", "radio"])
+        _path, _node = next(self._s.walk(ConversationFilters))
+        self.assertEqual(_path, ("blocks", 3, "elements", 2, "filter"))
+        self.assertIs(_node, self._s.blocks[3].elements[2].filter)
+
+        _pruned = list(self._s.walk(Option, prune=lambda _p, _n: isinstance(_n, (ActionBlock, OptionCatalog))))
+        self.assertEqual(len(_pruned), 4)
+
+
+class ObserveTestCase(unittest.TestCase):
+    def test_changes(self):
+        _t = lambda _text: Text(type=PLAIN_TEXT, text=_text)
+        _button = Button(_t("Approve"), "approve")
+        _s = HomeSurface([SectionBlock(text=_t("Section")), ActionBlock([_button])])
+        _size = _s.encoded_size
+        _changes = []
+        _s.observe(_changes.append)
+
+        _button.style = PRIMARY
+        _change, = _changes
+        self.assertEqual(_change.path, ("blocks", 1, "elements", 0))
+        self.assertIs(_change.node, _button)
+        self.assertEqual((_change.key, _change.old, _change.new), ("style", None, PRIMARY))
+        self.assertEqual(_s.encoded_size, len(_s.to_json()))
+        self.assertNotEqual(_s.encoded_size, _size)
+
+        # Objects placed after observe() are tracked as well, objects removed are no longer reported
+        _text = _t("Other")
+        _section = _s.blocks[0]
+        _old = _section.text
+        _section.text = _text
+        self.assertEqual(_changes[-1].path, ("blocks", 0))
+        self.assertIs(_changes[-1].old, _old)
+        _text.text = "Changed"
+        self.assertEqual(_changes[-1].path, ("blocks", 0, "text"))
+        _count = len(_changes)
+        _old.text = "Detached"
+        self.assertEqual(len(_changes), _count)
+
+        _s.add(DividerBlock())
+        self.assertEqual((_changes[-1].path, _changes[-1].key), ((), "blocks"))
+        self.assertIs(_changes[-1].old, _changes[-1].new)
+
+        self.assertIsNone(copy(_s)._observers)
+        _s.unobserve(_changes.append)
+        _button.style = DANGER
+        self.assertEqual(len(_changes), _count + 1)
+        self.assertRaises(ValueError, _s.unobserve, _changes.append)
+
+
+class BuildManyTestCase(unittest.TestCase):
+    def test_shared(self):
+        _t = lambda _text: Text(type=PLAIN_TEXT, text=_text)
+        _header = HeaderBlock(_t("Weekly report"))
+        _select = StaticOptions("static_select", "team", options=[Option(_t("Core"), "core")])
+        _raw = RawBlock({"type": "divider"})
+        _surfaces = [MessageSurface([_header, ActionBlock([_select]), _raw]),
+                     ModalSurface(_t("Report"), _t("Close"), [_header, InputBlock(_t("Team"), _select)]),
+                     HomeSurface([_header, _header, _raw])]
+
+        _built = BlockAPI.build_many(_surfaces)
+        self.assertEqual(_built, [_s.build() for _s in _surfaces])
+        self.assertEqual([json.dumps(_b, separators=(",", ":")).encode() for _b in _built],
+                         [_s.to_json() for _s in _surfaces])
+        # Shared objects are built once, within one surface and across the surfaces
+        self.assertIs(_built[2]["blocks"][0], _built[2]["blocks"][1])
+        self.assertIs(_built[0]["blocks"][0], _built[1]["blocks"][0])
+        self.assertIs(_built[0]["blocks"][1]["elements"][0], _built[1]["blocks"][1]["element"])
+        self.assertEqual(BlockAPI.build_many([]), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
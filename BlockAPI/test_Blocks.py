@@ -0,0 +1,49 @@
+import json
+import math
+import unittest
+
+from BlockAPI.Surfaces import *
+
+
+class RawBlockTestCase(unittest.TestCase):
+    def test_validation(self):
+        self.assertRaises(ValueError, RawBlock, b"[]")
+        self.assertRaises(ValueError, RawBlock, b'{"block_id": "raw"}')
+        self.assertRaises(ValueError, RawBlock, "{")
+        self.assertRaises(ValueError, RawBlock, {"type": "divider", "block_id": ""})
+
+    def test_encodings(self):
+        _json = '{"type": "header", "text": {"type": "plain_text", "text": "été"}}'
+        self.assertEqual(RawBlock(_json).raw, _json.encode())
+        self.assertEqual(RawBlock(bytearray(_json.encode())).raw, _json.encode())
+        # Valid for json.loads(), but the bytes would be copied into the UTF-8 payload as they are
+        self.assertRaises(ValueError, RawBlock, b"\xef\xbb\xbf" + _json.encode())
+        self.assertRaises(ValueError, RawBlock, "\ufeff" + _json)
+        for _encoding in ("utf-16", "utf-16-le", "utf-32"):
+            self.assertRaises(ValueError, RawBlock, _json.encode(_encoding))
+        _surrogate = '{"type": "divider", "block_id": "\ud800"}'
+        self.assertRaises(ValueError, RawBlock, _surrogate)
+        self.assertRaises(ValueError, RawBlock, _surrogate.encode("utf-8", "surrogatepass"))
+
+    def test_constants(self):
+        for _constant in ("NaN", "Infinity", "-Infinity"):
+            self.assertRaises(ValueError, RawBlock, '{"type": "divider", "n": %s}' % _constant)
+        self.assertRaises(ValueError, RawBlock, {"type": "divider", "n": math.nan})
+        self.assertRaises(ValueError, RawBlock, {"type": "divider", "n": math.inf})
+
+    def test_dict(self):
+        _block = {"type": "context", "elements": [{"type": "mrkdwn", "text": "é"}]}
+        _raw = RawBlock(_block)
+        _block["elements"][0]["text"] = "foo"
+        self.assertEqual(_raw.raw, '{"type":"context","elements":[{"type":"mrkdwn","text":"é"}]}'.encode())
+        self.assertEqual(_raw.build(), json.loads(_raw.raw), "Raw block should copy the dictionary.")
+        self.assertIs(_raw.build(), _raw._body)
+        self.assertEqual(RawBlock({"type": "divider"}).raw, b'{"type":"divider"}')
+
+        _s = HomeSurface([_raw])
+        self.assertEqual(json.loads(_s.to_json()), _s.build())
+        self.assertEqual(_s.encoded_size, len(_s.to_json()))
+
+
+if __name__ == '__main__':
+    unittest.main()
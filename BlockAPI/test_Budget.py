@@ -0,0 +1,75 @@
+import json
+import unittest
+
+from BlockAPI.Budget import _shorten
+
+from BlockAPI.Surfaces import *
+
+
+class BudgetTestCase(unittest.TestCase):
+    def setUp(self):
+        self._s = MessageSurface([
+            HeaderBlock(Text(type=PLAIN_TEXT, text="Header")),
+            SectionBlock(text=Text(type=MRKDWN, text="x" * 500),
+                         fields=[Text(type=MRKDWN, text=f"field {_i}") for _i in range(10)]),
+            ContextBlock([Text(type=MRKDWN, text="foo"), Text(type=MRKDWN, text="bar")]),
+            DividerBlock()
+        ])
+        self._json = self._s.to_json()
+
+    def assertFits(self, _payload, _budget):
+        self.assertLessEqual(len(_payload), _budget.max_bytes)
+        self.assertEqual(self._s.to_json(), self._json, "Surface should not be modified.")
+        return json.loads(_payload)
+
+    def test_no_limits(self):
+        self.assertEqual(self._s.build_within(PayloadBudget()), self._json)
+
+    def test_strategies(self):
+        _budget = PayloadBudget(max_bytes=len(self._json) - 60, strategies=(TRIM_FIELDS,))
+        _payload = self.assertFits(self._s.build_within(_budget), _budget)
+        self.assertEqual(len(_payload["blocks"][1]["fields"]), 8)
+
+        _budget = PayloadBudget(max_bytes=len(self._json) - 200, strategies=(SHORTEN_TEXT,))
+        _payload = self.assertFits(self._s.build_within(_budget), _budget)
+        self.assertTrue(_payload["blocks"][1]["text"]["text"].endswith("…"))
+
+        _budget = PayloadBudget(max_bytes=len(self._json) - 10, strategies=(COLLAPSE_CONTEXT,))
+        _payload = self.assertFits(self._s.build_within(_budget), _budget)
+        self.assertEqual(_payload["blocks"][2]["elements"][0]["text"], "foo | bar")
+
+        _budget = PayloadBudget(max_bytes=len(self._json) - 10, strategies=(DROP_BLOCKS,))
+        self.assertEqual(len(json.loads(self._s.build_within(_budget))["blocks"]), 3)
+
+        self.assertRaises(ValueError, self._s.build_within, PayloadBudget(max_bytes=100, strategies=(TRIM_FIELDS,)))
+
+    def test_priority(self):
+        _budget = PayloadBudget(max_blocks=2)
+        _payload = self._s.build_within(_budget, priority=lambda _b: 0 if isinstance(_b, HeaderBlock) else 1)
+        _payload = json.loads(_payload)
+        self.assertEqual([_b["type"] for _b in _payload["blocks"]], ["section", "context"])
+
+    def test_encoding(self):
+        # The limit holds for the bytes sent: non-ASCII texts, escapes and raw blocks with whitespace are measured
+        # as they are encoded, a degraded raw block is encoded compactly
+        _raw = RawBlock(b'{ "type": "context",\n  "elements": [{"type": "mrkdwn", "text": "\xc3\xa9t\xc3\xa9"}, '
+                        b'{"type": "mrkdwn", "text": "\\u00e9"}] }')
+        self._s = MessageSurface([SectionBlock(text=Text(type=MRKDWN, text="é\"\n" * 100)), _raw, DividerBlock()])
+        self._json = self._s.to_json()
+        self.assertIn(_raw.raw, self._s.build_within(PayloadBudget(max_bytes=len(self._json))))
+        for _excess in range(1, 400, 7):
+            _budget = PayloadBudget(max_bytes=len(self._json) - _excess, strategies=(COLLAPSE_CONTEXT, SHORTEN_TEXT))
+            _payload = self.assertFits(self._s.build_within(_budget), _budget)
+            self.assertEqual(len(_payload["blocks"]), 3)
+
+    def test_min_text_length(self):
+        # Texts clamped to the minimum length are shortened only if they get shorter in bytes
+        _budget = PayloadBudget()
+        self.assertIsNone(_shorten({"type": MRKDWN, "text": "x" * 11}, 1, _budget))
+        self.assertIsNone(_shorten({"type": MRKDWN, "text": "x" * 12}, 1, _budget))
+        self.assertEqual(_shorten({"type": MRKDWN, "text": "x" * 14}, 1, _budget)["text"], "x" * 10 + "…")
+        self.assertEqual(_shorten({"type": MRKDWN, "text": "é" * 11}, 1, _budget)["text"], "é" * 9 + "…")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,16 @@
 import unittest
+from unittest import mock
 
-from BlockAPI.CompositionObjects import Text, ConfirmationDialog, Option, OptionGroups, ConversationFilters, DispatchActionConfig
+from BlockAPI.BlockElements import StaticOptions
+from BlockAPI.CompositionObjects import Text, ConfirmationDialog, Option, OptionGroups, ConversationFilters, DispatchActionConfig, \
+    OptionCatalog
 from BlockAPI.utils import PLAIN_TEXT, MRKDWN, DEFAULT, PRIMARY, DANGER
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 class TextTestCase(unittest.TestCase):
     def test_type(self):
@@ -252,6 +260,25 @@ class OptionTestCase(unittest.TestCase):
         else:
             assert False
 
+    def test_bulk(self):
+        _options = Option.bulk(["foo", "bar"], ["foo", "bar"], [None, "baz"])
+        self.assertEqual(_options[0], self._o)
+        self.assertEqual(_options[1], Option(Text(type=PLAIN_TEXT, text="bar"), "bar", Text(type=PLAIN_TEXT, text="baz")))
+        self.assertEqual(_options[1].description.text, "baz")
+
+        self.assertRaises(ValueError, Option.bulk, ["foo"], ["foo", "bar"])
+        with self.assertRaises(ValueError) as _e:
+            Option.bulk(["foo", "", "bar", "f" * 76], ["foo", "bar", None, "baz"])
+        self.assertIn("[1, 2, 3]", str(_e.exception))
+        self.assertEqual(Option.bulk(["foo", ""], ["foo", "bar"], skip_invalid=True), [self._o])
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed.")
+    def test_bulk_numpy(self):
+        _texts = numpy.array(["foo", "", "bar"])
+        _options = Option.bulk(_texts, numpy.array(["foo", "bar", "baz"]), skip_invalid=True)
+        self.assertEqual([_o.value for _o in _options], ["foo", "baz"])
+        self.assertIs(type(_options[0].value), str)
+
 
 class OptionGroupTestCase(unittest.TestCase):
     def setUp(self):
@@ -338,6 +365,63 @@ class DispatchActionConfigTestCase(unittest.TestCase):
         self.assertRaises(ValueError, DispatchActionConfig, _config)
 
 
+class OptionCatalogTestCase(unittest.TestCase):
+    def setUp(self):
+        self._options = [Option(Text(type=PLAIN_TEXT, text=f"foo{_i}"), f"foo{_i}") for _i in range(10)]
+        self._c = OptionCatalog(self._options)
+
+    def test_options(self):
+        self.assertRaises(ValueError, OptionCatalog)
+        self.assertRaises(ValueError, OptionCatalog, [])
+        self.assertRaises(ValueError, OptionCatalog, [self._options[0]] * 101)
+        self.assertRaises(ValueError, OptionCatalog, self._options,
+                          [OptionGroups(Text(type=PLAIN_TEXT, text="foo"), self._options)])
+
+        self.assertEqual(len(self._c), 10)
+        self.assertIn(self._options[3], self._c)
+        self.assertNotIn(Option(Text(type=PLAIN_TEXT, text="bar"), "foo3"), self._c)
+        self.assertFalse(self._c.has_url)
+        self.assertTrue(OptionCatalog([Option(Text(type=PLAIN_TEXT, text="foo"), "foo", url="foo")]).has_url)
+
+    def test_immutable(self):
+        self._options[0].value = "bar"
+        self.assertEqual(self._c.options[0].value, "foo0", "Catalog should not be affected by changes of the input.")
+
+        _json = self._c.to_json()
+        self._c[1].value = "bar"
+        self._c.options[2].text.text = "bar"
+        self._c.get("foo3").value = "bar"
+        next(iter(self._c)).value = "bar"
+        self.assertIsNotNone(self._c.get("foo3"))
+        self.assertEqual(OptionCatalog(self._c.options).to_json(), _json, "Catalog should hand out copies.")
+        _groups = OptionCatalog(option_groups=[OptionGroups(Text(type=PLAIN_TEXT, text="foo"), self._options)])
+        _groups.option_groups[0].options[1].value = "baz"
+        self.assertEqual(_groups.get("foo1").value, "foo1")
+
+    def test_init_options(self):
+        _t = lambda _text: Text(type=PLAIN_TEXT, text=_text)
+        _groups = OptionCatalog(option_groups=[OptionGroups(_t("first"), self._options[:5]),
+                                               OptionGroups(_t("second"), self._options[5:]),
+                                               OptionGroups(_t("shared"), self._options[4:6])])
+        # Initial options are looked up in the index of the catalog, the groups are not copied
+        with mock.patch.object(OptionCatalog, "__iter__", side_effect=AssertionError):
+            _e = StaticOptions("multi_static_select", "foo", option_groups=_groups,
+                               init_options=self._options[1:3], max_selected_items=2)
+            _e.init_options = [self._options[7]]
+            self.assertRaises(ValueError, StaticOptions, "static_select", "foo", option_groups=_groups,
+                              init_options=[self._options[3], self._options[7]])
+            self.assertRaises(ValueError, StaticOptions, "static_select", "foo", option_groups=_groups,
+                              init_options=[self._options[4]])
+            self.assertRaises(ValueError, StaticOptions, "static_select", "foo", option_groups=_groups,
+                              init_options=[Option(_t("bar"), "foo1")])
+            _e.option_groups = OptionCatalog(option_groups=[OptionGroups(_t("first"), self._options[6:])])
+
+    def test_build(self):
+        _fragment = self._c.build()
+        self.assertIs(self._c.build(), _fragment, "Catalog should be serialized only once.")
+        self.assertEqual(_fragment[0], {"text": {"type": PLAIN_TEXT, "text": "foo0", "emoji": True}, "value": "foo0"})
+
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -0,0 +1,45 @@
+import json
+import pickle
+import unittest
+
+from BlockAPI.Surfaces import *
+
+
+class FrozenTestCase(unittest.TestCase):
+    def setUp(self):
+        self._text = Text(type=MRKDWN, text="foo")
+        self._s = HomeSurface([SectionBlock(text=self._text), DividerBlock()])
+        self._frozen = self._s.freeze()
+
+    def test_immutable(self):
+        _json = self._s.to_json()
+        self._text.text = "bar"
+        self.assertEqual(self._frozen.to_json(), _json, "Changes of the original should not affect the snapshot.")
+        self.assertRaises(AttributeError, setattr, self._frozen, "_json", b"{}")
+        self._frozen.build()["blocks"].clear()
+        self.assertEqual(self._frozen.build(), json.loads(_json))
+        self.assertEqual(self._frozen.encoded_size, len(_json))
+
+    def test_hash(self):
+        self.assertEqual(self._frozen, self._s.freeze())
+        self.assertEqual(len({self._frozen, self._s.freeze(), pickle.loads(pickle.dumps(self._frozen))}), 1)
+        self._text.text = "bar"
+        self.assertNotEqual(self._frozen, self._s.freeze())
+
+    def test_thaw(self):
+        _a, _b = self._frozen.thaw(), self._frozen.thaw()
+        self.assertIsInstance(_a, HomeSurface)
+        _a.blocks[0].text.text = "bar"
+        self.assertEqual(_b.to_json(), self._frozen.to_json(), "Thawed copies should be independent.")
+        self.assertEqual(_a.encoded_size, len(_a.to_json()))
+
+    def test_class_body(self):
+        _placeholder = Text(type=PLAIN_TEXT, text="Pick")
+        _select = PublicChannelOptions("channels_select", "channel", placeholder=_placeholder, init_channels=["C1"])
+        self.assertEqual(_select.build()["initial_channel"], "C1")
+        self.assertIn("placeholder", _select.build())
+        self.assertEqual(dict(BlockInterface._body), {}, "Constructors should not write into the class body.")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import importlib
+import sys
+import unittest
+
+from BlockAPI import Instrumentation, utils
+from BlockAPI import Blocks, CompositionObjects
+
+from BlockAPI.Surfaces import *
+
+
+class InstrumentationTestCase(unittest.TestCase):
+    def setUp(self):
+        Instrumentation.reset()
+
+    def tearDown(self):
+        Instrumentation.disable()
+        Instrumentation.reset()
+
+    def _home(self):
+        return HomeSurface([HeaderBlock(Text(type=PLAIN_TEXT, text="Report")),
+                            SectionBlock(text=Text(type=MRKDWN, text="*ready*"))])
+
+    def test_counters(self):
+        _observed = []
+        Instrumentation.enable(sink=lambda *_a: _observed.append(_a))
+        self.assertTrue(Instrumentation.is_enabled())
+        self._home().build()
+
+        _counters = Instrumentation.counters()
+        self.assertEqual(_counters[(Instrumentation.OBJECTS_CONSTRUCTED, (("class", "Text"),))], 2)
+        self.assertEqual(_counters[(Instrumentation.OBJECTS_CONSTRUCTED, (("class", "HomeSurface"),))], 1)
+        self.assertGreater(_counters[(Instrumentation.VALIDATION_CALLS, (("check", "check_length"),))], 0)
+        _builds = Instrumentation.histograms()[
+            (Instrumentation.BUILD_SECONDS, (("method", "build"), ("surface", "HomeSurface")))]
+        self.assertEqual(_builds.count, 1)
+        self.assertIn(("blockapi_objects_constructed_total", {"class": "Text"}, 1), _observed)
+        self.assertIn('blockapi_objects_constructed_total{class="Text"} 2', Instrumentation.to_prometheus())
+
+        # Disabled instrumentation counts nothing, the collected metrics are kept
+        Instrumentation.disable()
+        self.assertFalse(Instrumentation.is_enabled())
+        self._home().build()
+        self.assertEqual(Instrumentation.counters(), _counters)
+
+    def test_disable(self):
+        _originals = (Text.__init__, HomeSurface.build, Blocks.check_length, CompositionObjects.check_valid_type)
+        Instrumentation.enable()
+        self.assertIsNot(Blocks.check_length, _originals[2])
+        Instrumentation.disable()
+        self.assertEqual((Text.__init__, HomeSurface.build, Blocks.check_length, CompositionObjects.check_valid_type),
+                         _originals)
+
+    def test_lazy_import(self):
+        # A module imported while enabled copies the wrapped checks, they are restored as well
+        _check_length, _check_valid_type = utils.check_length, utils.check_valid_type
+        _module = sys.modules.pop("BlockAPI.OptionSearch", None)
+        try:
+            Instrumentation.enable()
+            _lazy = importlib.import_module("BlockAPI.OptionSearch")
+            self.assertIsNot(_lazy.check_length, _check_length)
+            Instrumentation.disable()
+            self.assertIs(_lazy.check_length, _check_length)
+            self.assertIs(_lazy.check_valid_type, _check_valid_type)
+        finally:
+            if _module is not None:
+                sys.modules["BlockAPI.OptionSearch"] = _module
+
+
+if __name__ == '__main__':
+    unittest.main()
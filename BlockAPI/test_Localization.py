@@ -0,0 +1,50 @@
+import unittest
+from copy import deepcopy
+
+import BlockAPI
+
+from BlockAPI.Surfaces import *
+
+
+class LocalizationTestCase(unittest.TestCase):
+    def setUp(self):
+        _t = lambda _text: Text(type=PLAIN_TEXT, text=_text)
+        _approve = _t("Approve")
+        self._s = ModalSurface(_t("Review"), _t("Cancel"), [
+            HeaderBlock(_t("Weekly report")),
+            SectionBlock(text=Text(type=MRKDWN, text="*Report* is ready"), accessory=Button(_approve, "approve")),
+            ActionBlock([Button(_approve, "approve-all"), Button(_t("Reject"), "reject")]),
+            RawBlock({"type": "header", "text": {"type": "plain_text", "text": "Approve"}}),
+            ImageBlock("https://example.com/chart.png", "Chart", title=_t("Weekly chart")),
+        ])
+        self._catalog = BlockAPI.Catalog({
+            "de": {"Review": "Prüfung", "Approve": "Genehmigen", "Weekly report": "Wochenbericht \"KW\"",
+                   "*Report* is ready": "*Bericht* ist fertig", "Weekly chart": "Wochendiagramm"},
+            "en": {},
+        })
+
+    def test_render(self):
+        _template = BlockAPI.LocalizedTemplate(self._s, self._catalog)
+        _expected = deepcopy(self._s)
+        for _, _text in _expected.walk(Text):
+            _text.text = self._catalog.translate("de", _text.text)
+        self.assertEqual(_template.render("de"), _expected.to_json())
+        self.assertIs(_template.render("de"), _template.render("de"))
+        self.assertEqual(_template.render("en"), self._s.to_json())
+        self.assertEqual(_template.missing("de"), ["Cancel", "Reject"])
+        self.assertRaises(KeyError, _template.render, "fr")
+
+    def test_validation(self):
+        # Button texts are limited to 75 characters, texts in general to 3000
+        _catalog = BlockAPI.Catalog({"de": {"Approve": "G" * 76}})
+        with self.assertRaisesRegex(ValueError, "blocks/1/accessory/text"):
+            BlockAPI.LocalizedTemplate(self._s, _catalog)
+        # Image titles to 2000
+        with self.assertRaisesRegex(ValueError, "blocks/4/title"):
+            BlockAPI.LocalizedTemplate(self._s, BlockAPI.Catalog({"de": {"Weekly chart": "W" * 2001}}))
+        self.assertRaises(ValueError, BlockAPI.Catalog, {"de": {"Review": "P" * 3001}})
+        self.assertRaises(ValueError, BlockAPI.Catalog, {"de": {"Review": ""}})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+
+from BlockAPI.CompositionObjects import Text, Option
+from BlockAPI.OptionSearch import OptionIndex
+from BlockAPI.utils import PLAIN_TEXT
+
+
+def _option(text, value):
+    return Option(Text(type=PLAIN_TEXT, text=text), value)
+
+
+class OptionIndexTestCase(unittest.TestCase):
+    def setUp(self):
+        self._index = OptionIndex([
+            _option("New York", "nyc"),
+            _option("Newark", "ewr"),
+            _option("York", "yrk"),
+            _option("Glasgow", "gla"),
+        ], group="Cities")
+
+    def test_search(self):
+        self.assertEqual([_o.value for _o in self._index.search("york")], ["yrk", "nyc"],
+                         "Text prefix match should rank above word prefix match.")
+        self.assertEqual([_o.value for _o in self._index.search("NEW")], ["nyc", "ewr"])
+        self.assertEqual([_o.value for _o in self._index.search("new yo")], ["nyc"])
+        self.assertEqual([_o.value for _o in self._index.search("gla")], ["gla"], "Values should be indexed too.")
+        self.assertEqual([_o.value for _o in self._index.search("glasow")], ["gla"], "Fuzzy match expected.")
+        self.assertEqual(self._index.search("foo"), [])
+        self.assertEqual(len(self._index.search("", limit=2)), 2)
+
+    def test_limit(self):
+        self.assertRaises(ValueError, self._index.search, "york", 0)
+        self.assertRaises(ValueError, self._index.search, "york", 101)
+        self.assertEqual(len(self._index.search("york", limit=1)), 1)
+
+    def test_updates(self):
+        self._index.add([_option("Yorkshire", "yks")])
+        self.assertEqual([_o.value for _o in self._index.search("york")], ["yrk", "yks", "nyc"])
+
+        self._index.add([_option("Old York", "yrk")])  # Same value replaces the previous entry
+        self.assertEqual(len(self._index), 5)
+        self.assertEqual([_o.value for _o in self._index.search("york")], ["yks", "nyc", "yrk"])
+
+        self._index.remove(["yrk", "foo"])
+        self.assertNotIn("yrk", self._index)
+        self.assertEqual([_o.value for _o in self._index.search("york")], ["yks", "nyc"])
+
+    def test_duplicate_values(self):
+        # The last option of the batch wins, the earlier one must not be removed from the tables it is not in yet
+        _index = OptionIndex([_option("A", "a"), _option("B", "a")])
+        self.assertEqual(len(_index), 1)
+        self.assertEqual(_index.get("a").text.text, "B")
+        self.assertEqual([_o.value for _o in _index.search("b")], ["a"])
+        self.assertEqual(_index._texts, [("b", "a")], "Replaced text should not be indexed.")
+        _index.add([_option(f"Item {_i}", "x") for _i in range(10)] + [_option("Other", "y")])
+        self.assertEqual([_o.value for _o in _index.search("item")], ["x"])
+        self.assertEqual(len(_index._texts), 3)
+
+    def test_response(self):
+        self._index.add([_option("Yorkshire", "yks")], group="Counties")
+        self.assertDictEqual(
+            d1=self._index.response("yorkshire"),
+            d2={"options": [{"text": {"type": PLAIN_TEXT, "text": "Yorkshire", "emoji": True}, "value": "yks"}]}
+        )
+
+        _groups = self._index.response("york", grouped=True)["option_groups"]
+        self.assertEqual([_og["label"]["text"] for _og in _groups], ["Cities", "Counties"])
+        self.assertEqual([_o["value"] for _o in _groups[0]["options"]], ["yrk", "nyc"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import asyncio
+import unittest
+
+from BlockAPI.FakeSlack import FakeSlackAPI
+from BlockAPI.Publish import PublishScheduler, http_sender, VIEWS_UPDATE
+
+from BlockAPI.Surfaces import *
+
+
+class PublishSchedulerTestCase(unittest.IsolatedAsyncioTestCase):
+    def _home(self, _text):
+        return HomeSurface([SectionBlock(text=Text(type=MRKDWN, text=_text))])
+
+    async def test_coalesce(self):
+        async with FakeSlackAPI(token="xoxb-test") as _api:
+            _scheduler = PublishScheduler(http_sender(_api.url, "xoxb-test"), workers=2, rate=1000)
+            async with _scheduler:
+                for _i in range(5):
+                    _scheduler.publish("U1", self._home(f"version {_i}"))
+                _scheduler.publish("V1", self._home("modal"), VIEWS_UPDATE)
+                await _scheduler.join()
+                # Equal content is not sent again
+                _scheduler.publish("U1", self._home("version 4"))
+                await _scheduler.join()
+
+        self.assertEqual(len(_api.calls), 2)
+        self.assertEqual(_api.views["U1"]["blocks"][0]["text"]["text"], "version 4")
+        self.assertEqual(sorted(_m for _m, _ in _api.calls), ["views.publish", "views.update"])
+        self.assertEqual(_scheduler.stats["coalesced"], 4)
+        self.assertEqual(_scheduler.stats["skipped"], 1)
+        self.assertRaises(ValueError, _scheduler.publish, "U1", self._home("foo"), "chat.postMessage")
+
+    async def test_retry(self):
+        _errors = []
+        async with FakeSlackAPI(rate_limit=1, period=0.05, retry_after=0.05) as _api:
+            _api.fail(500)
+            _scheduler = PublishScheduler(http_sender(_api.url, "xoxb-test"), rate=1000, backoff=0.01,
+                                          on_error=lambda *_a: _errors.append(_a))
+            async with _scheduler:
+                _scheduler.publish("U1", self._home("foo"))
+                _scheduler.publish("U2", self._home("bar"))
+                await _scheduler.join()
+
+        self.assertEqual(sorted(_api.views), ["U1", "U2"])
+        self.assertGreaterEqual(_scheduler.stats["retried"], 2)
+        self.assertGreater(_api.rate_limited, 0)
+        self.assertEqual(_errors, [])
+
+        async with FakeSlackAPI(token="xoxb-other") as _api:
+            _scheduler = PublishScheduler(http_sender(_api.url, "xoxb-test"), on_error=lambda *_a: _errors.append(_a))
+            async with _scheduler:
+                _scheduler.publish("U1", self._home("foo"))
+                await _scheduler.join()
+        self.assertEqual(_errors[0][2].error, "invalid_auth")
+        self.assertEqual(_scheduler.stats["failed"], 1)
+
+
+    async def test_close_in_flight(self):
+        async with FakeSlackAPI(latency=0.2) as _api:
+            _scheduler = PublishScheduler(http_sender(_api.url, "xoxb-test"), rate=1000)
+            _scheduler.start()
+            _scheduler.publish("U1", self._home("foo"))
+            _scheduler.publish("U2", self._home("bar"))
+            await asyncio.sleep(0.05)
+            # Surfaces being sent are pending again, unless replaced by a newer one
+            _scheduler.publish("U2", self._home("baz"))
+            await _scheduler.close()
+            self.assertEqual(_scheduler.pending, 2)
+
+            async with _scheduler:
+                await _scheduler.join()
+        self.assertEqual(_api.views["U1"]["blocks"][0]["text"]["text"], "foo")
+        self.assertEqual(_api.views["U2"]["blocks"][0]["text"]["text"], "baz")
+        self.assertEqual(_scheduler.stats["sent"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+
+from BlockAPI.Router import InteractionRouter, BLOCK
+
+from BlockAPI.Surfaces import *
+
+
+class InteractionRouterTestCase(unittest.TestCase):
+    def setUp(self):
+        self._button = Button(Text(type=PLAIN_TEXT, text="Approve"), action_id="approve-1")
+        self._block = ActionBlock([self._button], block_id="actions")
+        self._router = InteractionRouter(default=lambda _a, _p: "default")
+        self._router.route(self._button, lambda _a, _p: "button")
+        self._router.route("task-*", lambda _a, _p: "task")
+        self._router.route("task-open-*", lambda _a, _p: "open")
+        self._router.route(self._block, lambda _a, _p: "block")
+        self._router.route("input-*", lambda _a, _p: _a.get("value"), key=BLOCK)
+
+    def _actions(self, *_ids):
+        return {"type": "block_actions", "actions": [{"action_id": _a, "block_id": _b} for _a, _b in _ids]}
+
+    def test_precedence(self):
+        _payload = self._actions(("approve-1", "actions"), ("task-1", "actions"), ("task-open-1", "x"),
+                                 ("reject-1", "actions"), ("reject-1", "input-1"), ("reject-1", "x"))
+        self.assertEqual(self._router.dispatch(_payload), ["button", "task", "open", "block", None, "default"])
+
+    def test_view_submission(self):
+        _payload = {"type": "view_submission",
+                    "view": {"state": {"values": {"input-1": {"title": {"type": "plain_text_input", "value": "foo"}}}}}}
+        self.assertEqual(self._router.dispatch(_payload), ["foo"])
+        self.assertRaises(ValueError, self._router.dispatch, {"type": "shortcut"})
+
+    def test_decorator(self):
+        @self._router.route("task-1")
+        def _handler(_action, _payload):
+            return "decorated"
+
+        self.assertEqual(self._router.dispatch(self._actions(("task-1", "x"))), ["decorated"])
+        self._router.remove("task-1")
+        self.assertEqual(self._router.dispatch(self._actions(("task-1", "x"))), ["task"])
+        self.assertRaises(ValueError, self._router.route, DividerBlock(), _handler)
+        self.assertRaises(ValueError, self._router.route, "foo", _handler, key="callback_id")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+from copy import copy
+
+from BlockAPI.BlockInterface import _OBSERVED
+
+from BlockAPI.Surfaces import *
+
+
+class SelectTestCase(unittest.TestCase):
+    def setUp(self):
+        _t = lambda _text: Text(type=PLAIN_TEXT, text=_text)
+        self._approve = Button(_t("Approve"), "approve", value="42", style=PRIMARY)
+        self._s = ModalSurface(_t("Title"), _t("Close"), [
+            SectionBlock(text=_t("Section"), accessory=Button(_t("More"), "more", style=PRIMARY), block_id="intro"),
+            InputBlock(_t("Team"), StaticOptions("static_select", "team", options=[Option(_t("Core"), "core")]),
+                       block_id="team", optional=True),
+            ActionBlock([self._approve, Button(_t("Reject"), "reject", style=DANGER)], block_id="actions"),
+        ])
+
+    def test_syntax(self):
+        _s = self._s
+        self.assertEqual([_b.action_id for _b in _s.select("SectionBlock > Button[style=primary]")], ["more"])
+        self.assertEqual([_b.action_id for _b in _s.select("Button[style=primary]")], ["more", "approve"])
+        self.assertEqual(_s.select("InputBlock#team StaticOptions Option"), _s.blocks[1].element.options)
+        self.assertEqual(_s.select("ModalSurface > #actions > Button[value='42']"), [self._approve])
+        self.assertEqual(_s.select('InputBlock[optional=true] > Text[text="Team"]'), [_s.blocks[1].label])
+        self.assertEqual(_s.select("#reject, #intro"), [_s.blocks[0], _s.blocks[2].elements[1]])
+        self.assertEqual(_s.select("ActionBlock > Text"), [])
+        self.assertEqual(len(_s.select("*")), len(list(_s.walk())))
+        self.assertIs(_s.select_one("Button"), _s.blocks[0]._body["accessory"])
+        for _invalid in ("", "Button >", "> Button", "Button,,Text", "[style=primary]Button", "Nope", "Button{"):
+            self.assertRaises(ValueError, _s.select, _invalid)
+
+    def test_changes(self):
+        _s = self._s
+        self.assertEqual(len(_s.select("Button")), 3)
+        _groups = list(_s._index.groups)
+
+        self._approve.style = DANGER
+        self.assertEqual(_s.select("Button[style=danger]"), [self._approve, _s.blocks[2].elements[1]])
+        # Groups are the title, the close text and the blocks
+        self.assertIs(_s._index.groups[2], _groups[2], "Unchanged blocks should not be indexed again.")
+        self.assertIsNot(_s._index.groups[-1], _groups[-1])
+
+        _s.add(ActionBlock([Button(Text(type=PLAIN_TEXT, text="New"), "new")]))
+        _s.blocks.append(DividerBlock(block_id="divider"))
+        self.assertEqual(len(_s.select("Button")), 4)
+        self.assertEqual(len(_s.select("#divider")), 1)
+        self.assertIsNone(copy(_s)._index)
+
+    def test_drop_index(self):
+        _s = self._s
+        _s.select("Button")
+        self.assertIn(id(_s), _OBSERVED)
+        _s.drop_index()
+        self.assertIsNone(_s._index)
+        self.assertNotIn(id(_s), _OBSERVED, "Dropped index should not observe the surface.")
+        _s.drop_index()
+
+        # Changes made without the index are seen by the next query
+        self._approve.style = DANGER
+        self.assertEqual(_s.select("Button[style=danger]"), [self._approve, _s.blocks[2].elements[1]])
+        self.assertIn(id(_s), _OBSERVED)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import datetime
+import unittest
+
+from BlockAPI import Snapshot
+
+from BlockAPI.Surfaces import *
+
+
+class SnapshotTestCase(unittest.TestCase):
+    def setUp(self):
+        self._text = Text(type=MRKDWN, text="foo", emoji=False)
+        self._s = HomeSurface([
+            SectionBlock(text=self._text),
+            ContextBlock([self._text]),
+            InputBlock(Text(type=PLAIN_TEXT, text="Due"), DatePicker("due", init_date=datetime.date(2026, 1, 2))),
+            RawBlock(b'{"type":"divider"}')
+        ])
+
+    def test_objects(self):
+        _s = Snapshot.load(Snapshot.dump(self._s))
+        self.assertEqual(_s.to_json(), self._s.to_json())
+        self.assertEqual(_s, self._s)
+        self.assertIs(_s.blocks, _s._body["blocks"])
+        self.assertIs(_s.blocks[0].text, _s.blocks[1].elements[0], "Shared objects should stay shared.")
+        self.assertFalse(_s.blocks[0].text.emoji)
+        self.assertEqual(_s.blocks[2].element.init_date, datetime.date(2026, 1, 2))
+
+        _s.blocks[0].text.text = "bar"
+        self.assertEqual(_s.encoded_size, len(_s.to_json()))
+
+    def test_json(self):
+        self.assertEqual(Snapshot.load(Snapshot.dump(self._s), as_json=True), self._s.to_json())
+        _data = Snapshot.dump(self._s, include_json=False)
+        self.assertEqual(len(Snapshot.dump(self._s)) - len(_data), len(self._s.to_json()))
+        self.assertEqual(Snapshot.load(_data, as_json=True), self._s.to_json())
+
+    def test_invalid(self):
+        _data = Snapshot.dump(self._s)
+        self.assertRaises(ValueError, Snapshot.load, b"foo")
+        self.assertRaises(ValueError, Snapshot.load, b"XYZ" + _data[3:])
+        self.assertRaises(ValueError, Snapshot.load, _data[:3] + b"\xff" + _data[4:])
+
+
+if __name__ == '__main__':
+    unittest.main()
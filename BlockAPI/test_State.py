@@ -0,0 +1,110 @@
+import datetime
+import unittest
+
+from BlockAPI.State import StateExtractor
+
+from BlockAPI.Surfaces import *
+
+
+class StateTestCase(unittest.TestCase):
+    def setUp(self):
+        self._teams = [Option(Text(type=PLAIN_TEXT, text=_t), _t.lower()) for _t in ("Core", "Web")]
+        self._modal = ModalSurface(Text(type=PLAIN_TEXT, text="Task"), Text(type=PLAIN_TEXT, text="Close"), [
+            InputBlock(Text(type=PLAIN_TEXT, text="Title"), PlainTextInput("title"), block_id="title"),
+            InputBlock(Text(type=PLAIN_TEXT, text="Estimate"), NumberInput(True, "estimate")),
+            InputBlock(Text(type=PLAIN_TEXT, text="Due"), DatePicker("due"), optional=True),
+            InputBlock(Text(type=PLAIN_TEXT, text="Team"), StaticOptions("static_select", "team", options=self._teams)),
+            ActionBlock([Button(Text(type=PLAIN_TEXT, text="Help"), "help"),
+                         CheckBoxGroup("labels", OptionCatalog(self._teams))])
+        ])
+        self._extractor = StateExtractor(self._modal)
+
+    def test_extract(self):
+        _values = {
+            "title": {"title": {"type": "plain_text_input", "value": "foo"}},
+            "a1": {"estimate": {"type": "number_input", "value": "1.5"}},
+            "a2": {"due": {"type": "datepicker", "selected_date": None}},
+            "a3": {"team": {"type": "static_select", "selected_option": {
+                "text": {"type": "plain_text", "text": "Web"}, "value": "web"}}},
+            "a4": {"labels": {"type": "checkboxes", "selected_options": [
+                {"text": {"type": "plain_text", "text": "Core"}, "value": "core"}]}},
+            "a5": {"unknown": {"type": "plain_text_input", "value": "bar"}},
+        }
+        _result = self._extractor.extract(_values)
+        self.assertEqual(_result, {"title": "foo", "estimate": 1.5, "due": None, "team": self._teams[1],
+                                   "labels": [self._teams[0]]})
+        self.assertIs(_result["team"], self._teams[1], "Options of the element should be returned.")
+
+        _values["a1"]["estimate"]["value"] = "2"
+        _values["a2"]["due"]["selected_date"] = "2026-01-02"
+        _result = self._extractor.extract(_values)
+        self.assertEqual((_result["estimate"], _result["due"]), (2, datetime.date(2026, 1, 2)))
+        self.assertIsInstance(_result["estimate"], int)
+
+    def test_apply_state(self):
+        _values = {
+            "title": {"title": {"type": "plain_text_input", "value": "foo"}},
+            "a1": {"estimate": {"type": "number_input", "value": "1.5"}},
+            "a2": {"due": {"type": "datepicker", "selected_date": "2026-01-02"}},
+            "a3": {"team": {"type": "static_select", "selected_option": {
+                "text": {"type": "plain_text", "text": "Web"}, "value": "web"}}},
+            "a4": {"labels": {"type": "checkboxes", "selected_options": [
+                {"text": {"type": "plain_text", "text": "Core"}, "value": "core"}]}},
+        }
+        self.assertEqual(self._modal.encoded_size, len(self._modal.to_json()))
+        self.assertIs(self._modal.apply_state(_values), self._modal)
+        _blocks = self._modal.build()["blocks"]
+        self.assertEqual(_blocks[0]["element"]["initial_value"], "foo")
+        self.assertEqual(_blocks[1]["element"]["initial_value"], "1.5")
+        self.assertEqual(_blocks[2]["element"]["initial_date"], "2026-01-02")
+        self.assertEqual(_blocks[3]["element"]["initial_option"]["value"], "web")
+        self.assertEqual(_blocks[4]["elements"][1]["initial_options"][0]["value"], "core")
+        self.assertEqual(self._modal.blocks[2].element.init_date, datetime.date(2026, 1, 2))
+        self.assertEqual(self._modal.blocks[3].element.init_options, [self._teams[1]])
+        self.assertEqual(self._modal.encoded_size, len(self._modal.to_json()))
+        self.assertEqual(self._extractor.extract(_values)["team"], self._teams[1])
+
+        _json = self._modal.to_json()
+        _values["title"]["title"]["value"] = "bar"
+        _values["a3"]["team"]["selected_option"]["value"] = "foo"
+        self.assertRaises(ValueError, self._modal.apply_state, _values)
+        self.assertEqual(self._modal.to_json(), _json, "Invalid state should not change the surface.")
+
+        _values = {"a2": {"due": {"type": "datepicker", "selected_date": None}}}
+        self._modal.apply_state(_values)
+        self.assertNotIn("initial_date", self._modal.build()["blocks"][2]["element"])
+
+    def test_raw_blocks(self):
+        self._modal.add(RawBlock({"type": "input", "block_id": "raw", "label": {"type": "plain_text", "text": "Raw"},
+                                  "element": {"type": "plain_text_input", "action_id": "note"}}))
+        _extractor = StateExtractor(self._modal)
+        self.assertEqual(len(_extractor), 5)
+        _values = {"title": {"title": {"type": "plain_text_input", "value": "foo"}},
+                   "raw": {"note": {"type": "plain_text_input", "value": "bar"}}}
+        self.assertEqual(_extractor.extract(_values)["title"], "foo")
+        self.assertNotIn("note", _extractor.extract(_values))
+
+    def test_apply_ambiguous(self):
+        self._modal.add(InputBlock(Text(type=PLAIN_TEXT, text="Title"), PlainTextInput("title"), block_id="other"))
+        self._modal.add(RawBlock({"type": "input", "block_id": "raw", "label": {"type": "plain_text", "text": "Raw"},
+                                  "element": {"type": "plain_text_input", "action_id": "note"}}))
+        self._modal.apply_state({"other": {"title": {"type": "plain_text_input", "value": "foo"}},
+                                 "raw": {"note": {"type": "plain_text_input", "value": "bar"}},
+                                 "a1": {"estimate": {"type": "number_input", "value": "2"}}})
+        _blocks = self._modal.build()["blocks"]
+        self.assertNotIn("initial_value", _blocks[0]["element"])
+        self.assertEqual(_blocks[-2]["element"]["initial_value"], "foo")
+        self.assertEqual(self._modal.blocks[1].element.init_value, "2", "Unique action id should be found.")
+
+        _json = self._modal.to_json()
+        self.assertRaises(ValueError, self._modal.apply_state,
+                          {"a1": {"title": {"type": "plain_text_input", "value": "bar"}}})
+        self.assertEqual(self._modal.to_json(), _json)
+
+    def test_duplicate(self):
+        self._modal.add(InputBlock(Text(type=PLAIN_TEXT, text="Title"), PlainTextInput("title")))
+        self.assertRaises(ValueError, StateExtractor, self._modal)
+
+
+if __name__ == '__main__':
+    unittest.main()
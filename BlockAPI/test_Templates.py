@@ -0,0 +1,50 @@
+import os
+import tempfile
+import unittest
+
+from BlockAPI.Templates import TemplateStore
+
+from BlockAPI.Surfaces import *
+
+
+class TemplateStoreTestCase(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self._path = os.path.join(self._dir.name, "templates.bin")
+        self._home = HomeSurface([DividerBlock()])
+        TemplateStore.write(self._path, [("home", 1, self._home), ("home", 2, b'{"type":"home","blocks":[]}')])
+        self._store = TemplateStore(self._path)
+
+    def tearDown(self):
+        self._store.close()
+        self._dir.cleanup()
+
+    def test_get(self):
+        self.assertEqual(bytes(self._store.get("home", 1)), self._home.to_json())
+        self.assertEqual(bytes(self._store.get("home")), b'{"type":"home","blocks":[]}')
+        self.assertIsInstance(self._store.get("home"), memoryview)
+        self.assertEqual(self._store.versions("home"), [1, 2])
+        self.assertEqual(self._store.latest("home"), 2)
+        self.assertEqual(len(self._store), 2)
+        self.assertRaises(KeyError, self._store.get, "modal")
+        self.assertRaises(KeyError, self._store.get, "home", 3)
+
+    def test_refresh(self):
+        _view = self._store.get("home")
+        self.assertFalse(self._store.refresh())
+        TemplateStore.write(self._path, [("modal", 1, b"{}")])
+        self.assertTrue(self._store.refresh())
+        self.assertEqual(bytes(_view), b'{"type":"home","blocks":[]}', "Returned views should stay valid.")
+        self.assertEqual(self._store.names(), ["modal"])
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, TemplateStore.write, self._path, [("home", 1, b"{}"), ("home", 1, b"{}")])
+        self.assertRaises(ValueError, TemplateStore.write, self._path, [("home", -1, b"{}")])
+        self.assertEqual(bytes(self._store.get("home", 1)), self._home.to_json(), "Failed write keeps the store.")
+        with open(self._path, "wb") as _f:
+            _f.write(b"foo")
+        self.assertRaises(ValueError, TemplateStore, self._path)
+
+
+if __name__ == '__main__':
+    unittest.main()
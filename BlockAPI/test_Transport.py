@@ -0,0 +1,79 @@
+import json
+import unittest
+
+from BlockAPI.FakeSlack import FakeSlackAPI
+from BlockAPI.Publish import PublishError, http_sender
+from BlockAPI.Transport import HTTPTransport, encode
+
+from BlockAPI.Surfaces import *
+
+
+class HTTPTransportTestCase(unittest.IsolatedAsyncioTestCase):
+    def _home(self, _text):
+        return HomeSurface([SectionBlock(text=Text(type=MRKDWN, text=_text)), RawBlock(b'{"type":"divider"}')])
+
+    def test_encode(self):
+        _s = self._home("fö\"o")
+        self.assertEqual(encode(_s), _s.to_json())
+        self.assertEqual(json.loads(encode({"user_id": "U1", "view": _s})), {"user_id": "U1", "view": _s.build()})
+        self.assertEqual(encode(_s.freeze()), _s.to_json())
+
+    async def test_pool(self):
+        async with FakeSlackAPI(token="xoxb-test") as _api:
+            async with HTTPTransport(_api.url, "xoxb-test", pool_size=2, max_pipeline=4) as _transport:
+                await _transport.publish("U0", self._home("first"))
+                _responses = await _transport.call_many(
+                    [("views.publish", {"user_id": f"U{_i}", "view": self._home(str(_i))}) for _i in range(20)])
+                self.assertEqual(len(_responses), 20)
+                self.assertTrue(all(_r["ok"] for _r in _responses))
+                await _transport.post_message("C1", MessageSurface(blocks=[self._home("msg").blocks[0]]))
+
+                # Broken calls fail alone
+                _api.fail(500)
+                _results = await _transport.call_many([("views.publish", {"user_id": "U1", "view": self._home("x")}),
+                                                       ("views.open", {"view": self._home("x")})],
+                                                      return_exceptions=True)
+                self.assertTrue(_results[0].transient)
+                self.assertEqual(_results[1].error, "invalid_arguments")
+
+        self.assertLessEqual(_api.connections, 2)
+        self.assertEqual(_api.views["U7"]["blocks"][0]["text"]["text"], "7")
+        self.assertEqual(_api.messages["C1"][0]["blocks"][0]["text"]["text"], "msg")
+        self.assertEqual(_transport.stats["requests"], 24)
+
+    async def test_reconnect(self):
+        async with FakeSlackAPI() as _api:
+            _transport = HTTPTransport(_api.url, "xoxb-test", pool_size=1)
+            await _transport.publish("U1", self._home("foo"))
+            # Server restarted on the same port, the idle connection is dead
+            _port = int(_api.url.split(":")[-1].split("/")[0])
+            await _api.close()
+            await _api.start(_port)
+            await _transport.publish("U1", self._home("bar"))
+            await _transport.close()
+        self.assertEqual(_api.views["U1"]["blocks"][0]["text"]["text"], "bar")
+        self.assertEqual(_transport.stats["reconnects"], 1)
+
+    async def test_framing(self):
+        async with FakeSlackAPI(framing="chunked") as _api:
+            async with HTTPTransport(_api.url, "xoxb-test", pool_size=1, max_pipeline=4) as _transport:
+                _responses = await _transport.call_many(
+                    [("views.publish", {"user_id": f"U{_i}", "view": self._home(str(_i))}) for _i in range(5)])
+                self.assertTrue(all(_r["ok"] for _r in _responses))
+            _send = http_sender(_api.url, "xoxb-test")
+            self.assertTrue((await _send("views.publish", encode({"user_id": "U9", "view": self._home("9")})))["ok"])
+        self.assertEqual(_api.connections, 2)
+        self.assertEqual(_api.views["U4"]["blocks"][0]["text"]["text"], "4")
+
+        # Without a length the end of the body is the end of the connection, which a kept-alive one never reaches
+        async with FakeSlackAPI(framing="close") as _api:
+            _send = http_sender(_api.url, "xoxb-test")
+            self.assertTrue((await _send("views.publish", encode({"user_id": "U1", "view": self._home("1")})))["ok"])
+            async with HTTPTransport(_api.url, "xoxb-test", pool_size=1, timeout=1) as _transport:
+                with self.assertRaises(PublishError):
+                    await _transport.publish("U1", self._home("2"))
+        self.assertRaises(ValueError, FakeSlackAPI, framing="gzip")
+
+
+if __name__ == '__main__':
+    unittest.main()
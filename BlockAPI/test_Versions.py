@@ -0,0 +1,53 @@
+import unittest
+
+from BlockAPI.Versions import SurfaceVersions
+
+from BlockAPI.Surfaces import *
+
+
+class SurfaceVersionsTestCase(unittest.TestCase):
+    def setUp(self):
+        self._s = ModalSurface(Text(type=PLAIN_TEXT, text="Step 1"), Text(type=PLAIN_TEXT, text="Close"),
+                               [SectionBlock(text=Text(type=MRKDWN, text=f"Block {_i}")) for _i in range(10)])
+        self._json = self._s.to_json()
+        self._versions = SurfaceVersions(self._s)
+
+    def test_edits(self):
+        _first = self._versions.snapshot()
+        self._versions.update(3, text=Text(type=MRKDWN, text="Edited"))
+        self._versions.insert(0, DividerBlock())
+        self._versions.remove(-1)
+        _v = self._versions.update_surface(title=Text(type=PLAIN_TEXT, text="Step 2"))
+
+        self.assertEqual(len(self._versions), 5)
+        self.assertEqual(_v[4].text.text, "Edited")
+        self.assertIsInstance(_v[0], DividerBlock)
+        self.assertEqual(len(_v), 10)
+        self.assertEqual(_v.build()["title"]["text"], "Step 2")
+        self.assertIs(_v[1], _first[0], "Untouched blocks should be shared.")
+        self.assertIs(_v[4].text.type, _first[3].text.type)
+        self.assertEqual(_first.to_json(), self._json, "Old versions should not change.")
+        self.assertEqual(self._s.to_json(), self._json)
+        self.assertRaises(IndexError, self._versions.remove, 10)
+
+    def test_undo(self):
+        self.assertRaises(IndexError, self._versions.undo)
+        self._versions.append(DividerBlock())
+        self._versions.append(DividerBlock())
+        self.assertEqual(len(self._versions.undo()), 11)
+        self.assertEqual(self._versions.undo().to_json(), self._json)
+        self.assertEqual(len(self._versions.redo()), 11)
+        self._versions.remove(0)
+        self.assertFalse(self._versions.can_redo, "Edit after undo should drop the redo versions.")
+        self.assertEqual(len(self._versions), 3)
+
+        _versions = SurfaceVersions(self._s, max_versions=2)
+        _versions.append(DividerBlock())
+        _versions.append(DividerBlock())
+        self.assertEqual(len(_versions), 2)
+        self.assertEqual(len(_versions.undo()), 11)
+        self.assertFalse(_versions.can_undo)
+
+
+if __name__ == '__main__':
+    unittest.main()
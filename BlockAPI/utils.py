@@ -1,7 +1,5 @@
 from typing import Sized, Union, List
 
-from BlockAPI.CompositionObjects import OptionGroups
-
 PLAIN_TEXT = "plain_text"
 MRKDWN = "mrkdwn"
 DEFAULT = ""
@@ -78,6 +76,22 @@ def get_number_from_string(_value) -> Union[int, float]:
 
 
 def check_options_no_url(_options):
+    # Option catalogs are validated on creation and know whether any of their options has URL
+    if hasattr(_options, "has_url"):
+        if _options.has_url:
+            raise ValueError("URL property for Option object can only be set for OverFlow menus.")
+        return
+
     for _option in _options:
         if _option._body.get("url") is not None:
             raise ValueError("URL property for Option object can only be set for OverFlow menus.")
+
+
+def check_init_options_in_groups(_init_options: List, _option_groups):
+    # Option catalogs look the options up in their index, the groups are not copied
+    if hasattr(_option_groups, "_matching_groups"):
+        _matching = _option_groups._matching_groups(_init_options)
+    else:
+        _matching = [all(list(map(lambda x: x in _og.options, _init_options))) for _og in _option_groups].count(True)
+    if _matching != 1:
+        raise ValueError("Initial options must match exactly on of the option groups ")
@@ -0,0 +1,66 @@
+"""
+Benchmark suite of BlockAPI hot paths.
+
+Usage (from the repository root):
+    python -m benchmarks                    # run all scenarios and compare against benchmarks/baseline.json
+    python -m benchmarks -k home_tab        # run only scenarios whose name contains "home_tab"
+    python -m benchmarks --save             # run and store the results as the new baseline
+    python -m benchmarks --quick            # smoke test, single short round per scenario
+
+Exits with status 1 if any scenario is slower than the baseline by more than the tolerance.
+"""
+import argparse
+import os
+import sys
+
+from benchmarks import scenarios as _  # Registers the scenarios
+from benchmarks.runner import scenarios, measure, load_baseline, save_baseline, compare
+
+_DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def main(argv=None) -> int:
+    _parser = argparse.ArgumentParser(prog="python -m benchmarks", description="BlockAPI benchmark suite.")
+    _parser.add_argument("-k", dest="pattern", help="Run only scenarios whose name contains this string.")
+    _parser.add_argument("--baseline", default=_DEFAULT_BASELINE, help="Path of the baseline file.")
+    _parser.add_argument("--save", action="store_true", help="Store the results as the new baseline.")
+    _parser.add_argument("--tolerance", type=float, default=0.25,
+                         help="Allowed relative slowdown against the baseline (default 0.25).")
+    _parser.add_argument("--quick", action="store_true", help="Single short round per scenario.")
+    _args = _parser.parse_args(argv)
+
+    _baseline = load_baseline(_args.baseline)
+    _results = {}
+    _regressions = []
+
+    print(f"{'scenario':<32}{'ops/sec':>14}{'peak KiB':>12}{'baseline':>14}{'change':>10}{'bytes':>10}")
+    for _scenario in scenarios(_args.pattern):
+        _result = _results[_scenario.name] = measure(_scenario, quick=_args.quick)
+        _base = _baseline.get(_scenario.name)
+        _change = compare(_result, _base)
+
+        _base_col = f"{_base['ops_per_sec']:>14.1f}" if _base else f"{'-':>14}"
+        _change_col = f"{_change:>+10.1%}" if _change is not None else f"{'-':>10}"
+        _bytes_col = f"{_result['bytes']:>10}" if "bytes" in _result else ""
+        print(f"{_scenario.name:<32}{_result['ops_per_sec']:>14.1f}{_result['peak_kib']:>12.1f}"
+              f"{_base_col}{_change_col}{_bytes_col}")
+
+        if _change is not None and _change < -_args.tolerance:
+            _regressions.append(_scenario.name)
+
+    if _args.save:
+        if _args.pattern:
+            _baseline.update(_results)
+            _results = _baseline
+        save_baseline(_args.baseline, _results)
+        print(f"Baseline saved to {_args.baseline}.")
+        return 0
+
+    if _regressions and not _args.quick:
+        print(f"Regressions beyond {_args.tolerance:.0%}: {', '.join(_regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+import datetime
+
+from BlockAPI.Surfaces import *
+
+
+def _plain(text: str) -> Text:
+    return Text(type=PLAIN_TEXT, text=text)
+
+
+def _mrkdwn(text: str) -> Text:
+    return Text(type=MRKDWN, text=text)
+
+
+def _options(n: int, prefix: str = "option") -> List[Option]:
+    return [Option(_plain(f"{prefix.capitalize()} {_i}"), f"{prefix}-{_i}") for _i in range(n)]
+
+
+def home_tab(n_blocks: int = 100) -> HomeSurface:
+    """
+    Home tab with n_blocks blocks, repeating a header, a section with fields and a button accessory, a context
+    with an image, an action block and a divider.
+    """
+    _surface = HomeSurface()
+    for _i in range(n_blocks):
+        _kind = _i % 5
+        if _kind == 0:
+            _surface.add(HeaderBlock(_plain(f"Project {_i}"), block_id=f"header-{_i}"))
+        elif _kind == 1:
+            _surface.add(SectionBlock(
+                text=_mrkdwn(f"*Task {_i}* is due on <!date^1700000000^{{date_short}}|Nov 14>."),
+                block_id=f"section-{_i}",
+                fields=[_mrkdwn(f"*Owner*\n<@U{_i:08d}>"), _mrkdwn("*Priority*\nHigh")],
+                accessory=Button(_plain("Open"), action_id=f"open-{_i}", value=f"task-{_i}", style=PRIMARY)
+            ))
+        elif _kind == 2:
+            _surface.add(ContextBlock([
+                Image("https://example.com/avatar.png", "avatar"),
+                _mrkdwn(f"Last updated by <@U{_i:08d}> a minute ago")
+            ], block_id=f"context-{_i}"))
+        elif _kind == 3:
+            _surface.add(ActionBlock([
+                Button(_plain("Approve"), action_id=f"approve-{_i}", value=f"task-{_i}", style=PRIMARY),
+                Button(_plain("Reject"), action_id=f"reject-{_i}", value=f"task-{_i}", style=DANGER),
+                DatePicker(f"due-{_i}", placeholder=_plain("Due date"), init_date=datetime.date(2026, 1, 1)),
+            ], block_id=f"actions-{_i}"))
+        else:
+            _surface.add(DividerBlock(block_id=f"divider-{_i}"))
+    return _surface
+
+
+def modal_with_actions(n_action_blocks: int = 4) -> ModalSurface:
+    """
+    Modal with n_action_blocks action blocks of 25 elements each (24 buttons and a static select) followed by
+    a few input blocks.
+    """
+    _modal = ModalSurface(title=_plain("Review"), close=_plain("Cancel"), submit=_plain("Submit"))
+    _select_options = _options(25)
+    for _b in range(n_action_blocks):
+        _elements = [Button(_plain(f"Action {_i}"), action_id=f"action-{_b}-{_i}", value=str(_i))
+                     for _i in range(24)]
+        _elements.append(StaticOptions("static_select", f"select-{_b}", placeholder=_plain("Pick one"),
+                                       options=_select_options))
+        _modal.add(ActionBlock(_elements, block_id=f"actions-{_b}"))
+
+    _modal.add(InputBlock(_plain("Title"), PlainTextInput("title", placeholder=_plain("Title")), block_id="title"))
+    _modal.add(InputBlock(_plain("Estimate"), NumberInput(False, "estimate"), block_id="estimate"))
+    _modal.add(InputBlock(_plain("Due date"), DatePicker("due"), block_id="due"))
+    return _modal
+
+
+def option_groups(n_groups: int = 100, n_options: int = 100) -> StaticOptions:
+    """
+    Static select with n_groups option groups of n_options options each.
+    """
+    _groups = [OptionGroups(_plain(f"Group {_g}"), _options(n_options, f"g{_g}")) for _g in range(n_groups)]
+    return StaticOptions("static_select", "grouped", placeholder=_plain("Pick one"), option_groups=_groups)
+
+
+def related_surfaces() -> List[BlockInterface]:
+    """
+    Message reply, modal and Home tab refresh answering one request, sharing a header, a footer and a static select
+    with 20 option groups of 50 options.
+    """
+    _header = HeaderBlock(_plain("Sprint planning"), block_id="header")
+    _footer = ContextBlock([Image("https://example.com/logo.png", "logo"), _mrkdwn("Sent by *Planner*")],
+                           block_id="footer")
+    _select = option_groups(20, 50)
+    return [
+        MessageSurface([_header, SectionBlock(text=_mrkdwn("Pick a team for the sprint.")), ActionBlock([_select]),
+                        _footer]),
+        ModalSurface(_plain("Planning"), _plain("Cancel"), [_header, InputBlock(_plain("Team"), _select), _footer],
+                     submit=_plain("Save")),
+        HomeSurface([_header, ActionBlock([_select], block_id="team"), DividerBlock(), _footer]),
+    ]
+
+
+def translations(surface: BlockInterface, n_locales: int = 12) -> Dict[str, Dict[str, str]]:
+    """
+    Catalog data translating every text of the surface to n_locales locales.
+    """
+    _sources = {_text.text for _, _text in surface.walk(Text)}
+    return {f"l{_l}": {_s: f"{_s} ({_l})" for _s in _sources} for _l in range(n_locales)}
+
+
+def digest(n_messages: int = 10000) -> List[MessageSurface]:
+    """
+    Digest of n_messages messages, each with a section, a context and a divider.
+    """
+    return [MessageSurface([
+        SectionBlock(text=_mrkdwn(f"*Alert {_i}*: CPU usage above 90% on `host-{_i % 50}`"),
+                     accessory=Button(_plain("Acknowledge"), action_id=f"ack-{_i}", value=str(_i))),
+        ContextBlock([_mrkdwn(f"Raised by <@U{_i:08d}>")]),
+        DividerBlock()
+    ]) for _i in range(n_messages)]
@@ -0,0 +1,99 @@
+import gc
+import json
+import platform
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+_scenarios: Dict[str, "Scenario"] = {}
+
+
+class Scenario:
+
+    def __init__(self, name: str, factory: Callable[[int], Callable[[], object]], number: int, repeat: int):
+        self.name = name
+        self.factory = factory
+        self.number = number
+        self.repeat = repeat
+
+
+def scenario(name: str, number: int = 100, repeat: int = 5):
+    """
+    Register a benchmark scenario. The decorated function receives the number of operations of one round and
+    returns a callable performing a single operation; all setup (fixtures etc.) belongs to the function itself so
+    it is excluded from the timing.
+    :param name: Unique name of the scenario, e.g. "home_tab.build".
+    :param number: Number of operations per round.
+    :param repeat: Number of timed rounds, the fastest round is reported.
+    """
+    def _register(factory):
+        if name in _scenarios:
+            raise ValueError(f"Scenario {name} is already registered.")
+        _scenarios[name] = Scenario(name, factory, number, repeat)
+        return factory
+
+    return _register
+
+
+def scenarios(pattern: str = None) -> List[Scenario]:
+    return [_s for _n, _s in sorted(_scenarios.items()) if not pattern or pattern in _n]
+
+
+def measure(_scenario: Scenario, quick: bool = False) -> dict:
+    """
+    Run a scenario.
+    :param _scenario: Scenario to be run.
+    :param quick: If True, run a single round with a tenth of the operations (for smoke testing).
+    :return: Dictionary with operations per second, peak memory allocated by a single operation in KiB and, if the
+    operation returns bytes (e.g. serialization), their length.
+    """
+    _number = max(1, _scenario.number // 10) if quick else _scenario.number
+    _repeat = 1 if quick else _scenario.repeat
+
+    _best = float("inf")
+    for _ in range(_repeat):
+        _op = _scenario.factory(_number)
+        gc.collect()
+        _start = time.perf_counter()
+        for _ in range(_number):
+            _op()
+        _best = min(_best, time.perf_counter() - _start)
+
+    _op = _scenario.factory(1)
+    gc.collect()
+    tracemalloc.start()
+    _output = _op()
+    _, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    _result = {"ops_per_sec": _number / _best, "peak_kib": _peak / 1024}
+    if isinstance(_output, bytes):
+        _result["bytes"] = len(_output)
+    return _result
+
+
+def load_baseline(path: str) -> dict:
+    try:
+        with open(path) as _f:
+            return json.load(_f)["scenarios"]
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(path: str, results: Dict[str, dict]):
+    with open(path, "w") as _f:
+        json.dump({
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "scenarios": {_n: {_k: round(_v, 2) for _k, _v in _r.items()} for _n, _r in sorted(results.items())}
+        }, _f, indent=2)
+        _f.write("\n")
+
+
+def compare(result: dict, baseline: Optional[dict]) -> Optional[float]:
+    """
+    :return: Relative change of throughput against the baseline or None if there is no baseline for the scenario.
+    """
+    if not baseline:
+        return None
+    return result["ops_per_sec"] / baseline["ops_per_sec"] - 1
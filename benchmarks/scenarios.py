@@ -0,0 +1,563 @@
+import asyncio
+import atexit
+import copyreg
+import io
+import itertools
+import json
+import os
+import pickle
+import subprocess
+import sys
+
+from benchmarks import fixtures
+from benchmarks.runner import scenario
+from BlockAPI import Snapshot
+from BlockAPI.BlockElements import Button
+from BlockAPI.Blocks import ActionBlock
+from BlockAPI.BlockInterface import BlockInterface, _attributes, build_many
+from BlockAPI.CompositionObjects import Option
+from BlockAPI.FakeSlack import FakeSlackAPI
+from BlockAPI.Localization import Catalog, LocalizedTemplate
+from BlockAPI.Publish import PublishScheduler, http_sender
+from BlockAPI.Transport import HTTPTransport
+from BlockAPI.Router import InteractionRouter
+from BlockAPI.State import StateExtractor
+from BlockAPI.Versions import SurfaceVersions
+from BlockAPI.utils import DANGER, PRIMARY, check_length
+
+
+# HOME TAB, 100 BLOCKS #
+@scenario("home_tab.construct", number=50)
+def _home_tab_construct(number):
+    return fixtures.home_tab
+
+
+@scenario("home_tab.build", number=50)
+def _home_tab_build(number):
+    return fixtures.home_tab().build
+
+
+@scenario("home_tab.to_json", number=50)
+def _home_tab_to_json(number):
+    return fixtures.home_tab().to_json
+
+
+@scenario("home_tab.encoded_size", number=20)
+def _home_tab_encoded_size(number):
+    # Cold measurement of the whole tree, fresh tree for every operation
+    _trees = [fixtures.home_tab() for _ in range(number)]
+    return lambda: _trees.pop().encoded_size
+
+
+@scenario("home_tab.encoded_size_after_edit", number=1000)
+def _home_tab_encoded_size_after_edit(number):
+    _surface = fixtures.home_tab()
+    _text = _surface.blocks[1].text
+    _surface.encoded_size
+
+    def _edit():
+        _text.text = "Edited"
+        return _surface.encoded_size
+
+    return _edit
+
+
+@scenario("home_tab.copy", number=20)
+def _home_tab_copy(number):
+    _surface = fixtures.home_tab()
+    return _surface.copy
+
+
+@scenario("home_tab.eq", number=200)
+def _home_tab_eq(number):
+    _a, _b = fixtures.home_tab(), fixtures.home_tab()
+    return lambda: _a == _b
+
+
+# MODAL, ACTION BLOCKS OF 25 ELEMENTS #
+@scenario("modal_actions.construct", number=50)
+def _modal_construct(number):
+    return fixtures.modal_with_actions
+
+
+@scenario("modal_actions.build", number=50)
+def _modal_build(number):
+    return fixtures.modal_with_actions().build
+
+
+# STATIC SELECT, 100 x 100 OPTION GROUPS #
+@scenario("option_groups.construct", number=5)
+def _option_groups_construct(number):
+    return fixtures.option_groups
+
+
+@scenario("option_groups.build", number=5)
+def _option_groups_build(number):
+    return fixtures.option_groups().build
+
+
+# RELATED SURFACES SHARING A HEADER, A FOOTER AND A 20 x 50 OPTION GROUPS SELECT #
+@scenario("build_many.related_surfaces", number=50)
+def _build_many(number):
+    _surfaces = fixtures.related_surfaces()
+    return lambda: build_many(_surfaces)
+
+
+@scenario("build_many.related_surfaces_each", number=50)
+def _build_many_each(number):
+    # Reference: every surface built by itself
+    _surfaces = fixtures.related_surfaces()
+    return lambda: [_s.build() for _s in _surfaces]
+
+
+# LOCALIZED HOME TAB, 12 LOCALES #
+def _localized_home_tab():
+    _surface = fixtures.home_tab()
+    return LocalizedTemplate(_surface, Catalog(fixtures.translations(_surface)))
+
+
+@scenario("localize.home_tab.compile", number=1, repeat=3)
+def _localize_compile(number):
+    # Load time: every locale validated against the template once
+    _surface = fixtures.home_tab()
+    _catalog = Catalog(fixtures.translations(_surface))
+    return lambda: LocalizedTemplate(_surface, _catalog)
+
+
+@scenario("localize.home_tab.render", number=20000)
+def _localize_render(number):
+    _template = _localized_home_tab()
+    _locales = itertools.cycle(_template.catalog.locales)
+    return lambda: _template.render(next(_locales))
+
+
+@scenario("localize.home_tab.render_uncached", number=2000)
+def _localize_render_uncached(number):
+    # Fragments joined for every render
+    _template = _localized_home_tab()
+    _locales = itertools.cycle(_template.catalog.locales)
+
+    def _render():
+        _template._rendered.clear()
+        return _template.render(next(_locales))
+
+    return _render
+
+
+@scenario("localize.home_tab.construct_and_to_json", number=50)
+def _localize_construct(number):
+    # Reference: surface constructed (and validated) again from the translated strings for every render
+    return lambda: fixtures.home_tab().to_json()
+
+
+# DIGEST OF 10K MESSAGES #
+@scenario("digest_10k.construct", number=1, repeat=3)
+def _digest_construct(number):
+    return fixtures.digest
+
+
+@scenario("digest_10k.build", number=1, repeat=3)
+def _digest_build(number):
+    _digest = fixtures.digest()
+    return lambda: [_m.build() for _m in _digest]
+
+
+# VALIDATION #
+@scenario("validation.check_length", number=100000)
+def _check_length(number):
+    _text = "f" * 75
+    return lambda: check_length(_text, _min=1, _max=75)
+
+
+@scenario("validation.text", number=20000)
+def _text(number):
+    return lambda: fixtures._plain("Approve")
+
+
+@scenario("validation.option", number=20000)
+def _option(number):
+    return lambda: Option(fixtures._plain("Approve"), "approve")
+
+
+# OPTIONS FROM 1000 ROWS OF COLUMNAR DATA #
+_ROWS = ([f"Team {_i}" for _i in range(1000)], [f"team-{_i}" for _i in range(1000)])
+
+
+@scenario("options_1k.construct", number=20)
+def _options_construct(number):
+    return lambda: [Option(fixtures._plain(_t), _v) for _t, _v in zip(*_ROWS)]
+
+
+@scenario("options_1k.bulk", number=20)
+def _options_bulk(number):
+    return lambda: Option.bulk(*_ROWS)
+
+
+# IMPORT TIME, FRESH INTERPRETER FOR EVERY OPERATION #
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _interpreter(code: str):
+    return lambda: subprocess.run([sys.executable, "-c", code], cwd=_ROOT, check=True)
+
+
+@scenario("import.interpreter", number=5, repeat=3)
+def _import_interpreter(number):
+    # Reference for the other import scenarios, startup of the bare interpreter
+    return _interpreter("pass")
+
+
+@scenario("import.text_and_section", number=5, repeat=3)
+def _import_text_and_section(number):
+    return _interpreter("from BlockAPI import Text, SectionBlock")
+
+
+@scenario("import.surfaces", number=5, repeat=3)
+def _import_surfaces(number):
+    return _interpreter("from BlockAPI.Surfaces import *")
+
+
+# PICKLE, COMPACT PROTOCOL OF BLOCKINTERFACE AGAINST THE DEFAULT INSTANCE DICTIONARY STATE #
+class _DefaultPickler(pickle.Pickler):
+    # Pickles the objects the default way, i.e. the whole instance dictionary, cached sizes excluded
+    def reducer_override(self, obj):
+        if not isinstance(obj, BlockInterface):
+            return NotImplemented
+        _state = {_k: _v for _k, _v in _attributes(obj).items() if _k not in ("_size", "_parents")}
+        _state["_body"] = dict(_state["_body"])
+        return copyreg.__newobj__, (type(obj),), _state
+
+
+def _dumps_default(obj) -> bytes:
+    _f = io.BytesIO()
+    _DefaultPickler(_f, protocol=pickle.HIGHEST_PROTOCOL).dump(obj)
+    return _f.getvalue()
+
+
+def _dumps(obj) -> bytes:
+    return pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+@scenario("pickle.home_tab.dumps", number=50)
+def _pickle_dumps(number):
+    _surface = fixtures.home_tab()
+    return lambda: _dumps(_surface)
+
+
+@scenario("pickle.home_tab.dumps_default", number=50)
+def _pickle_dumps_default(number):
+    _surface = fixtures.home_tab()
+    return lambda: _dumps_default(_surface)
+
+
+@scenario("pickle.home_tab.round_trip", number=50)
+def _pickle_round_trip(number):
+    _surface = fixtures.home_tab()
+    return lambda: pickle.loads(_dumps(_surface))
+
+
+@scenario("pickle.home_tab.round_trip_default", number=50)
+def _pickle_round_trip_default(number):
+    _surface = fixtures.home_tab()
+    return lambda: pickle.loads(_dumps_default(_surface))
+
+
+# SNAPSHOT, BINARY ENCODING FOR CACHING #
+@scenario("snapshot.home_tab.dump", number=20)
+def _snapshot_dump(number):
+    _surface = fixtures.home_tab()
+    return lambda: Snapshot.dump(_surface, include_json=False)
+
+
+@scenario("snapshot.home_tab.load", number=50)
+def _snapshot_load(number):
+    _data = Snapshot.dump(fixtures.home_tab(), include_json=False)
+    return lambda: Snapshot.load(_data)
+
+
+@scenario("snapshot.home_tab.load_json", number=50)
+def _snapshot_load_json(number):
+    _data = Snapshot.dump(fixtures.home_tab())
+    return lambda: Snapshot.load(_data, as_json=True)
+
+
+@scenario("snapshot.home_tab.json_loads", number=50)
+def _snapshot_json_loads(number):
+    # Reference for the load scenario, parsing only, reconstruction of the objects would come on top of it
+    _json = fixtures.home_tab().to_json()
+    return lambda: json.loads(_json)
+
+
+# ROUTER, ONE BLOCK_ACTIONS EVENT PER OPERATION (OPERATIONS PER SECOND = EVENTS PER SECOND) #
+def _router_events(_ids, number):
+    _events = [{"type": "block_actions", "actions": [{"action_id": _a, "block_id": _b}]} for _a, _b in _ids]
+    _events = (_events * (number // len(_events) + 1))[:number]
+    return _events
+
+
+def _home_tab_router():
+    # Elements of the action blocks of the home tab fixture routed by their objects, blocks by prefixes of their ids
+    _surface = fixtures.home_tab()
+    _router = InteractionRouter()
+    for _block in _surface.blocks:
+        for _element in getattr(_block, "elements", ()):
+            if hasattr(type(_element), "action_id"):
+                _router.route(_element, lambda _a, _p: None)
+    for _prefix in ("header", "section", "context", "actions", "divider"):
+        _router.route(f"{_prefix}-*", lambda _a, _p: None, key="block_id")
+    return _router
+
+
+@scenario("router.dispatch_exact", number=20000)
+def _router_dispatch_exact(number):
+    _router = _home_tab_router()
+    _events = _router_events([(f"approve-{_i}", f"actions-{_i}") for _i in range(3, 100, 5)], number)
+    return lambda: _router.dispatch(_events.pop())
+
+
+@scenario("router.dispatch_prefix", number=20000)
+def _router_dispatch_prefix(number):
+    _router = _home_tab_router()
+    _events = _router_events([(f"unknown-{_i}", f"section-{_i}") for _i in range(1, 100, 5)], number)
+    return lambda: _router.dispatch(_events.pop())
+
+
+# STATE OF THE SUBMITTED MODAL WITH ACTION BLOCKS #
+def _submitted_values() -> dict:
+    _values = {f"actions-{_b}": {f"select-{_b}": {"type": "static_select", "selected_option": {
+        "text": {"type": "plain_text", "text": "Option 3"}, "value": "option-3"}}} for _b in range(4)}
+    _values["title"] = {"title": {"type": "plain_text_input", "value": "Release"}}
+    _values["estimate"] = {"estimate": {"type": "number_input", "value": "8"}}
+    _values["due"] = {"due": {"type": "datepicker", "selected_date": "2026-01-02"}}
+    return _values
+
+
+@scenario("state.extract", number=20000)
+def _state_extract(number):
+    _extractor = StateExtractor(fixtures.modal_with_actions())
+    _values = _submitted_values()
+    return lambda: _extractor.extract(_values)
+
+
+@scenario("state.apply", number=5000)
+def _state_apply(number):
+    _modal = fixtures.modal_with_actions()
+    _values = _submitted_values()
+    return lambda: _modal.apply_state(_values)
+
+
+# FROZEN HOME TAB, SHARED TEMPLATE #
+@scenario("frozen.home_tab.freeze", number=20)
+def _frozen_freeze(number):
+    _surface = fixtures.home_tab()
+    return _surface.freeze
+
+
+@scenario("frozen.home_tab.thaw", number=50)
+def _frozen_thaw(number):
+    return fixtures.home_tab().freeze().thaw
+
+
+# VERSIONS OF THE HOME TAB, ONE EDITED BLOCK PER STEP #
+@scenario("versions.home_tab.update", number=1000)
+def _versions_update(number):
+    _versions = SurfaceVersions(fixtures.home_tab())
+    _text = fixtures._mrkdwn("Edited")
+    return lambda: _versions.update(51, text=_text)
+
+
+@scenario("versions.home_tab.copy_and_edit", number=20)
+def _versions_copy_and_edit(number):
+    # Reference for the update scenario, every step kept as a full copy
+    _steps = [fixtures.home_tab()]
+    _text = fixtures._mrkdwn("Edited")
+
+    def _step():
+        _copy = _steps[-1].copy()
+        _copy.blocks[51].text = _text
+        _steps.append(_copy)
+
+    return _step
+
+
+
+# WALKING THE HOME TAB, ALL BUTTONS #
+def _probe_buttons(_value, _found: list):
+    # Reference: recursion looking into every value of the bodies
+    if isinstance(_value, BlockInterface):
+        if isinstance(_value, Button):
+            _found.append(_value)
+        for _v in _value._body.values():
+            _probe_buttons(_v, _found)
+    elif isinstance(_value, (list, tuple)):
+        for _v in _value:
+            _probe_buttons(_v, _found)
+    return _found
+
+
+@scenario("walk.home_tab.buttons", number=500)
+def _walk_buttons(number):
+    _surface = fixtures.home_tab()
+    return lambda: [_n for _, _n in _surface.walk(Button)]
+
+
+@scenario("walk.home_tab.buttons_probing", number=500)
+def _walk_buttons_probing(number):
+    _surface = fixtures.home_tab()
+    return lambda: _probe_buttons(_surface, [])
+
+
+# SELECTOR QUERIES ON THE HOME TAB, INDEX KEPT BETWEEN QUERIES #
+@scenario("select.home_tab.type", number=2000)
+def _select_type(number):
+    _surface = fixtures.home_tab()
+    _surface.select("ActionBlock Button")
+    return lambda: _surface.select("ActionBlock Button")
+
+
+@scenario("select.home_tab.type_scan", number=2000)
+def _select_type_scan(number):
+    # Reference: full walk for every query
+    _surface = fixtures.home_tab()
+    return lambda: [_n for _p, _n in _surface.walk(Button) if isinstance(_surface.blocks[_p[1]], ActionBlock)]
+
+
+@scenario("select.home_tab.id", number=20000)
+def _select_id(number):
+    _surface = fixtures.home_tab()
+    _id = _surface.blocks[53].block_id
+    _surface.select(f"#{_id}")
+    return lambda: _surface.select(f"#{_id}")
+
+
+@scenario("select.home_tab.edit_and_query", number=2000)
+def _select_edit_and_query(number):
+    # Every query follows an edit of one block, only that block is indexed again
+    _surface = fixtures.home_tab()
+    _surface.select("ActionBlock Button")
+    _block = _surface.blocks[53]
+    _ids = itertools.cycle(("edited-0", "edited-1"))
+
+    def _op():
+        _block.block_id = next(_ids)
+        return _surface.select("ActionBlock Button")
+
+    return _op
+
+
+@scenario("observe.home_tab.edit", number=20000)
+def _observe_edit(number):
+    # Change of a button deep in the tree reported to an observer of the surface, with its path
+    _surface = fixtures.home_tab()
+    _changes = []
+    _surface.observe(lambda _change: _changes.append(_change.path))
+    _button = _surface.select("ActionBlock Button")[-1]
+    _styles = itertools.cycle((PRIMARY, DANGER))
+
+    def _op():
+        _button.style = next(_styles)
+        _changes.clear()
+
+    return _op
+
+
+@scenario("observe.home_tab.edit_unobserved", number=20000)
+def _observe_edit_unobserved(number):
+    # Reference: the same change of a measured tree without observers
+    _surface = fixtures.home_tab()
+    _surface.encoded_size
+    _button = [_n for _, _n in _surface.walk(Button)][-1]
+    _styles = itertools.cycle((PRIMARY, DANGER))
+    return lambda: setattr(_button, "style", next(_styles))
+
+# PUBLISHING BURSTS, 10 USERS x 20 RE-RENDERS OF THE HOME TAB, FAKE WEB API #
+def _publish_burst(_publish):
+    _surfaces = [fixtures.home_tab() for _ in range(20)]
+
+    async def _burst():
+        async with FakeSlackAPI() as _api:
+            await _publish(http_sender(_api.url, "xoxb-bench"), [(f"U{_u}", _s) for _s in _surfaces
+                                                                  for _u in range(10)])
+
+    return lambda: asyncio.run(_burst())
+
+
+async def _publish_scheduled(_send, _requests):
+    async with PublishScheduler(_send, workers=4, rate=10000) as _scheduler:
+        for _target, _surface in _requests:
+            _scheduler.publish(_target, _surface)
+        await _scheduler.join()
+
+
+async def _publish_each(_send, _requests):
+    # Reference: every re-render sent, 4 at a time
+    _limit = asyncio.Semaphore(4)
+
+    async def _one(_target, _surface):
+        async with _limit:
+            await _send("views.publish", b'{"user_id":"%s","view":%s}' % (_target.encode(), _surface.to_json()))
+
+    await asyncio.gather(*(_one(_t, _s) for _t, _s in _requests))
+
+
+@scenario("publish.burst_scheduled", number=3)
+def _publish_burst_scheduled(number):
+    return _publish_burst(_publish_scheduled)
+
+
+@scenario("publish.burst_each", number=3)
+def _publish_burst_each(number):
+    return _publish_burst(_publish_each)
+
+
+# POSTING TO THE FAKE WEB API, HOME TAB #
+_fake_api = []
+
+
+def _fake_api_loop():
+    # Server kept running on its own loop by all transport scenarios, only the calls are timed
+    if not _fake_api:
+        _loop = asyncio.new_event_loop()
+        _api = FakeSlackAPI()
+        _loop.run_until_complete(_api.start())
+        _fake_api.extend((_loop, _api))
+
+        @atexit.register
+        def _close():
+            _loop.run_until_complete(_api.close())
+            _loop.close()
+
+    return _fake_api
+
+
+@scenario("transport.call", number=200)
+def _transport_call_latency(number):
+    _loop, _api = _fake_api_loop()
+    _transport = HTTPTransport(_api.url, "xoxb-bench")
+    _surface = fixtures.home_tab()
+    return lambda: _loop.run_until_complete(_transport.publish("U1", _surface))
+
+
+@scenario("transport.call_new_connection", number=200)
+def _transport_call_latency_new_connection(number):
+    # Reference: new connection and stdlib encoder for every call
+    _loop, _api = _fake_api_loop()
+    _send = http_sender(_api.url, "xoxb-bench")
+    _surface = fixtures.home_tab()
+    return lambda: _loop.run_until_complete(_send("views.publish",
+                                                  b'{"user_id":"U1","view":%s}' % _surface.to_json()))
+
+
+@scenario("transport.call_many_100", number=5)
+def _transport_call_many(number):
+    _loop, _api = _fake_api_loop()
+    _transport = HTTPTransport(_api.url, "xoxb-bench", pool_size=4)
+    _calls = [("views.publish", {"user_id": f"U{_i}", "view": fixtures.home_tab()}) for _i in range(100)]
+    return lambda: _loop.run_until_complete(_transport.call_many(_calls))
+
+
+@scenario("transport.call_many_100_unpooled", number=5)
+def _transport_call_many_new_connections(number):
+    _loop, _api = _fake_api_loop()
+    _requests = [(f"U{_i}", fixtures.home_tab()) for _i in range(100)]
+    return lambda: _loop.run_until_complete(_publish_each(http_sender(_api.url, "xoxb-bench"), _requests))